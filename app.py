@@ -30,10 +30,15 @@ import json
 import glob
 import base64
 import threading
+import multiprocessing
+import queue
 import logging
 import functools
+from abc import ABC, abstractmethod
 from io import BytesIO
 from datetime import datetime
+from collections import OrderedDict
+from multiprocessing import shared_memory
 
 import cv2
 import numpy as np
@@ -46,7 +51,7 @@ try:
     TESSEROCR_AVAILABLE = True
 except ImportError:
     TESSEROCR_AVAILABLE = False
-    logging.getLogger("PNP").warning("tesserocr bulunamadı — OCR devre dışı.")
+    logging.getLogger("PNP").warning("tesserocr bulunamadı — Tesseract motoru devre dışı.")
 
 # Flask ve SocketIO
 from flask import (Flask, render_template, Response, jsonify, request,
@@ -83,6 +88,20 @@ class Config:
     # Yayın (Stream) için maksimum genişlik (Optimizasyon)
     STREAM_MAX_WIDTH = 800
 
+    # İstemci tarafı overlay: sunucu tek temiz stream yayınlar, kutular/HUD/PIP
+    # Socket.IO 'overlay_update' verisiyle tarayıcıda canvas üzerine çizilir
+    OVERLAY_CLIENT_SIDE = False
+
+    # Yakalama modu: 'auto' (hareket sırasında preview, duruşta full), 'full' veya 'preview'
+    CAPTURE_MODE = "auto"
+    PREVIEW_WIDTH = 960              # Preview modu genişliği (yükseklik en-boy oranından)
+    CAPTURE_IDLE_HOLD = 0.3          # Hareket bittikten sonra full moda dönmeden önce bekleme (s)
+
+    # Yakalama süreci: yakalama + ön işleme ayrı süreçte (GIL dışında), kareler paylaşımlı
+    # bellek halkasından tek kopyayla okunur. Değişiklik yeniden başlatmada geçerli olur.
+    CAPTURE_PROCESS = False
+    CAPTURE_PROCESS_SLOTS = 8        # Halka yuvası sayısı (okuma sırasında son 3 kiralı yuva üzerine yazılmaz)
+
     # Piksel → Milimetre dönüşüm katsayıları (kalibrasyon ile ayarlanır)
     PIXEL_TO_MM_X = 0.02
     PIXEL_TO_MM_Y = 0.02
@@ -98,11 +117,56 @@ class Config:
     OCR_PSM_MODE = 6          # 6=SINGLE_BLOCK, 11=SPARSE_TEXT, 3=AUTO
     OCR_WHITELIST = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
 
+    # Metin bölgesi ön-tespiti (Tesseract'a tam kare yerine küçük kesitler gider)
+    OCR_REGION_DETECT = True     # False → eski davranış (tam kare SINGLE_BLOCK)
+    OCR_REGION_PAD = 8           # Kesitlerin kenar boşluğu (px, tam çözünürlük)
+    OCR_REGION_MAX = 40          # Kare başına en fazla aday bölge
+
+    # Takip modu: kararlı kutuların çevresinde ROI OCR, aralıklı tam kare tarama
+    OCR_TRACKING_ENABLED = True
+    OCR_FULL_SCAN_INTERVAL = 10  # Her N OCR karesinde bir tam kare tarama
+    OCR_TRACK_MARGIN = 40        # ROI hareket payı (px, tam çözünürlük)
+
+    # Odaklı mod (auto-center): hedefin son görüldüğü yerin çevresindeki pay (px)
+    OCR_FOCUS_MARGIN = 120
+
+    # Hedef takibi (auto-center): OCR sonuçları arasında hedef Lucas-Kanade optik akışıyla
+    # kamera hızında izlenir, her yeni OCR sonucunda yeniden çapalanır
+    TRACKER_ENABLED = True
+    TRACK_WIDTH = 640            # Takip çözünürlüğü (kareler bu genişliğe küçültülür)
+    TRACK_HISTORY = 30           # Çapalama için saklanan küçük kare sayısı
+    TRACK_MAX_POINTS = 40        # Hedef kutusunda izlenen en fazla köşe
+    TRACK_MIN_POINTS = 6         # Bunun altına düşülürse takip kaybedilir
+    TRACK_MAX_AGE = 5.0          # Son OCR çapasından bu kadar (s) eski takip kullanılmaz
+
+    # OCR kapısı: bulanık kareleri atla, değişmeyen sahnede son sonucu yeniden kullan
+    OCR_GATE_ENABLED = True
+    OCR_GATE_MIN_SHARPNESS = 30.0    # Laplacian varyansı bunun altındaysa kare bulanık
+    OCR_GATE_DIFF_THRESHOLD = 3.0    # Son OCR karesine ortalama fark (0-255) bunun altındaysa sahne aynı
+
+    # Hareket sonrası oturma tespiti: ardışık kareler arası kayma (faz korelasyonu)
+    SETTLE_WIDTH = 320               # Korelasyon için küçültülmüş kare genişliği (px)
+    SETTLE_MAX_SHIFT = 0.3           # Bu kaymanın altı "sabit" sayılır (küçük kare pikseli)
+    SETTLE_FRAMES = 3                # Art arda bu kadar sabit kare → oturdu
+    SETTLE_TIMEOUT = 2.0             # En fazla bekleme (s)
+
     # Motor hareket ayarları
     MOVE_STEP = 5.0
     FEED_RATE = 1000
     AUTO_CENTER_MAX_ITER = 10
     AUTO_CENTER_TOLERANCE = 5
+    AUTO_CENTER_RESULT_TIMEOUT = 3.0   # Hareket sonrası karenin OCR sonucu için en fazla bekleme (s)
+
+    # Hedef arama: görüş alanı (kalibrasyondan, mm) adımlı genişleyen spiral
+    SEARCH_OVERLAP = 0.25        # Ardışık görüntüler arası örtüşme oranı (0..0.9)
+    SEARCH_RADIUS_MM = 8.0       # Başlangıç noktasından en fazla arama yarıçapı (mm)
+
+    # Kart haritası: kart alanı taranıp etiketlerin makine XY konumları kart tipi başına
+    # indekslenir; auto-center / goto_base indeksteki konuma doğrudan gider
+    BOARD_TYPE = ""              # Aktif kart tipi (boş → harita kullanılmaz)
+    BOARD_MAP_OVERLAP = 0.2      # Tarama görüntüleri arası örtüşme oranı
+    BOARD_MAP_MERGE_MM = 1.0     # Aynı metnin bu mesafedeki gözlemleri tek etikette birleşir
+    BOARD_MAP_MIN_CONFIDENCE = 0.5   # Bu güvenin altındaki etiketlere doğrudan gidilmez
 
     # Aranacak hedef yazılar (çoklu kelime desteği)
     TARGET_TEXT = "TEST"
@@ -115,9 +179,34 @@ class Config:
         "Etiketler": ["START", "STOP", "ERR", "OK"]
     }
     TARGET_GROUP = "Varsayilan"  # Aktif arama grubu
+
+    # OCR düzeltme sözlüğü: True → sadece aktif gruptaki kelimelere düzelt
+    OCR_VOCAB_ACTIVE_GROUP_ONLY = False
+    OCR_VOCAB_CACHE_SIZE = 4096      # Ham metin → düzeltilmiş metin LRU önbelleği
+
+    # OCR sonuç önbelleği: değişmeyen bölge kesitleri (dHash + boyut) tekrar okunmaz
+    OCR_CACHE_ENABLED = True
+    OCR_CACHE_SIZE = 512             # En fazla kayıt
+    OCR_CACHE_TTL = 5.0              # Kayıt ömrü (s)
+
+    # OCR motoru: 'tesseract', 'opencv_dnn' (CRNN metin tanıma modeli) veya
+    # 'template' (kayıtlı kelime şablonlarıyla NCC eşleştirme). Seçilen motor
+    # kullanılamıyorsa sırayla diğerlerine düşülür.
+    OCR_BACKEND = "tesseract"
+    OCR_TEMPLATE_MIN_SCORE = 0.6     # Şablon eşleşmesi için minimum korelasyon (0-1)
+    OCR_TESSDATA_PATH = "/usr/share/tesseract-ocr/5/tessdata/"
+    OCR_LANGUAGE = "eng"
+    OCR_DNN_MODEL = "models/crnn.onnx"           # Gri tonlu CRNN (1x1x32x100 giriş), app dizinine göreli
+    OCR_DNN_ALPHABET = "models/alphabet_36.txt"  # Satır başına bir karakter (CTC boşluk hariç)
+    OCR_ACCURACY_BAR = 0.9           # Benchmark önerisi: kesinlik ve duyarlılık alt sınırı
+
+    # Tesseract API havuzu: (psm, whitelist, dil) başına hazır örnek — mod değişimi anlık
+    OCR_API_POOL_SIZE = 4            # En fazla örnek (LRU ile düşülür, her biri ~30-50 MB)
+    OCR_API_POOL_WARMUP = True       # Açılışta aktif grubun kelimeleri için arka planda hazırla
     
     # 2-Aşamalı Merkezleme
-    FINE_TUNE_STEP_MM = 0.05     # İkinci aşama hassas adım
+    FINE_TUNE_STEP_MM = 0.05     # İkinci aşama hassas adım (alt-piksel ortalaması yoksa)
+    SUBPX_SAMPLES = 3            # Hassas aşamada alt-piksel merkez için ortalanan ayrı OCR sonucu sayısı
     FINE_TUNE_ENABLED = True
 
 
@@ -191,14 +280,35 @@ class Config:
     NEGATE_SCREEN_X = True       # 180 derece için (Deneme yanılma gerekir)
     NEGATE_SCREEN_Y = True       # 180 derece için
 
+    # ── KALİBRASYON: Afin Dönüşüm ─────────────────
+    # Otomatik kalibrasyonun en küçük kareler ile oturttuğu 2×3 matris:
+    # [motor_dx, motor_dy] = M · [piksel_dx, piksel_dy, 1]. Dönme ve eğikliği de kapsar;
+    # tanımlıysa swap/negate bayrakları ve PIXEL_TO_MM_X/Y yerine kullanılır.
+    CAMERA_TO_MOTOR_AFFINE = None
+    CALIBRATION_STEP_MM = 1.0        # Kalibrasyon ızgarasının adım aralığı (mm)
+    CALIBRATION_GRID = 3             # Izgara boyutu (N×N nokta)
+
+    # ── KALİBRASYON: Lens Distorsiyonu ────────────
+    # Dama tahtası karelerinden oturtulan model yalnızca tespit koordinatlarına
+    # (OCR merkezleri, doğrulama ROI köşeleri) uygulanır; kareler yeniden örneklenmez.
+    CHECKERBOARD_COLS = 9            # İç köşe sayısı (yatay)
+    CHECKERBOARD_ROWS = 6            # İç köşe sayısı (dikey)
+    LENS_LUT_STEP = 16               # Düzeltme tablosu ızgara aralığı (px)
+    LENS_UNDISTORT_ROIS = False      # Doğrulama ROI'leri ideal (distorsiyonsuz) koordinatlarda kabul edilir
+                                     # (kayıtlı ROI'ler ham kare pikselinde girildi — açılırsa yeniden girilmeli)
+
     # Konfigürasyon dosya yolu
     CONFIG_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config.json')
     BASES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bases.json')
     SCENARIOS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scenarios.json')
     MASTER_SCENARIOS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'master_scenarios.json')
     VERIFICATION_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'verification.json')
+    OCR_TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'ocr_templates')
+    LENS_MODEL_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'lens_model.json')
+    BOARD_MAPS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'board_maps.json')
     BASES = []
     SCENARIOS = []
+    VOCAB_VERSION = 0   # OCR sözlüğü kaynakları değiştikçe artar (kaydedilmez)
     MASTER_SCENARIOS = []
     VERIFICATION = {
         'boxes': [],
@@ -217,7 +327,14 @@ class Config:
             "target_text": self.TARGET_TEXT,
             "target_words": self.TARGET_WORDS,
             "auto_center_tolerance": self.AUTO_CENTER_TOLERANCE,
+            "auto_center_result_timeout": self.AUTO_CENTER_RESULT_TIMEOUT,
             "auto_center_max_iter": self.AUTO_CENTER_MAX_ITER,
+            "search_overlap": self.SEARCH_OVERLAP,
+            "search_radius_mm": self.SEARCH_RADIUS_MM,
+            "board_type": self.BOARD_TYPE,
+            "board_map_overlap": self.BOARD_MAP_OVERLAP,
+            "board_map_merge_mm": self.BOARD_MAP_MERGE_MM,
+            "board_map_min_confidence": self.BOARD_MAP_MIN_CONFIDENCE,
             "invert_x": self.INVERT_X,
             "invert_y": self.INVERT_Y,
             "feed_rate": self.FEED_RATE,
@@ -228,11 +345,39 @@ class Config:
             "negate_screen_y": self.NEGATE_SCREEN_Y,
             "negate_screen_x": self.NEGATE_SCREEN_X,
             "negate_screen_y": self.NEGATE_SCREEN_Y,
+            "camera_to_motor_affine": self.CAMERA_TO_MOTOR_AFFINE,
+            "calibration_step_mm": self.CALIBRATION_STEP_MM,
+            "calibration_grid": self.CALIBRATION_GRID,
+            "checkerboard_cols": self.CHECKERBOARD_COLS,
+            "checkerboard_rows": self.CHECKERBOARD_ROWS,
+            "lens_lut_step": self.LENS_LUT_STEP,
+            "lens_undistort_rois": self.LENS_UNDISTORT_ROIS,
             "ocr_groups": self.OCR_GROUPS,
             "target_group": self.TARGET_GROUP,
+            "ocr_vocab_active_group_only": self.OCR_VOCAB_ACTIVE_GROUP_ONLY,
+            "ocr_vocab_cache_size": self.OCR_VOCAB_CACHE_SIZE,
+            "ocr_cache_enabled": self.OCR_CACHE_ENABLED,
+            "ocr_cache_size": self.OCR_CACHE_SIZE,
+            "ocr_cache_ttl": self.OCR_CACHE_TTL,
+            "ocr_backend": self.OCR_BACKEND,
+            "ocr_template_min_score": self.OCR_TEMPLATE_MIN_SCORE,
+            "ocr_tessdata_path": self.OCR_TESSDATA_PATH,
+            "ocr_language": self.OCR_LANGUAGE,
+            "ocr_dnn_model": self.OCR_DNN_MODEL,
+            "ocr_dnn_alphabet": self.OCR_DNN_ALPHABET,
+            "ocr_accuracy_bar": self.OCR_ACCURACY_BAR,
+            "ocr_api_pool_size": self.OCR_API_POOL_SIZE,
+            "ocr_api_pool_warmup": self.OCR_API_POOL_WARMUP,
             "fine_tune_step_mm": self.FINE_TUNE_STEP_MM,
+            "subpx_samples": self.SUBPX_SAMPLES,
             "fine_tune_enabled": self.FINE_TUNE_ENABLED,
             "stream_max_width": self.STREAM_MAX_WIDTH,
+            "overlay_client_side": self.OVERLAY_CLIENT_SIDE,
+            "capture_mode": self.CAPTURE_MODE,
+            "preview_width": self.PREVIEW_WIDTH,
+            "capture_idle_hold": self.CAPTURE_IDLE_HOLD,
+            "capture_process": self.CAPTURE_PROCESS,
+            "capture_process_slots": self.CAPTURE_PROCESS_SLOTS,
             "selected_target_word": self.SELECTED_TARGET_WORD,
             "ocr_confidence": self.OCR_CONFIDENCE_THRESHOLD,
             "ocr_psm_mode": self.OCR_PSM_MODE,
@@ -241,6 +386,26 @@ class Config:
             "ocr_min_word_length": self.OCR_MIN_WORD_LENGTH,
             "box_growth_limit": self.BOX_GROWTH_LIMIT,
             "auto_home": self.AUTO_HOME,
+            "ocr_region_detect": self.OCR_REGION_DETECT,
+            "ocr_region_pad": self.OCR_REGION_PAD,
+            "ocr_region_max": self.OCR_REGION_MAX,
+            "ocr_tracking_enabled": self.OCR_TRACKING_ENABLED,
+            "ocr_full_scan_interval": self.OCR_FULL_SCAN_INTERVAL,
+            "tracker_enabled": self.TRACKER_ENABLED,
+            "track_width": self.TRACK_WIDTH,
+            "track_history": self.TRACK_HISTORY,
+            "track_max_points": self.TRACK_MAX_POINTS,
+            "track_min_points": self.TRACK_MIN_POINTS,
+            "track_max_age": self.TRACK_MAX_AGE,
+            "ocr_track_margin": self.OCR_TRACK_MARGIN,
+            "ocr_focus_margin": self.OCR_FOCUS_MARGIN,
+            "ocr_gate_enabled": self.OCR_GATE_ENABLED,
+            "ocr_gate_min_sharpness": self.OCR_GATE_MIN_SHARPNESS,
+            "ocr_gate_diff_threshold": self.OCR_GATE_DIFF_THRESHOLD,
+            "settle_width": self.SETTLE_WIDTH,
+            "settle_max_shift": self.SETTLE_MAX_SHIFT,
+            "settle_frames": self.SETTLE_FRAMES,
+            "settle_timeout": self.SETTLE_TIMEOUT,
             # Nozzle
             "nozzle_serial_port": self.NOZZLE_SERIAL_PORT,
             "nozzle_serial_baud": self.NOZZLE_SERIAL_BAUD,
@@ -277,7 +442,14 @@ class Config:
         if "target_text" in data: self.TARGET_TEXT = str(data["target_text"])
         if "target_words" in data: self.TARGET_WORDS = list(data["target_words"])
         if "auto_center_tolerance" in data: self.AUTO_CENTER_TOLERANCE = int(data["auto_center_tolerance"])
+        if "auto_center_result_timeout" in data: self.AUTO_CENTER_RESULT_TIMEOUT = float(data["auto_center_result_timeout"])
         if "auto_center_max_iter" in data: self.AUTO_CENTER_MAX_ITER = int(data["auto_center_max_iter"])
+        if "search_overlap" in data: self.SEARCH_OVERLAP = float(data["search_overlap"])
+        if "search_radius_mm" in data: self.SEARCH_RADIUS_MM = float(data["search_radius_mm"])
+        if "board_type" in data: self.BOARD_TYPE = str(data["board_type"]).strip()
+        if "board_map_overlap" in data: self.BOARD_MAP_OVERLAP = float(data["board_map_overlap"])
+        if "board_map_merge_mm" in data: self.BOARD_MAP_MERGE_MM = float(data["board_map_merge_mm"])
+        if "board_map_min_confidence" in data: self.BOARD_MAP_MIN_CONFIDENCE = float(data["board_map_min_confidence"])
         if "invert_x" in data: self.INVERT_X = bool(data["invert_x"])
         if "invert_y" in data: self.INVERT_Y = bool(data["invert_y"])
         if "feed_rate" in data: self.FEED_RATE = int(data["feed_rate"])
@@ -285,11 +457,41 @@ class Config:
         if "negate_screen_x" in data: self.NEGATE_SCREEN_X = bool(data["negate_screen_x"])
         if "negate_screen_x" in data: self.NEGATE_SCREEN_X = bool(data["negate_screen_x"])
         if "negate_screen_y" in data: self.NEGATE_SCREEN_Y = bool(data["negate_screen_y"])
+        if "camera_to_motor_affine" in data:
+            m = data["camera_to_motor_affine"]
+            self.CAMERA_TO_MOTOR_AFFINE = [[float(v) for v in row] for row in m] if m else None
+        if "calibration_step_mm" in data: self.CALIBRATION_STEP_MM = float(data["calibration_step_mm"])
+        if "calibration_grid" in data: self.CALIBRATION_GRID = int(data["calibration_grid"])
+        if "checkerboard_cols" in data: self.CHECKERBOARD_COLS = int(data["checkerboard_cols"])
+        if "checkerboard_rows" in data: self.CHECKERBOARD_ROWS = int(data["checkerboard_rows"])
+        if "lens_lut_step" in data: self.LENS_LUT_STEP = int(data["lens_lut_step"])
+        if "lens_undistort_rois" in data: self.LENS_UNDISTORT_ROIS = bool(data["lens_undistort_rois"])
         if "ocr_groups" in data: self.OCR_GROUPS = data["ocr_groups"]
         if "target_group" in data: self.TARGET_GROUP = str(data["target_group"])
+        if "ocr_vocab_active_group_only" in data: self.OCR_VOCAB_ACTIVE_GROUP_ONLY = bool(data["ocr_vocab_active_group_only"])
+        if "ocr_vocab_cache_size" in data: self.OCR_VOCAB_CACHE_SIZE = int(data["ocr_vocab_cache_size"])
+        if "ocr_cache_enabled" in data: self.OCR_CACHE_ENABLED = bool(data["ocr_cache_enabled"])
+        if "ocr_cache_size" in data: self.OCR_CACHE_SIZE = int(data["ocr_cache_size"])
+        if "ocr_cache_ttl" in data: self.OCR_CACHE_TTL = float(data["ocr_cache_ttl"])
+        if "ocr_backend" in data: self.OCR_BACKEND = str(data["ocr_backend"])
+        if "ocr_template_min_score" in data: self.OCR_TEMPLATE_MIN_SCORE = float(data["ocr_template_min_score"])
+        if "ocr_tessdata_path" in data: self.OCR_TESSDATA_PATH = str(data["ocr_tessdata_path"])
+        if "ocr_language" in data: self.OCR_LANGUAGE = str(data["ocr_language"])
+        if "ocr_dnn_model" in data: self.OCR_DNN_MODEL = str(data["ocr_dnn_model"])
+        if "ocr_dnn_alphabet" in data: self.OCR_DNN_ALPHABET = str(data["ocr_dnn_alphabet"])
+        if "ocr_accuracy_bar" in data: self.OCR_ACCURACY_BAR = float(data["ocr_accuracy_bar"])
+        if "ocr_api_pool_size" in data: self.OCR_API_POOL_SIZE = int(data["ocr_api_pool_size"])
+        if "ocr_api_pool_warmup" in data: self.OCR_API_POOL_WARMUP = bool(data["ocr_api_pool_warmup"])
         if "fine_tune_step_mm" in data: self.FINE_TUNE_STEP_MM = float(data["fine_tune_step_mm"])
+        if "subpx_samples" in data: self.SUBPX_SAMPLES = int(data["subpx_samples"])
         if "fine_tune_enabled" in data: self.FINE_TUNE_enabled = bool(data["fine_tune_enabled"])
         if "stream_max_width" in data: self.STREAM_MAX_WIDTH = int(data["stream_max_width"])
+        if "overlay_client_side" in data: self.OVERLAY_CLIENT_SIDE = bool(data["overlay_client_side"])
+        if "capture_mode" in data: self.CAPTURE_MODE = str(data["capture_mode"])
+        if "preview_width" in data: self.PREVIEW_WIDTH = int(data["preview_width"])
+        if "capture_idle_hold" in data: self.CAPTURE_IDLE_HOLD = float(data["capture_idle_hold"])
+        if "capture_process" in data: self.CAPTURE_PROCESS = bool(data["capture_process"])
+        if "capture_process_slots" in data: self.CAPTURE_PROCESS_SLOTS = int(data["capture_process_slots"])
         if "selected_target_word" in data: self.SELECTED_TARGET_WORD = str(data["selected_target_word"])
         if "ocr_confidence" in data: self.OCR_CONFIDENCE_THRESHOLD = int(data["ocr_confidence"])
         if "ocr_psm_mode" in data: self.OCR_PSM_MODE = int(data["ocr_psm_mode"])
@@ -298,6 +500,26 @@ class Config:
         if "ocr_min_word_length" in data: self.OCR_MIN_WORD_LENGTH = int(data["ocr_min_word_length"])
         if "box_growth_limit" in data: self.BOX_GROWTH_LIMIT = float(data["box_growth_limit"])
         if "auto_home" in data: self.AUTO_HOME = bool(data["auto_home"])
+        if "ocr_region_detect" in data: self.OCR_REGION_DETECT = bool(data["ocr_region_detect"])
+        if "ocr_region_pad" in data: self.OCR_REGION_PAD = int(data["ocr_region_pad"])
+        if "ocr_region_max" in data: self.OCR_REGION_MAX = int(data["ocr_region_max"])
+        if "ocr_tracking_enabled" in data: self.OCR_TRACKING_ENABLED = bool(data["ocr_tracking_enabled"])
+        if "ocr_full_scan_interval" in data: self.OCR_FULL_SCAN_INTERVAL = int(data["ocr_full_scan_interval"])
+        if "tracker_enabled" in data: self.TRACKER_ENABLED = bool(data["tracker_enabled"])
+        if "track_width" in data: self.TRACK_WIDTH = int(data["track_width"])
+        if "track_history" in data: self.TRACK_HISTORY = int(data["track_history"])
+        if "track_max_points" in data: self.TRACK_MAX_POINTS = int(data["track_max_points"])
+        if "track_min_points" in data: self.TRACK_MIN_POINTS = int(data["track_min_points"])
+        if "track_max_age" in data: self.TRACK_MAX_AGE = float(data["track_max_age"])
+        if "ocr_track_margin" in data: self.OCR_TRACK_MARGIN = int(data["ocr_track_margin"])
+        if "ocr_focus_margin" in data: self.OCR_FOCUS_MARGIN = int(data["ocr_focus_margin"])
+        if "ocr_gate_enabled" in data: self.OCR_GATE_ENABLED = bool(data["ocr_gate_enabled"])
+        if "ocr_gate_min_sharpness" in data: self.OCR_GATE_MIN_SHARPNESS = float(data["ocr_gate_min_sharpness"])
+        if "ocr_gate_diff_threshold" in data: self.OCR_GATE_DIFF_THRESHOLD = float(data["ocr_gate_diff_threshold"])
+        if "settle_width" in data: self.SETTLE_WIDTH = int(data["settle_width"])
+        if "settle_max_shift" in data: self.SETTLE_MAX_SHIFT = float(data["settle_max_shift"])
+        if "settle_frames" in data: self.SETTLE_FRAMES = int(data["settle_frames"])
+        if "settle_timeout" in data: self.SETTLE_TIMEOUT = float(data["settle_timeout"])
         # Nozzle
         if "nozzle_serial_port" in data: self.NOZZLE_SERIAL_PORT = str(data["nozzle_serial_port"])
         if "nozzle_serial_baud" in data: self.NOZZLE_SERIAL_BAUD = int(data["nozzle_serial_baud"])
@@ -326,6 +548,11 @@ class Config:
         # Target words'ü seçili gruba göre güncelle
         if self.TARGET_GROUP in self.OCR_GROUPS:
             self.TARGET_WORDS = self.OCR_GROUPS[self.TARGET_GROUP]
+
+        # OCR sözlüğü bir sonraki karede yeniden oluşturulur
+        if any(k in data for k in ("target_words", "ocr_groups", "target_group",
+                                   "ocr_vocab_active_group_only", "ocr_vocab_cache_size")):
+            self.VOCAB_VERSION += 1
             
         self.save_config()
 
@@ -528,6 +755,18 @@ def add_error(message, level="ERROR"):
 #  PNP MOTOR SÜRÜCÜSÜ (GRBL Serial)
 # ═════════════════════════════════════════════════════════════════════════════
 
+def tracks_motion(f):
+    """Hareket metodu süresince driver.in_motion bayrağını True tutar."""
+    @functools.wraps(f)
+    def decorated(self, *args, **kwargs):
+        self.in_motion = True
+        try:
+            return f(self, *args, **kwargs)
+        finally:
+            self.in_motion = False
+    return decorated
+
+
 class PNPDriver:
     """
     GRBL tabanlı PNP makine sürücüsü.
@@ -544,6 +783,8 @@ class PNPDriver:
         self.current_z = 0.0
         self.grbl_state = "Unknown"    # Idle, Run, Hold, Alarm, etc.
         self.alarm_active = False
+        self.move_seq = 0              # Her hareket komutunda artar (kamera takibi için)
+        self.in_motion = False         # Hareket komutu yürütülürken True (kamera modu için)
         self._lock = threading.Lock()
 
     def find_port(self):
@@ -665,6 +906,7 @@ class PNPDriver:
                 add_error(error_msg)
                 return False
 
+    @tracks_motion
     def move_relative(self, dx=0, dy=0, dz=0, feed=None):
         """
         Göreceli hareket (G91 ile).
@@ -697,8 +939,10 @@ class PNPDriver:
         self.current_x += dx
         self.current_y += dy
         self.current_z += dz
+        self.move_seq += 1
         return True
 
+    @tracks_motion
     def move_absolute_z(self, z_mm, feed=None):
         """
         Mutlak Z hareketi (G90).
@@ -711,8 +955,10 @@ class PNPDriver:
         success = self.send(cmd)
         if success:
             self.current_z = z_mm
+        self.move_seq += 1
         return success
 
+    @tracks_motion
     def move_absolute(self, x=None, y=None, z=None, feed=None):
         """Mutlak koordinata hareket."""
         feed = feed or config.FEED_RATE
@@ -730,8 +976,10 @@ class PNPDriver:
         log.info(f"Mutlak hareket: {cmd}")
         self.send(cmd)
         self.send("G4 P0")
+        self.move_seq += 1
         return True
 
+    @tracks_motion
     def home(self):
         """Home komutu ($H) — tüm eksenleri referans noktasına taşır."""
         log.info("Home başlatılıyor ($H)...")
@@ -741,6 +989,7 @@ class PNPDriver:
             self.current_x = 0.0
             self.current_y = 0.0
             self.current_z = 0.0
+            self.move_seq += 1
             time.sleep(1)
             return True
         else:
@@ -1395,6 +1644,1458 @@ class NozzleController:
         }
 
 
+# ═════════════════════════════════════════════════════════════════════════════
+#  OCR KELİME DAĞARCIĞI (Bulanık düzeltme indeksi)
+# ═════════════════════════════════════════════════════════════════════════════
+
+class OCRVocabulary:
+    """
+    OCR bulanık düzeltme indeksi.
+    Kelimeler uzunluğa göre kovalanır; bir metin için sadece benzerlik eşiğine
+    ulaşabilecek uzunluktaki kelimeler karşılaştırılır. Sonuç
+    difflib.get_close_matches(text, words, n=1, cutoff) ile aynıdır
+    (eşitlikte büyük olan kelime). Ham metin → sonuç LRU önbelleğinde tutulur.
+    """
+
+    def __init__(self, words, cutoff=0.7, cache_size=4096):
+        self.words = sorted(set(w for w in words if w))
+        self.cutoff = cutoff
+        self.exact = set(self.words)
+        self.buckets = {}
+        for w in self.words:
+            self.buckets.setdefault(len(w), []).append(w)
+        self.correct = functools.lru_cache(maxsize=cache_size)(self._correct)
+
+    def _candidate_lengths(self, n):
+        """ratio = 2*M / (n + m) ≤ 2*min(n, m) / (n + m) — eşiğe ulaşabilecek uzunluklar."""
+        c = self.cutoff
+        return [m for m in self.buckets if 2 * min(n, m) >= c * (n + m)]
+
+    def _correct(self, text):
+        """En yakın kelime veya None."""
+        if text in self.exact:
+            return text
+
+        s = difflib.SequenceMatcher()
+        s.set_seq2(text)
+        best = None
+        for m in self._candidate_lengths(len(text)):
+            for w in self.buckets[m]:
+                s.set_seq1(w)
+                if s.real_quick_ratio() >= self.cutoff and s.quick_ratio() >= self.cutoff:
+                    score = s.ratio()
+                    if score >= self.cutoff and (best is None or (score, w) > best):
+                        best = (score, w)
+        return best[1] if best else None
+
+    def cache_info(self):
+        info = self.correct.cache_info()
+        return {'hits': info.hits, 'misses': info.misses, 'size': info.currsize}
+
+
+def vocabulary_words():
+    """Düzeltme sözlüğü kelimeleri: tüm gruplar veya (ayarlıysa) sadece aktif grup."""
+    if config.OCR_VOCAB_ACTIVE_GROUP_ONLY:
+        return list(config.OCR_GROUPS.get(config.TARGET_GROUP) or config.TARGET_WORDS)
+    words = []
+    for group_words in config.OCR_GROUPS.values():
+        words.extend(group_words)
+    # Eski config (grup yok): hedef kelime listesi
+    return words or list(config.TARGET_WORDS)
+
+
+# ═════════════════════════════════════════════════════════════════════════════
+#  OCR SONUÇ ÖNBELLEĞİ (Algısal hash)
+# ═════════════════════════════════════════════════════════════════════════════
+
+def dhash(image, hash_w=32, hash_h=8):
+    """
+    Fark hash'i (dHash): görüntü (hash_w+1)×hash_h'ye küçültülür, yan yana
+    piksellerin parlaklık farkının işareti bit olarak paketlenir.
+    Etiket kesitleri geniş olduğu için yatay çözünürlük daha yüksek tutulur.
+    """
+    small = cv2.resize(image, (hash_w + 1, hash_h), interpolation=cv2.INTER_AREA)
+    return np.packbits(small[:, 1:] > small[:, :-1]).tobytes()
+
+
+class OCRResultCache:
+    """
+    Bölge kesiti → OCR sonucu LRU önbelleği.
+    Anahtar: (dHash, genişlik, yükseklik, etiket) — etiket whitelist/PSM gibi
+    tanımayı etkileyen ayarları ayırır. Kayıtlar OCR_CACHE_TTL sonra düşer.
+    """
+
+    def __init__(self, clock=time.time):
+        self._entries = OrderedDict()   # key → (zaman, sonuç)
+        self._clock = clock
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(crop, tag=''):
+        h, w = crop.shape[:2]
+        return (dhash(crop), w, h, tag)
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is not None and self._clock() - entry[0] <= config.OCR_CACHE_TTL:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+        if entry is not None:
+            del self._entries[key]
+        self.misses += 1
+        return None
+
+    def put(self, key, value):
+        self._entries[key] = (self._clock(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > config.OCR_CACHE_SIZE:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / total, 3) if total else 0.0,
+            'size': len(self._entries),
+        }
+
+
+# ═════════════════════════════════════════════════════════════════════════════
+#  OCR MOTORLARI (Tesseract / OpenCV DNN / Şablon)
+# ═════════════════════════════════════════════════════════════════════════════
+
+def app_path(path):
+    """Göreli yolları uygulama dizinine göre çöz."""
+    if os.path.isabs(path):
+        return path
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), path)
+
+
+def build_region_mosaic(image, regions, gap=10):
+    """
+    Aday bölgeleri beyaz bir tuvale alt alta diz — tek Tesseract çağrısı
+    ile toplu tanıma yapılır.
+    Dönen: (mosaic, slots) — slots: [(mosaic_y, (x, y, w, h)), ...]
+    Bölge yoksa (None, []) döner.
+    """
+    if not regions:
+        return None, []
+
+    width = max(r[2] for r in regions) + 2 * gap
+    height = sum(r[3] + gap for r in regions) + gap
+    mosaic = np.full((height, width), 255, dtype=np.uint8)
+
+    slots = []
+    y = gap
+    for (rx, ry, rw, rh) in regions:
+        mosaic[y:y + rh, gap:gap + rw] = image[ry:ry + rh, rx:rx + rw]
+        slots.append((y, (rx, ry, rw, rh)))
+        y += rh + gap
+    return mosaic, slots
+
+
+def map_mosaic_box(box, slots, gap=10):
+    """
+    Mozaik üzerindeki kelime kutusunu orijinal kare koordinatına çevir.
+    Dönen: (slot indeksi, (x, y, w, h)) veya None
+    """
+    bx, by, bw, bh = box
+    mid_y = by + bh / 2
+    for i, (slot_y, (rx, ry, rw, rh)) in enumerate(slots):
+        if slot_y <= mid_y < slot_y + rh:
+            x1 = max(rx, rx + bx - gap)
+            y1 = max(ry, ry + by - slot_y)
+            x2 = min(rx + rw, rx + bx - gap + bw)
+            y2 = min(ry + rh, ry + by - slot_y + bh)
+            if x2 <= x1 or y2 <= y1:
+                return None
+            return i, (x1, y1, x2 - x1, y2 - y1)
+    return None
+
+
+def focus_whitelist(word):
+    """Odaklı mod whitelist'i: hedef kelimenin harfleri (sıralı, tekrarsız)."""
+    return ''.join(sorted(set(word)))
+
+
+def create_tesseract_api(psm_mode, whitelist, lang=None):
+    """Tesseract API oluştur."""
+    psm_map = {
+        3: tesserocr.PSM.AUTO,
+        6: tesserocr.PSM.SINGLE_BLOCK,
+        11: tesserocr.PSM.SPARSE_TEXT,
+    }
+    psm = psm_map.get(psm_mode, tesserocr.PSM.SINGLE_BLOCK)
+    _api = tesserocr.PyTessBaseAPI(
+        path=config.OCR_TESSDATA_PATH,
+        lang=lang or config.OCR_LANGUAGE,
+        psm=psm,
+        oem=tesserocr.OEM.LSTM_ONLY
+    )
+    _api.SetVariable("tessedit_do_invert", "0")
+    if whitelist:
+        _api.SetVariable("tessedit_char_whitelist", whitelist)
+    return _api
+
+
+class TemplateRecognizer:
+    """
+    Sabit kelime dağarcığı için şablon tanıyıcı (Tesseract alternatifi).
+    Kayıt (enrolment) sırasında her kelimenin threshold kesiti saklanır; tanımada
+    aday bölgenin mürekkep kutusu sabit boyuta normalize edilip tüm şablonlarla
+    normalize çapraz korelasyon (NCC) tek matris çarpımıyla hesaplanır.
+    Şablonlar OCR_TEMPLATE_DIR/<KELİME>/*.png olarak saklanır.
+    """
+
+    NORM_W = 96
+    NORM_H = 24
+    MAX_ASPECT_RATIO = 1.5           # En-boy oranı bu kattan farklı şablonlar elenir
+    WORD_GAP_RATIO = 0.4             # Harf yüksekliğine göre: bundan dar boşluklar kelime içidir
+
+    def __init__(self, template_dir):
+        self.template_dir = template_dir
+        self.words = []                                   # Şablon başına kelime
+        self.aspects = np.zeros(0)                        # Şablon başına en-boy oranı
+        self.matrix = np.zeros((0, self.NORM_W * self.NORM_H), dtype=np.float32)
+        self.load()
+
+    @classmethod
+    def normalize(cls, crop):
+        """
+        Threshold kesitini (siyah yazı / beyaz zemin) tanıma vektörüne çevir.
+        Dönen: (birim vektör, mürekkep kutusu (x, y, w, h)) — mürekkep yoksa (None, None)
+        """
+        pts = cv2.findNonZero(cv2.bitwise_not(crop))
+        if pts is None:
+            return None, None
+        x, y, w, h = cv2.boundingRect(pts)
+        if w < 3 or h < 3:
+            return None, None
+        ink = cv2.resize(crop[y:y + h, x:x + w], (cls.NORM_W, cls.NORM_H), interpolation=cv2.INTER_AREA)
+        vec = ink.astype(np.float32).ravel()
+        vec -= vec.mean()
+        norm = np.linalg.norm(vec)
+        if norm < 1e-6:
+            return None, None
+        return vec / norm, (x, y, w, h)
+
+    @classmethod
+    def split_words(cls, crop):
+        """
+        Aday bölgeyi (detect_text_regions satır bloğu) kelime boyutunda mürekkep gruplarına ayır.
+        Harfler, medyan harf yüksekliğiyle orantılı dar bir yatay kapamayla birleştirilir;
+        kelime aralıkları açık kalır.
+        Dönen: [(x, y, w, h), ...] — kesit koordinatlarında
+        """
+        ink = cv2.bitwise_not(crop)
+        n, _, stats, _ = cv2.connectedComponentsWithStats(ink, connectivity=8)
+        heights = stats[1:, cv2.CC_STAT_HEIGHT]
+        heights = heights[heights >= 3]
+        if heights.size == 0:
+            return []
+        char_h = float(np.median(heights))
+        gap = max(2, int(round(char_h * cls.WORD_GAP_RATIO)))
+        kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (gap, 3))
+        merged = cv2.morphologyEx(ink, cv2.MORPH_CLOSE, kernel)
+        n, _, stats, _ = cv2.connectedComponentsWithStats(merged, connectivity=8)
+        return [tuple(int(v) for v in stats[i, :4]) for i in range(1, n)
+                if stats[i, cv2.CC_STAT_HEIGHT] >= char_h * 0.5 and stats[i, cv2.CC_STAT_WIDTH] >= 3]
+
+    def _add(self, word, crop):
+        vec, bbox = self.normalize(crop)
+        if vec is None:
+            return False
+        self.words.append(word)
+        self.aspects = np.append(self.aspects, bbox[2] / bbox[3])
+        self.matrix = np.vstack([self.matrix, vec[None, :]])
+        return True
+
+    def load(self):
+        """Şablonları diskten yükle."""
+        self.words = []
+        self.aspects = np.zeros(0)
+        self.matrix = np.zeros((0, self.NORM_W * self.NORM_H), dtype=np.float32)
+        if not os.path.isdir(self.template_dir):
+            return
+        for word in sorted(os.listdir(self.template_dir)):
+            for path in sorted(glob.glob(os.path.join(self.template_dir, word, '*.png'))):
+                crop = cv2.imread(path, cv2.IMREAD_GRAYSCALE)
+                if crop is not None:
+                    self._add(word, crop)
+        if self.words:
+            log.info(f"OCR şablonları yüklendi: {len(self.words)} şablon, {len(set(self.words))} kelime")
+
+    def enroll(self, word, crop):
+        """Kelime şablonu ekle ve diske kaydet. Geçersiz kelime/kesitte False."""
+        if not word or not word.isalnum():
+            return False
+        if not self._add(word, crop):
+            return False
+        folder = os.path.join(self.template_dir, word)
+        os.makedirs(folder, exist_ok=True)
+        cv2.imwrite(os.path.join(folder, f"{int(time.time() * 1000)}.png"), crop)
+        return True
+
+    def clear(self):
+        """Tüm şablonları sil."""
+        import shutil
+        if os.path.isdir(self.template_dir):
+            shutil.rmtree(self.template_dir)
+        self.load()
+
+    def summary(self):
+        counts = {}
+        for w in self.words:
+            counts[w] = counts.get(w, 0) + 1
+        return counts
+
+    def recognize(self, image, regions):
+        """
+        Aday bölgeleri şablonlarla eşleştir. Çok kelimeli bölgeler önce kelimelere ayrılır
+        (şablonlar tek kelimedir).
+        Dönen: [((x, y, w, h), text, conf), ...] — kare koordinatlarında, conf 0-100
+        """
+        words = []
+        if not self.words:
+            return words
+        log_max = np.log(self.MAX_ASPECT_RATIO)
+        for rx, ry, rw, rh in regions:
+            region = image[ry:ry + rh, rx:rx + rw]
+            for wx, wy, ww, wh in self.split_words(region):
+                vec, bbox = self.normalize(region[wy:wy + wh, wx:wx + ww])
+                if vec is None:
+                    continue
+                bx, by, bw, bh = bbox
+                mask = np.abs(np.log(self.aspects / (bw / bh))) < log_max
+                if not mask.any():
+                    continue
+                idx = np.nonzero(mask)[0]
+                scores = self.matrix[idx] @ vec
+                k = int(np.argmax(scores))
+                score = float(scores[k])
+                if score >= config.OCR_TEMPLATE_MIN_SCORE:
+                    words.append(((rx + wx + bx, ry + wy + by, bw, bh), self.words[idx[k]], score * 100.0))
+        return words
+
+
+class TesseractAPIPool:
+    """
+    Önceden başlatılmış PyTessBaseAPI örnekleri havuzu — anahtar (psm, whitelist, dil).
+    Yapılandırma değişimi traineddata'yı yeniden yüklemek yerine sözlük aramasıdır;
+    en uzun süredir kullanılmayan örnek (aktif olan hariç) düşülür.
+    Tek tüketici (OCR worker) varsayılır; ısınma thread'i sadece yeni örnek ekler.
+    """
+
+    def __init__(self, size):
+        self.size = max(1, size)
+        self._apis = OrderedDict()
+        self._lock = threading.Lock()
+        self._active = None
+        self._closed = False
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(psm_mode, whitelist):
+        return (psm_mode, whitelist or '', config.OCR_LANGUAGE)
+
+    def acquire(self, psm_mode, whitelist):
+        """(psm, whitelist) için API — havuzda yoksa oluşturulur (yavaş yol)."""
+        key = self.key(psm_mode, whitelist)
+        with self._lock:
+            api = self._apis.get(key)
+            if api is not None:
+                self._apis.move_to_end(key)
+                self._active = key
+                self.hits += 1
+                return api
+
+        self.misses += 1
+        api = create_tesseract_api(*key)
+        with self._lock:
+            existing = self._apis.get(key)
+            if existing is not None:
+                # Isınma thread'i aynı anda oluşturmuş
+                evicted = [api]
+                api = existing
+            else:
+                self._apis[key] = api
+                evicted = []
+            self._apis.move_to_end(key)
+            self._active = key
+            evicted.extend(self._evict())
+        for old in evicted:
+            old.End()
+        return api
+
+    def _evict(self):
+        """Boyut aşıldıysa LRU örnekleri çıkar (kilit altında çağrılır)."""
+        evicted = []
+        for key in list(self._apis):
+            if len(self._apis) <= self.size:
+                break
+            if key != self._active:
+                evicted.append(self._apis.pop(key))
+        return evicted
+
+    def warm_async(self, pairs):
+        """(psm, whitelist) çiftlerini arka planda hazırla (havuz dolunca durur)."""
+        threading.Thread(target=self._warm, args=(list(pairs),), daemon=True).start()
+
+    def _warm(self, pairs):
+        warmed = 0
+        for psm_mode, whitelist in pairs:
+            key = self.key(psm_mode, whitelist)
+            with self._lock:
+                if self._closed or len(self._apis) >= self.size:
+                    break
+                if key in self._apis:
+                    continue
+            try:
+                api = create_tesseract_api(*key)
+            except Exception as e:
+                log.error(f"Tesseract ısınma hatası {key}: {e}")
+                continue
+            with self._lock:
+                if self._closed or key in self._apis:
+                    api.End()
+                    continue
+                # Yeni örnek en son kullanılan uca eklenir — ilk çıkarılan o olmaz
+                self._apis[key] = api
+                warmed += 1
+        if warmed:
+            log.info(f"Tesseract havuzu ısındı: {warmed} örnek")
+
+    def stats(self):
+        with self._lock:
+            keys = [f"psm={k[0]} wl={k[1]}" for k in self._apis]
+        return {'size': len(keys), 'hits': self.hits, 'misses': self.misses, 'entries': keys}
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            apis = list(self._apis.values())
+            self._apis.clear()
+        for api in apis:
+            api.End()
+
+
+class OCREngine(ABC):
+    """
+    OCR motoru arayüzü (soyut — recognize her motorda tanımlanmalı).
+    recognize(image, regions, max_area) → [((x, y, w, h), text, conf), ...]
+    image: threshold görüntüsü (siyah yazı / beyaz zemin), kutular kare koordinatlarında,
+    conf 0-100. regions None ise tam kare okunur; needs_regions=True olan motorlar
+    tam kare okuyamaz, çağıran önce aday bölgeleri tespit etmelidir.
+    """
+
+    name = ''
+    needs_regions = False
+
+    @classmethod
+    def is_available(cls, camera):
+        return True
+
+    @classmethod
+    def create(cls, camera):
+        return cls()
+
+    def configure(self, psm_mode, whitelist):
+        """PSM / whitelist değişikliği (desteklemeyen motorlarda etkisiz)."""
+
+    def set_whitelist(self, whitelist):
+        """Geçici whitelist (odaklı mod)."""
+
+    @abstractmethod
+    def recognize(self, image, regions=None, max_area=None):
+        """Bölgeleri (None: tam kare) oku."""
+
+    def close(self):
+        """Kaynakları serbest bırak."""
+
+
+class TesseractEngine(OCREngine):
+    """
+    tesserocr motoru — bölgeler tek mozaikte toplu okunur.
+    PSM / whitelist değişimleri TesseractAPIPool üzerinden anlık geçiştir.
+    """
+
+    name = 'tesseract'
+
+    def __init__(self, psm_mode, whitelist, warmup=False):
+        self.pool = TesseractAPIPool(config.OCR_API_POOL_SIZE)
+        self.psm_mode = psm_mode
+        self.api = self.pool.acquire(psm_mode, whitelist)
+        if warmup:
+            # Odaklı mod whitelist'leri (aktif grubun kelimeleri) önceden hazırlanır
+            self.pool.warm_async((psm_mode, focus_whitelist(w)) for w in config.TARGET_WORDS if w)
+
+    @classmethod
+    def is_available(cls, camera):
+        return TESSEROCR_AVAILABLE
+
+    @classmethod
+    def create(cls, camera):
+        return cls(config.OCR_PSM_MODE, config.OCR_WHITELIST, warmup=config.OCR_API_POOL_WARMUP)
+
+    def configure(self, psm_mode, whitelist):
+        self.psm_mode = psm_mode
+        self.api = self.pool.acquire(psm_mode, whitelist)
+
+    def set_whitelist(self, whitelist):
+        self.api = self.pool.acquire(self.psm_mode, whitelist)
+
+    def recognize(self, image, regions=None, max_area=None):
+        if regions is None:
+            return self._words(image, max_area)
+        mosaic, slots = build_region_mosaic(image, regions)
+        words = []
+        for box, text, conf in self._words(mosaic, max_area):
+            mapped = map_mosaic_box(box, slots)
+            if mapped is not None:
+                words.append((mapped[1], text, conf))
+        return words
+
+    def _words(self, image, max_area=None):
+        """
+        Görüntüdeki kelimeleri Tesseract ile oku (WORD seviyesi).
+        Dönen: [((x, y, w, h), text, conf), ...] — görüntü koordinatlarında
+        """
+        if image is None:
+            return []
+        api = self.api
+        img_h, img_w = image.shape[:2]
+        api.SetImage(Image.fromarray(image))
+        boxes = api.GetComponentImages(tesserocr.RIL.WORD, True)
+
+        words = []
+        for im, box, _, _ in boxes:
+            x = box['x']
+            y = box['y']
+            w_box = box['w']
+            h_box = box['h']
+
+            # Sınır kontrolü
+            if x < 0 or y < 0 or x + w_box > img_w or y + h_box > img_h:
+                continue
+            if w_box <= 0 or h_box <= 0:
+                continue
+            # Minimum boyut filtresi (çok küçük gürültü)
+            if w_box < 5 or h_box < 5:
+                continue
+            # Maksimum boyut filtresi (sapıtma)
+            if max_area is not None and w_box * h_box > max_area:
+                continue
+
+            api.SetRectangle(x, y, w_box, h_box)
+            text = api.GetUTF8Text().strip()
+            conf = api.MeanTextConf()
+            words.append(((x, y, w_box, h_box), text, conf))
+        return words
+
+    def close(self):
+        self.pool.close()
+
+
+class OpenCVDNNEngine(OCREngine):
+    """
+    OpenCV DNN metin tanıma motoru (CPU, CRNN + CTC).
+    Tüm aday bölgeler tek blob halinde ağa verilir; çıktı açgözlü (greedy) CTC
+    ile çözülür, güven = seçilen karakter olasılıklarının ortalaması.
+    Model: OCR_DNN_MODEL (gri tonlu 1x1x32x100 girişli CRNN, ör. OpenCV örneklerindeki crnn.onnx)
+    """
+
+    name = 'opencv_dnn'
+    needs_regions = True
+    INPUT_W = 100
+    INPUT_H = 32
+
+    def __init__(self, model_path, alphabet_path):
+        self.net = cv2.dnn.readNet(model_path)
+        self.net.setPreferableBackend(cv2.dnn.DNN_BACKEND_OPENCV)
+        self.net.setPreferableTarget(cv2.dnn.DNN_TARGET_CPU)
+        with open(alphabet_path) as f:
+            self.alphabet = [line.rstrip('\n') for line in f if line.rstrip('\n')]
+        self.whitelist = None
+
+    @classmethod
+    def is_available(cls, camera):
+        return (os.path.isfile(app_path(config.OCR_DNN_MODEL))
+                and os.path.isfile(app_path(config.OCR_DNN_ALPHABET)))
+
+    @classmethod
+    def create(cls, camera):
+        return cls(app_path(config.OCR_DNN_MODEL), app_path(config.OCR_DNN_ALPHABET))
+
+    def configure(self, psm_mode, whitelist):
+        self.set_whitelist(whitelist)
+
+    def set_whitelist(self, whitelist):
+        self.whitelist = set(whitelist) if whitelist else None
+
+    def recognize(self, image, regions=None, max_area=None):
+        if not regions:
+            return []
+        crops = [cv2.resize(image[ry:ry + rh, rx:rx + rw], (self.INPUT_W, self.INPUT_H),
+                            interpolation=cv2.INTER_AREA)
+                 for rx, ry, rw, rh in regions]
+        blob = cv2.dnn.blobFromImages(crops, scalefactor=1.0 / 127.5,
+                                      size=(self.INPUT_W, self.INPUT_H), mean=127.5)
+        self.net.setInput(blob)
+        out = self.net.forward()                      # (T, N, C) log-olasılık / logit
+        out = out.reshape(out.shape[0], len(regions), -1)
+        prob = np.exp(out - out.max(axis=2, keepdims=True))
+        prob /= prob.sum(axis=2, keepdims=True)
+        best = prob.argmax(axis=2)                    # (T, N) — 0: CTC boşluk
+        best_p = prob.max(axis=2)
+
+        words = []
+        for i, rect in enumerate(regions):
+            chars, confs, prev = [], [], 0
+            for t in range(best.shape[0]):
+                k = int(best[t, i])
+                if k != 0 and k != prev and k - 1 < len(self.alphabet):
+                    chars.append(self.alphabet[k - 1])
+                    confs.append(best_p[t, i])
+                prev = k
+            text = ''.join(chars).upper()
+            if self.whitelist is not None:
+                text = ''.join(c for c in text if c in self.whitelist)
+            if text:
+                words.append((tuple(rect), text, float(np.mean(confs)) * 100.0))
+        return words
+
+
+class TemplateEngine(OCREngine):
+    """Şablon tanıyıcı motoru (TemplateRecognizer) — sadece aday bölgelerle çalışır."""
+
+    name = 'template'
+    needs_regions = True
+
+    def __init__(self, recognizer):
+        self.recognizer = recognizer
+
+    @classmethod
+    def is_available(cls, camera):
+        return bool(camera.template_recognizer.words)
+
+    @classmethod
+    def create(cls, camera):
+        return cls(camera.template_recognizer)
+
+    def recognize(self, image, regions=None, max_area=None):
+        if not regions:
+            return []
+        return self.recognizer.recognize(image, regions)
+
+
+# Kayıtlı OCR motorları (seçilen kullanılamazsa bu sırayla denenir)
+OCR_ENGINES = {
+    TesseractEngine.name: TesseractEngine,
+    TemplateEngine.name: TemplateEngine,
+    OpenCVDNNEngine.name: OpenCVDNNEngine,
+}
+
+
+def available_ocr_engines(camera):
+    """Bu makinede kullanılabilir OCR motorlarının adları."""
+    return [name for name, cls in OCR_ENGINES.items() if cls.is_available(camera)]
+
+
+def create_ocr_engine(camera, name=None):
+    """
+    OCR motoru oluştur. İstenen motor (varsayılan OCR_BACKEND) kullanılamıyor
+    veya başlatılamıyorsa diğer motorlar denenir. Hiçbiri yoksa None.
+    """
+    name = name or config.OCR_BACKEND
+    order = [name] + [n for n in OCR_ENGINES if n != name]
+    for candidate in order:
+        cls = OCR_ENGINES.get(candidate)
+        if cls is None or not cls.is_available(camera):
+            continue
+        try:
+            engine = cls.create(camera)
+        except Exception as e:
+            log.error(f"OCR motoru başlatılamadı ({candidate}): {e}")
+            continue
+        if candidate != name:
+            log.warning(f"OCR motoru '{name}' kullanılamıyor — '{candidate}' kullanılıyor.")
+        return engine
+    return None
+
+
+# ═════════════════════════════════════════════════════════════════════════════
+#  KAMERA ARKA UÇLARI (Picamera2 / Simülasyon)
+# ═════════════════════════════════════════════════════════════════════════════
+
+def lores_size(width, height, stream_width):
+    """
+    Düşük çözünürlüklü (display) stream boyutu — genişlik STREAM_MAX_WIDTH,
+    en-boy oranı korunur, YUV420 için çift sayıya yuvarlanır.
+    Ana çözünürlük zaten küçükse None (ikinci stream gereksiz).
+    """
+    if width <= stream_width:
+        return None
+    lw = stream_width & ~1
+    lh = int(height * lw / width) & ~1
+    return (lw, lh)
+
+
+def capture_modes():
+    """
+    Önceden tanımlı yakalama modları: {'full': (w, h), 'preview': (w, h)}.
+    'preview' hareket sırasında kullanılan hızlı, düşük çözünürlüklü moddur.
+    """
+    full = (config.CAMERA_WIDTH, config.CAMERA_HEIGHT)
+    if config.PREVIEW_WIDTH >= full[0]:
+        return {'full': full, 'preview': full}
+    pw = config.PREVIEW_WIDTH & ~1
+    ph = int(full[1] * pw / full[0]) & ~1
+    return {'full': full, 'preview': (pw, ph)}
+
+
+class Picamera2Backend:
+    """
+    Picamera2 kamera arka ucu.
+    180° döndürme ISP'de (libcamera Transform) yapılır; ana stream OCR/doğrulama için,
+    'lores' stream (STREAM_MAX_WIDTH) display için kullanılır.
+    Her yakalama modu için konfigürasyon önceden oluşturulur, geçiş switch_mode ile yapılır.
+    """
+
+    simulation = False
+
+    def __init__(self):
+        self.picam2 = None
+        self.transform = None        # libcamera Transform (ISP'de 180° döndürme)
+        self.sw_rotate = False       # Transform desteklenmezse yazılımda döndür
+        self.configs = {}            # mod → (picamera2 config, lores boyutu)
+        self.mode = 'full'
+        self.lores = None            # Aktif modun (w, h) lores boyutu veya None
+        self.frame_time = 0.0        # Son karenin yakalanma zamanı (time.monotonic)
+
+    def _create_config(self, width, height, stream_width):
+        main = {"size": (width, height), "format": "RGB888"}
+        if self.sw_rotate:
+            return self.picam2.create_preview_configuration(main=main), None
+
+        lores_wh = lores_size(width, height, stream_width)
+        lores = {"size": lores_wh, "format": "YUV420"} if lores_wh else None
+        cam_config = self.picam2.create_preview_configuration(
+            main=main, lores=lores, transform=self.transform
+        )
+        return cam_config, lores_wh
+
+    def _prepare(self, modes, stream_width):
+        """Tüm modların konfigürasyonlarını oluştur ve doğrula."""
+        try:
+            self.configs = {m: self._create_config(w, h, stream_width) for m, (w, h) in modes.items()}
+            self.picam2.configure(self.configs[self.mode][0])
+        except Exception as e:
+            # Eski sürümler / desteklenmeyen sensör: tek stream + yazılım döndürme
+            log.warning(f"ISP döndürme/lores stream kullanılamadı, yazılıma dönülüyor: {e}")
+            self.sw_rotate = True
+            self.configs = {m: self._create_config(w, h, stream_width) for m, (w, h) in modes.items()}
+            self.picam2.configure(self.configs[self.mode][0])
+        self.lores = self.configs[self.mode][1]
+
+    def start(self, modes, stream_width):
+        # Tüm importlar kamera açılmadan önce — ImportError açık kamera bırakmaz
+        from picamera2 import Picamera2
+        try:
+            from libcamera import Transform
+            self.transform = Transform(hflip=1, vflip=1)
+        except ImportError:
+            log.warning("libcamera Transform bulunamadı, döndürme yazılımda yapılacak")
+            self.sw_rotate = True
+
+        self.picam2 = Picamera2()
+        try:
+            self._prepare(modes, stream_width)
+            self.picam2.start()
+        except Exception:
+            self.picam2.close()
+            self.picam2 = None
+            raise
+
+        # Oto-fokus ve beyaz ayarı
+        try:
+            self.picam2.set_controls({"AfMode": 2, "AwbMode": 0})
+        except Exception as e:
+            log.warning(f"Kamera kontrol ayarı uygulanamadı: {e}")
+
+    def reconfigure(self, modes, stream_width):
+        self.picam2.stop()
+        self._prepare(modes, stream_width)
+        self.picam2.start()
+
+    def switch(self, mode):
+        """Önceden hazırlanmış moda geç (sadece kamera thread'inden çağrılır)."""
+        cam_config, lores_wh = self.configs[mode]
+        self.picam2.switch_mode(cam_config)
+        self.mode = mode
+        self.lores = lores_wh
+
+    def capture(self):
+        """Returns: (aktif mod çözünürlüğünde gri, display gri veya None)"""
+        if self.lores:
+            (frame_rgb, frame_yuv), metadata = self.picam2.capture_arrays(["main", "lores"])
+            lw, lh = self.lores
+            # YUV420: ilk lh satır Y (parlaklık) düzlemi = gri görüntü
+            lores_gray = np.ascontiguousarray(frame_yuv[:lh, :lw])
+        else:
+            (frame_rgb,), metadata = self.picam2.capture_arrays(["main"])
+            lores_gray = None
+        self.frame_time = self.sensor_time(metadata)
+
+        gray = cv2.cvtColor(frame_rgb, cv2.COLOR_RGB2GRAY)
+        if self.sw_rotate:
+            gray = cv2.rotate(gray, cv2.ROTATE_180)
+        return gray, lores_gray
+
+    @staticmethod
+    def sensor_time(metadata):
+        """
+        Karenin pozlandığı an (time.monotonic): libcamera SensorTimestamp (ns, CLOCK_MONOTONIC).
+        Tamponda bekleyen kareler hareket sırasında pozlanmış olabilir — çağrının döndüğü an
+        değil pozlama anı kullanılır. Damga yoksa / saat uyuşmuyorsa şimdiki zaman.
+        """
+        now = time.monotonic()
+        ts = (metadata or {}).get('SensorTimestamp')
+        if ts:
+            t = ts / 1e9
+            if now - 1.0 < t <= now:
+                return t
+        return now
+
+    def stop(self):
+        if self.picam2:
+            self.picam2.stop()
+
+
+class SimulatedCameraBackend:
+    """
+    Donanımsız çalışma ve testler için kamera arka ucu.
+    frame_source verilirse (callable: (width, height) → gri frame) kareler oradan alınır,
+    yoksa sabit 'SIMULASYON' karesi döner (boyut başına bir kez oluşturulur).
+    """
+
+    simulation = True
+
+    def __init__(self, frame_source=None):
+        self.frame_source = frame_source
+        self.modes = {'full': (config.CAMERA_WIDTH, config.CAMERA_HEIGHT)}
+        self.mode = 'full'
+        self._frame = None
+        self.frame_time = 0.0
+
+    def start(self, modes, stream_width):
+        self.modes = dict(modes)
+
+    def reconfigure(self, modes, stream_width):
+        self.modes = dict(modes)
+
+    def switch(self, mode):
+        self.mode = mode
+
+    def capture(self):
+        w, h = self.modes[self.mode]
+        self.frame_time = time.monotonic()
+        if self.frame_source is not None:
+            return self.frame_source(w, h), None
+
+        # Siyah ekran + metin
+        if self._frame is None or self._frame.shape != (w, h):
+            frame = np.zeros((w, h), dtype=np.uint8)  # rotate sonrası boyut
+            cv2.putText(frame, "SIMULASYON", (20, w // 2),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.7, 150, 2)
+            self._frame = frame
+        return self._frame, None
+
+    def stop(self):
+        pass
+
+
+def synthetic_frame(width, height):
+    """
+    Benchmark / test kare kaynağı: kayan desen + gürültü (her çağrıda yeni kare).
+    SimulatedCameraBackend(frame_source=synthetic_frame) ile kullanılır.
+    """
+    t = time.monotonic()
+    frame = np.random.randint(0, 40, (height, width), dtype=np.uint8)
+    x = int(t * 200) % max(1, width - 200)
+    cv2.rectangle(frame, (x, height // 3), (x + 200, height // 3 + 80), 255, -1)
+    cv2.putText(frame, "TEST", (x + 20, height // 3 + 60), cv2.FONT_HERSHEY_SIMPLEX, 2, 0, 4)
+    return cv2.GaussianBlur(frame, (5, 5), 0)
+
+
+class FrameRing:
+    """
+    Paylaşımlı bellek kare halkası (tek yazar süreç, tek okuyucu süreç).
+
+    Düzen: int64 başlık + her yuva için [gri kare | display karesi] baytları.
+    Başlık: [son yazılan yuva, kira 0..KIRA-1, yuva başına (seq, mod, gh, gw, lh, lw, t_ns)]
+    Yazar yuva seq'ini -1 yapıp veriyi yazar, sonra seq'i yayınlar (seqlock);
+    okuyucunun kiraladığı son yuvalar üzerine yazılmaz. Kira yalnızca okuma anını
+    korur: görünümler birkaç kare sonra geçersizleşeceği için kareler kopyalanarak
+    okunur (copy=True) ve kopya sırasında yuvanın yeniden yazılmadığı doğrulanır.
+    """
+
+    LEASES = 3
+    SLOT_FIELDS = 7
+
+    def __init__(self, n_slots, gray_bytes, lores_bytes, name=None):
+        self.n_slots = max(self.LEASES + 2, n_slots)
+        self.gray_bytes = gray_bytes
+        self.lores_bytes = max(1, lores_bytes)
+        self.slot_bytes = self.gray_bytes + self.lores_bytes
+        header_len = 1 + self.LEASES + self.n_slots * self.SLOT_FIELDS
+        self.header_bytes = header_len * 8
+        size = self.header_bytes + self.n_slots * self.slot_bytes
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        self.header = np.ndarray((header_len,), dtype=np.int64, buffer=self.shm.buf)
+        self.slots = self.header[1 + self.LEASES:].reshape(self.n_slots, self.SLOT_FIELDS)
+        self.leases = self.header[1:1 + self.LEASES]
+        self.data = np.ndarray((self.n_slots, self.slot_bytes), dtype=np.uint8,
+                               buffer=self.shm.buf, offset=self.header_bytes)
+        if name is None:
+            self.header[:] = -1
+        self._next = 0
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def spec(self):
+        """Yazar sürecin halkayı açması için gereken bilgiler."""
+        return (self.n_slots, self.gray_bytes, self.lores_bytes, self.name)
+
+    def write(self, seq, mode_idx, gray, lores, t_ns=None):
+        """Kareyi kiralanmamış en eski yuvaya yaz (yazar süreç). t_ns: pozlama anı (monotonic ns)."""
+        leased = set(int(v) for v in self.leases)
+        for _ in range(self.n_slots):
+            i = self._next
+            self._next = (self._next + 1) % self.n_slots
+            if i not in leased:
+                break
+        slot = self.slots[i]
+        slot[0] = -1                                   # Yazılıyor
+        gh, gw = gray.shape[:2]
+        self.data[i, :gh * gw] = gray.reshape(-1)
+        if lores is not None:
+            lh, lw = lores.shape[:2]
+            self.data[i, self.gray_bytes:self.gray_bytes + lh * lw] = lores.reshape(-1)
+        else:
+            lh = lw = 0
+        slot[1:7] = (mode_idx, gh, gw, lh, lw, time.monotonic_ns() if t_ns is None else t_ns)
+        slot[0] = seq                                  # Yayınla
+        self.header[0] = i
+
+    def read_latest(self, after_seq, copy=False):
+        """
+        after_seq'ten yeni son kare (okuyucu süreç).
+        copy=True: diziler yuvadan kopyalanır ve kopyalama sırasında yuvanın yeniden
+        yazılmadığı doğrulanır (kira sınırlı sayıda — uzun süre tutulacak kareler için).
+        Returns: (seq, mod indeksi, gri görünüm, display görünümü veya None, t_ns) veya None
+        """
+        i = int(self.header[0])
+        if i < 0:
+            return None
+        seq = int(self.slots[i, 0])
+        if seq <= after_seq:
+            return None
+        # Kirala, sonra yuvanın hâlâ aynı kareyi taşıdığını doğrula
+        self.leases[1:] = self.leases[:-1].copy()
+        self.leases[0] = i
+        if int(self.slots[i, 0]) != seq:
+            return None
+        mode_idx, gh, gw, lh, lw, t_ns = (int(v) for v in self.slots[i, 1:7])
+        gray = self.data[i, :gh * gw].reshape(gh, gw)
+        lores = self.data[i, self.gray_bytes:self.gray_bytes + lh * lw].reshape(lh, lw) if lh else None
+        if copy:
+            gray = gray.copy()
+            lores = lores.copy() if lores is not None else None
+            if int(self.slots[i, 0]) != seq:
+                return None                            # Kopyalanırken üzerine yazıldı
+        return seq, mode_idx, gray, lores, t_ns
+
+    def close(self, unlink=False):
+        self.header = self.slots = self.leases = self.data = None
+        try:
+            self.shm.close()
+        except BufferError:
+            # Dışarıda hâlâ görünüm var — eşleme süreç çıkışında serbest kalır
+            pass
+        if unlink:
+            self.shm.unlink()
+
+
+def capture_process_main(kind, modes, mode, stream_width, ring_spec, ctrl_q, reply_q, stop_event):
+    """
+    Yakalama süreci: kamera arka ucundan kare alır, display karesini hazırlar ve
+    paylaşımlı bellek halkasına yazar. Komutlar ctrl_q ('switch', mod) ile gelir.
+    """
+    ring = FrameRing(*ring_spec[:3], name=ring_spec[3])
+    if kind == 'picamera2':
+        backend = Picamera2Backend()
+    else:
+        backend = SimulatedCameraBackend(frame_source=synthetic_frame if kind == 'synthetic' else None)
+    backend.mode = mode                                # Yeniden başlatmada aktif mod korunur
+    try:
+        backend.start(modes, stream_width)
+    except ImportError as e:
+        reply_q.put(('import_error', str(e)))
+        ring.close()
+        return
+    except Exception as e:
+        reply_q.put(('error', str(e)))
+        ring.close()
+        return
+    reply_q.put(('ready', backend.simulation, backend.mode))
+
+    names = list(modes)
+    seq = 0
+    while not stop_event.is_set():
+        try:
+            cmd = ctrl_q.get_nowait()
+        except queue.Empty:
+            cmd = None
+        if cmd is not None and cmd[0] == 'switch':
+            # Yanıt istek numarasıyla etiketlenir (zaman aşımına uğramış isteğin geç yanıtı ayıklanır)
+            _, mode_name, req_id = cmd
+            try:
+                backend.switch(mode_name)
+                reply_q.put(('ok', mode_name, req_id))
+            except Exception as e:
+                reply_q.put(('error', str(e), req_id))
+
+        try:
+            gray, lores = backend.capture()
+        except Exception:
+            time.sleep(0.01)
+            continue
+        if gray is None:
+            continue
+
+        # Ön işleme: lores stream yoksa display karesi burada küçültülür
+        h, w = gray.shape[:2]
+        if lores is None and w > stream_width:
+            lw = stream_width & ~1
+            lores = cv2.resize(gray, (lw, int(h * lw / w) & ~1), interpolation=cv2.INTER_AREA)
+
+        seq += 1
+        ring.write(seq, names.index(backend.mode), gray, lores, int(backend.frame_time * 1e9))
+
+    backend.stop()
+    ring.close()
+
+
+class ProcessCameraBackend:
+    """
+    Kamera arka ucunu ayrı süreçte çalıştırır (GIL paylaşılmaz).
+    Kareler FrameRing'den kopyalanarak okunur: CameraManager kareyi (OCR, doğrulama,
+    JPEG) kiralama süresinden uzun tutar. Mod geçişleri süreçte uygulanır ve onay beklenir.
+    kind: 'picamera2', 'simulated' veya 'synthetic' (benchmark)
+    """
+
+    START_TIMEOUT = 15.0
+    SWITCH_TIMEOUT = 2.0
+    FRAME_TIMEOUT = 1.0
+
+    def __init__(self, kind='picamera2', slots=None):
+        self.kind = kind
+        self.n_slots = slots or config.CAPTURE_PROCESS_SLOTS
+        self.simulation = kind != 'picamera2'
+        self.mode = 'full'
+        self.modes = {}
+        self.ring = None
+        self.process = None
+        self.last_seq = 0
+        self.frame_time = 0.0            # Son okunan karenin yakalanma zamanı (süreçte, time.monotonic)
+        self._switch_id = 0              # Mod geçişi istek numarası
+
+    def start(self, modes, stream_width):
+        self.modes = dict(modes)
+        names = list(self.modes)
+        gray_bytes = max(w * h for w, h in self.modes.values())
+        lores_bytes = 0
+        for w, h in self.modes.values():
+            if w > stream_width:
+                lw = stream_width & ~1
+                lores_bytes = max(lores_bytes, lw * (int(h * lw / w) & ~1))
+        self.ring = FrameRing(self.n_slots, gray_bytes, lores_bytes)
+
+        ctx = multiprocessing.get_context('spawn')   # libcamera fork sonrası güvenli değil
+        self._ctrl_q = ctx.Queue()
+        self._reply_q = ctx.Queue()
+        self._stop_event = ctx.Event()
+        self.process = ctx.Process(
+            target=capture_process_main, name='pnp-capture', daemon=True,
+            args=(self.kind, self.modes, self.mode, stream_width, self.ring.spec(),
+                  self._ctrl_q, self._reply_q, self._stop_event))
+        self.process.start()
+
+        try:
+            reply = self._reply_q.get(timeout=self.START_TIMEOUT)
+        except queue.Empty:
+            reply = ('error', 'yakalama süreci yanıt vermedi')
+        if reply[0] != 'ready':
+            self.stop()
+            if reply[0] == 'import_error':
+                raise ImportError(reply[1])
+            raise RuntimeError(reply[1])
+        _, self.simulation, self.mode = reply
+        self._mode_names = names
+        self.last_seq = 0
+
+    def reconfigure(self, modes, stream_width):
+        # Kare boyutları değişebilir — halka yeniden oluşturulur
+        self.stop()
+        self.start(modes, stream_width)
+
+    def switch(self, mode):
+        self._switch_id += 1
+        req_id = self._switch_id
+        self._ctrl_q.put(('switch', mode, req_id))
+        deadline = time.monotonic() + self.SWITCH_TIMEOUT
+        try:
+            while True:
+                # Önceki (zaman aşımına uğramış) isteklerin geç yanıtları atlanır
+                reply = self._reply_q.get(timeout=max(0.0, deadline - time.monotonic()))
+                if reply[-1] == req_id:
+                    break
+        except queue.Empty:
+            # Geçiş yine de uygulanabilir — süreç bilinen moda geri döndürülür (yanıtı atlanır)
+            self._switch_id += 1
+            self._ctrl_q.put(('switch', self.mode, self._switch_id))
+            raise RuntimeError('yakalama süreci mod geçişine yanıt vermedi')
+        if reply[0] != 'ok':
+            raise RuntimeError(reply[1])
+        self.mode = mode
+
+    def capture(self):
+        """Returns: (gri görünüm, display görünümü veya None) — zaman aşımında (None, None)"""
+        deadline = time.monotonic() + self.FRAME_TIMEOUT
+        while time.monotonic() < deadline:
+            frame = self.ring.read_latest(self.last_seq, copy=True)
+            if frame is not None:
+                seq, mode_idx, gray, lores, t_ns = frame
+                self.last_seq = seq
+                # Geçiş öncesi moddan kalan kareler atlanır (yanlış ölçek etiketi olmasın)
+                if self._mode_names[mode_idx] == self.mode:
+                    self.frame_time = t_ns / 1e9
+                    return gray, lores
+            time.sleep(0.001)
+        return None, None
+
+    def stop(self):
+        if self.process is not None:
+            self._stop_event.set()
+            self.process.join(timeout=2.0)
+            if self.process.is_alive():
+                self.process.terminate()
+            self.process = None
+        if self.ring is not None:
+            self.ring.close(unlink=True)
+            self.ring = None
+
+
+# ═════════════════════════════════════════════════════════════════════════════
+#  LENS DİSTORSİYON MODELİ (Dama tahtası kalibrasyonu)
+# ═════════════════════════════════════════════════════════════════════════════
+
+class LensModel:
+    """
+    Lens distorsiyon modeli (OpenCV pinhole + radyal/teğetsel katsayılar).
+    Dama tahtası kareleri add_view() ile toplanır, fit() ile kamera matrisi ve
+    distorsiyon katsayıları oturtulup LENS_MODEL_FILE'a kaydedilir.
+    Kareler yeniden örneklenmez: ham → ideal dönüşüm için LENS_LUT_STEP aralıklı
+    bir ızgarada önceden hesaplanmış tablodan çift doğrusal enterpolasyon yapılır;
+    ideal → ham (ROI köşeleri) doğrudan distorsiyon polinomuyla hesaplanır.
+    Tüm koordinatlar tam çözünürlük pikselidir; model farklı çözünürlükte
+    oturtulduysa noktalar orantılı ölçeklenir.
+    """
+
+    MIN_VIEWS = 3
+
+    def __init__(self, path):
+        self.path = path
+        self.views = []                  # Toplanan dama tahtası köşeleri (N×1×2 float32)
+        self.view_size = None            # Toplanan karelerin (w, h) boyutu
+        self.camera_matrix = None
+        self.dist_coeffs = None
+        self.size = None                 # Modelin oturtulduğu (w, h)
+        self.rms = None
+        self.lut = None                  # (rows, cols, 2) ham ızgara noktasının ideal karşılığı
+        self.lut_step = None
+        self.lock = threading.Lock()
+        self.load()
+
+    @property
+    def ready(self):
+        return self.lut is not None
+
+    def status(self):
+        with self.lock:
+            return {
+                'ready': self.ready,
+                'views': len(self.views),
+                'min_views': self.MIN_VIEWS,
+                'size': list(self.size) if self.size else None,
+                'rms': self.rms,
+                'dist_coeffs': [round(float(v), 6) for v in self.dist_coeffs.ravel()] if self.ready else None,
+            }
+
+    def load(self):
+        """Modeli diskten yükle (yoksa düzeltme yapılmaz)."""
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+            self._set(np.array(data['camera_matrix'], dtype=np.float64),
+                      np.array(data['dist_coeffs'], dtype=np.float64),
+                      tuple(data['size']), data.get('rms'))
+            log.info(f"Lens modeli yüklendi: {self.size[0]}x{self.size[1]}, RMS {self.rms}px")
+        except Exception as e:
+            log.error(f"Lens modeli yükleme hatası: {e}")
+
+    def _set(self, camera_matrix, dist_coeffs, size, rms):
+        w, h = size
+        step = max(2, int(config.LENS_LUT_STEP))
+        xs = np.arange(0, w + step, step, dtype=np.float32)
+        ys = np.arange(0, h + step, step, dtype=np.float32)
+        grid = np.stack(np.meshgrid(xs, ys), axis=-1).reshape(-1, 1, 2)
+        ideal = cv2.undistortPoints(grid, camera_matrix, dist_coeffs, P=camera_matrix)
+        with self.lock:
+            self.camera_matrix = camera_matrix
+            self.dist_coeffs = dist_coeffs
+            self.size = (int(w), int(h))
+            self.rms = rms
+            self.lut = ideal.reshape(len(ys), len(xs), 2)
+            self.lut_step = step
+
+    def add_view(self, gray):
+        """
+        Kareden dama tahtası köşelerini bul ve görünüm olarak ekle.
+        Returns: bulunan köşe sayısı (bulunamazsa 0)
+        """
+        pattern = (config.CHECKERBOARD_COLS, config.CHECKERBOARD_ROWS)
+        found, corners = cv2.findChessboardCorners(
+            gray, pattern, cv2.CALIB_CB_ADAPTIVE_THRESH | cv2.CALIB_CB_NORMALIZE_IMAGE)
+        if not found:
+            return 0
+        corners = cv2.cornerSubPix(gray, corners, (11, 11), (-1, -1),
+                                   (cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_MAX_ITER, 30, 0.01))
+        size = (gray.shape[1], gray.shape[0])
+        with self.lock:
+            if self.view_size != size:
+                self.views = []
+                self.view_size = size
+            self.views.append(corners)
+        return len(corners)
+
+    def fit(self):
+        """
+        Toplanan görünümlerden modeli oturt ve kaydet.
+        Returns: reprojeksiyon RMS (px)
+        """
+        # Görünümlerin anlık kopyası — oturtma (yavaş) kilit dışında
+        with self.lock:
+            views = list(self.views)
+            view_size = self.view_size
+        if len(views) < self.MIN_VIEWS:
+            raise ValueError(f"En az {self.MIN_VIEWS} dama tahtası görünümü gerekli ({len(views)} var).")
+        cols, rows = config.CHECKERBOARD_COLS, config.CHECKERBOARD_ROWS
+        obj = np.zeros((cols * rows, 3), np.float32)
+        obj[:, :2] = np.mgrid[0:cols, 0:rows].T.reshape(-1, 2)
+        # k3 sabit: dama tahtasının kapsamadığı köşelerde 6. derece terim kararsız ekstrapole eder
+        rms, K, dist, _, _ = cv2.calibrateCamera(
+            [obj] * len(views), views, view_size, None, None, flags=cv2.CALIB_FIX_K3)
+        rms = round(float(rms), 4)
+        self._set(K, dist.reshape(-1), view_size, rms)
+        with open(self.path, 'w') as f:
+            json.dump({'camera_matrix': K.tolist(), 'dist_coeffs': dist.reshape(-1).tolist(),
+                       'size': list(view_size), 'rms': rms,
+                       'views': len(views)}, f, indent=2)
+        log.info(f"Lens modeli oturtuldu: {len(views)} görünüm, RMS {rms}px")
+        return rms
+
+    def clear(self):
+        """Modeli ve toplanan görünümleri sil."""
+        with self.lock:
+            self.views = []
+            self.view_size = None
+            self.camera_matrix = self.dist_coeffs = self.size = self.rms = self.lut = None
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def _model_scale(self, frame_w):
+        return self.size[0] / float(frame_w or config.CAMERA_WIDTH)
+
+    def undistort_point(self, x, y, frame_w=None):
+        """Ham (görüntüdeki) noktayı ideal (distorsiyonsuz) konuma taşı. Model yoksa aynen döner."""
+        with self.lock:
+            lut, step = self.lut, self.lut_step
+            if lut is None:
+                return float(x), float(y)
+            k = self._model_scale(frame_w)
+        gx = min(max(x * k / step, 0.0), lut.shape[1] - 1.001)
+        gy = min(max(y * k / step, 0.0), lut.shape[0] - 1.001)
+        ix, iy = int(gx), int(gy)
+        fx, fy = gx - ix, gy - iy
+        top = lut[iy, ix] * (1 - fx) + lut[iy, ix + 1] * fx
+        bottom = lut[iy + 1, ix] * (1 - fx) + lut[iy + 1, ix + 1] * fx
+        ux, uy = top * (1 - fy) + bottom * fy
+        return float(ux) / k, float(uy) / k
+
+    def distort_points(self, points, frame_w=None):
+        """İdeal noktaları ham görüntü konumuna taşı (N×2). Model yoksa aynen döner."""
+        pts = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        with self.lock:
+            if self.lut is None:
+                return pts
+            K, dist, k = self.camera_matrix, self.dist_coeffs, self._model_scale(frame_w)
+        norm = (pts * k - K[:2, 2]) / (K[0, 0], K[1, 1])
+        obj = np.hstack([norm, np.ones((len(norm), 1))])
+        raw, _ = cv2.projectPoints(obj, np.zeros(3), np.zeros(3), K, dist)
+        return raw.reshape(-1, 2) / k
+
+    def ideal_offset(self, x, y):
+        """Tam çözünürlük noktasının görüntü merkezine ideal (distorsiyonsuz) uzaklığı (px)."""
+        cx, cy = self.undistort_point(x, y)
+        tx, ty = self.undistort_point(config.CAMERA_WIDTH // 2, config.CAMERA_HEIGHT // 2)
+        return cx - tx, cy - ty
+
+
+# ═════════════════════════════════════════════════════════════════════════════
+#  HEDEF TAKİBİ (Lucas-Kanade optik akış)
+# ═════════════════════════════════════════════════════════════════════════════
+
+class TargetTracker:
+    """
+    OCR sonuçları arasında hedef kutusunu kamera hızında izler.
+    Her kare TRACK_WIDTH genişliğine küçültülüp son TRACK_HISTORY kare saklanır.
+    anchor(): OCR sonucunun kaynak karesinde kutu içindeki köşeler seçilir ve
+    saklanan kareler üzerinden en yeni kareye kadar zincirleme izlenir; böylece
+    OCR gecikmesi ne olursa olsun çapa güncel kareye taşınır.
+    push(): her yeni karede köşeler piramitli LK ile ilerletilir (ileri-geri
+    tutarlılık kontrolüyle); hedef merkezi, çapadaki merkez + köşelerin medyan
+    yer değiştirmesidir. Köşe sayısı TRACK_MIN_POINTS altına düşünce takip kaybolur.
+    Koordinatlar dışarıya tam çözünürlük pikseli olarak verilir.
+    """
+
+    LK_PARAMS = dict(winSize=(21, 21), maxLevel=3,
+                     criteria=(cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 20, 0.03))
+    MAX_FB_ERROR = 1.0               # İleri-geri izleme hatası (küçük kare px)
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.history = []            # [(seq, time, small, factor)] — factor: tam çözünürlük px / küçük px
+        self.target = None           # Çapalanan OCR sonucu (text, rect, center_subpx, frame_seq, frame_time)
+        self.pts0 = None             # Köşelerin çapa karesindeki konumu (N×1×2, küçük px)
+        self.pts = None              # Köşelerin son karedeki konumu
+        self.last_seq = None
+        self.last_time = None
+
+    def reset(self):
+        with self.lock:
+            self.history = []
+            self.target = self.pts0 = self.pts = None
+
+    def _small(self, gray, frame_scale):
+        h, w = gray.shape[:2]
+        sw = min(w, config.TRACK_WIDTH)
+        small = cv2.resize(gray, (sw, max(8, int(round(h * sw / w)))), interpolation=cv2.INTER_AREA)
+        return small, w * frame_scale / sw
+
+    def _step(self, prev, cur, pts):
+        """Köşeleri bir kareden sonrakine ilerlet; ileri-geri tutarlı olanların maskesiyle döner."""
+        if prev.shape != cur.shape:
+            return None, None
+        nxt, st, _ = cv2.calcOpticalFlowPyrLK(prev, cur, pts, None, **self.LK_PARAMS)
+        back, st_back, _ = cv2.calcOpticalFlowPyrLK(cur, prev, nxt, None, **self.LK_PARAMS)
+        fb = np.linalg.norm((pts - back).reshape(-1, 2), axis=1)
+        good = (st.ravel() == 1) & (st_back.ravel() == 1) & (fb < self.MAX_FB_ERROR)
+        return nxt, good
+
+    def _advance(self, prev, cur):
+        """Takipteki köşeleri ilerlet; yetersiz kalırsa takibi düşür (kilit altında çağrılır)."""
+        nxt, good = self._step(prev, cur, self.pts)
+        if nxt is None or good.sum() < config.TRACK_MIN_POINTS:
+            self.target = self.pts0 = self.pts = None
+            return False
+        self.pts0, self.pts = self.pts0[good], nxt[good]
+        return True
+
+    def push(self, gray, frame_scale, seq, frame_time):
+        """Yeni kareyi geçmişe ekle ve takibi ilerlet. Returns: state() veya takip yoksa None"""
+        small, factor = self._small(gray, frame_scale)
+        with self.lock:
+            prev = self.history[-1][2] if self.history else None
+            self.history.append((seq, frame_time, small, factor))
+            del self.history[:-max(2, config.TRACK_HISTORY)]
+            if self.target is None or prev is None:
+                return None
+            if not self._advance(prev, small):
+                return None
+            self.last_seq, self.last_time = seq, frame_time
+            return self._state()
+
+    def anchor(self, item):
+        """
+        OCR sonucuna yeniden çapala (item: rect, center_subpx, text, frame_seq, frame_time).
+        Returns: state() veya kaynak kare geçmişte yoksa / kutuda yeterli köşe yoksa None
+        """
+        with self.lock:
+            idx = next((i for i, h in enumerate(self.history) if h[0] == item['frame_seq']), None)
+            if idx is None:
+                return None
+            _, _, small, factor = self.history[idx]
+            x, y, w, h = (v / factor for v in item['rect'])
+            mask = np.zeros(small.shape[:2], np.uint8)
+            mask[max(0, int(y)):int(y + h) + 1, max(0, int(x)):int(x + w) + 1] = 255
+            pts = cv2.goodFeaturesToTrack(small, config.TRACK_MAX_POINTS, 0.01, 3, mask=mask)
+            if pts is None or len(pts) < config.TRACK_MIN_POINTS:
+                self.target = self.pts0 = self.pts = None
+                return None
+            self.target = item
+            self.pts0 = self.pts = pts.astype(np.float32)
+            self.last_seq, self.last_time = self.history[idx][0], self.history[idx][1]
+            # Çapa karesinden en yeni kareye zincirleme ilerlet
+            for (seq, t, cur, _), (_, _, prev, _) in zip(self.history[idx + 1:], self.history[idx:]):
+                if not self._advance(prev, cur):
+                    return None
+                self.last_seq, self.last_time = seq, t
+            return self._state()
+
+    def _state(self):
+        factor = self.history[-1][3]
+        dx, dy = np.median((self.pts - self.pts0).reshape(-1, 2), axis=0) * factor
+        item = self.target
+        cx, cy = item['center_subpx']
+        x, y, w, h = item['rect']
+        return {
+            'text': item['text'],
+            'rect': (int(round(x + dx)), int(round(y + dy)), w, h),
+            'center': (int(round(cx + dx)), int(round(cy + dy))),
+            'center_subpx': (round(float(cx + dx), 2), round(float(cy + dy), 2)),
+            'frame_seq': self.last_seq,
+            'frame_time': self.last_time,
+            'anchor_seq': item['frame_seq'],
+            'anchor_time': item['frame_time'],
+            'points': int(len(self.pts)),
+        }
+
+
 # ═════════════════════════════════════════════════════════════════════════════
 #  KAMERA YÖNETİCİSİ (Picamera2 + MJPEG Stream)
 # ═════════════════════════════════════════════════════════════════════════════
@@ -1402,27 +3103,63 @@ class NozzleController:
 class CameraManager:
     """
     Kamera yöneticisi.
-    Picamera2 ile görüntü yakalar, OCR için ayrı thread çalıştırır,
-    MJPEG stream için annotasyonlu frame sağlar.
+    Kamera arka ucundan (varsayılan Picamera2) görüntü yakalar, OCR için ayrı
+    thread çalıştırır, MJPEG stream için annotasyonlu frame sağlar.
+    Testlerde backend=SimulatedCameraBackend(...) verilerek donanımsız çalışır.
     """
 
-    def __init__(self):
-        self.picam2 = None
+    def __init__(self, backend=None):
+        self.backend = backend
         self.active = False
         self.simulation = False
 
         # Frame verileri
         self.current_gray = None          # Gri tonlamalı (display için)
-        self.current_thresh = None        # Threshold (OCR için)
+        self._thresh_cache = (-1, None)   # (frame_seq, threshold) — OCR istediğinde tembel hesaplanır
         self.annotated_frame = None       # Kutu + çizgi çizilmiş frame (stream için)
         self.raw_display_frame = None     # Temiz frame (doğrulama tab için)
         self.frame_lock = threading.Lock()
+        self.display_seq = 0              # Yeni display frame sayacı (JPEG önbelleği anahtarı)
+        self.display_size = (0, 0)        # Stream çözünürlüğü (w, h)
+        self._jpeg_cache = {}             # kind → (display_seq, jpeg bytes) — kare başına tek encode
+
+        # İstemci tarafı overlay yayını (main() içinde socketio'ya bağlanır)
+        self.overlay_callback = None
+        self._last_overlay_key = None
+        self._last_overlay_time = 0.0
+        self.frame_seq = 0                # Her yeni karede artar (OCR aynı kareyi iki kez işlemez)
+        self.frame_info = {'seq': 0, 'mode': 'full', 'scale': 1.0, 'time': 0.0}  # current_gray'in etiketi
+
+        # Yakalama modları (bkz. capture_modes) — değişiklikler kamera thread'inde uygulanır
+        self.capture_modes = capture_modes()
+        self.capture_mode = 'full'
+        self._reconfigure_pending = False
+        self._last_motion_time = 0.0
+        self._hud_cache = None            # ((h, w), statik HUD katmanı) — bkz. get_hud_layer
+
+        # OCR kapısı (bulanıklık + sahne değişimi)
+        self.current_gate = None          # Son karenin kapı kararı
+        self._gate_small = None           # Son karenin küçük gri kopyası
+        self._gate_ref_small = None       # Son OCR yapılan karenin küçük gri kopyası
+        self.ocr_gate = {'decision': 'ocr', 'diff': 0.0, 'sharpness': 0.0,
+                         'counts': {'ocr': 0, 'reuse': 0, 'blur': 0, 'motion': 0}}
 
         # OCR sonuçları
-        self.ocr_results = []             # [{text, rect, center}]
+        self.ocr_results = []             # [{text, rect, center, frame_seq, frame_time}]
         self.ocr_lock = threading.Lock()
+        self.ocr_cond = threading.Condition(self.ocr_lock)  # Yeni OCR sonucu yayınlandığında uyarılır
+        self.ocr_source = {'seq': 0, 'time': 0.0, 'run': 0}  # Son OCR yapılan kaynak kare, run: OCR sayacı
         self.ocr_fps = 0.0
         self.display_fps = 0.0
+        # OCR aşama süreleri (tespit ve tanıma ayrı ölçülür)
+        self.ocr_timing = {'detect_ms': 0.0, 'recognize_ms': 0.0, 'regions': 0, 'mode': 'full'}
+        self.ocr_cache = OCRResultCache()  # Değişmeyen kesitlerin OCR sonuçları
+        self.template_recognizer = TemplateRecognizer(config.OCR_TEMPLATE_DIR)
+        self.lens = LensModel(config.LENS_MODEL_FILE)
+        self.tracker = TargetTracker()
+        self.track = None            # Hedef takibinin son durumu (TargetTracker.state, ocr_cond altında)
+        self.ocr_engine_name = None      # ocr_worker'daki aktif motor
+        self._fresh_waiters = 0          # Taze OCR sonucu bekleyen çağrı sayısı (ocr_cond altında)
         self.stable_boxes = {}
         self.box_id_counter = 0
 
@@ -1430,79 +3167,160 @@ class CameraManager:
         self.auto_centering = False
         self.auto_center_status = ""
 
-    def start(self):
-        """Kamerayı başlat."""
-        try:
-            from picamera2 import Picamera2
+        # Odaklı OCR modu (auto-center sırasında tek hedef kelime)
+        self.focus_word = None
+        self.focus_rect = None            # Hedefin son görüldüğü kutu (tam çözünürlük)
 
-            self.picam2 = Picamera2()
-            cam_config = self.picam2.create_preview_configuration(
-                main={
-                    "size": (config.CAMERA_WIDTH, config.CAMERA_HEIGHT),
-                    "format": "RGB888"
-                }
-            )
-            self.picam2.configure(cam_config)
-            self.picam2.start()
+        # Oturma tespiti (bkz. wait_for_settle)
+        self._settle_window = None
+
+        # OCR düzeltme indeksi (bkz. vocabulary)
+        self._vocab = None
+        self._vocab_key = None
 
-            # Oto-fokus ve beyaz ayarı
+    def start(self):
+        """
+        Kamerayı başlat (arka uç verilmediyse Picamera2, başarısızsa simülasyon).
+        CAPTURE_PROCESS açıksa Picamera2 ayrı süreçte çalışır; süreç başlatılamazsa
+        aynı süreçte (thread) yakalamaya dönülür.
+        """
+        backend = self.backend
+        self.capture_modes = capture_modes()
+        started = False
+        if backend is None and config.CAPTURE_PROCESS:
+            backend = ProcessCameraBackend()
             try:
-                self.picam2.set_controls({"AfMode": 2, "AwbMode": 0})
+                backend.start(self.capture_modes, config.STREAM_MAX_WIDTH)
+                started = True
+                log.info("Kamera yakalama süreci aktif (paylaşımlı bellek halkası)")
             except Exception as e:
-                log.warning(f"Kamera kontrol ayarı uygulanamadı: {e}")
+                log.warning(f"Yakalama süreci başlatılamadı, thread moduna dönülüyor: {e}")
+                backend = None
 
-            self.active = True
+        backend = backend or Picamera2Backend()
+        try:
+            if not started:
+                backend.start(self.capture_modes, config.STREAM_MAX_WIDTH)
             log.info(f"Kamera aktif ({config.CAMERA_WIDTH}x{config.CAMERA_HEIGHT})")
 
         except ImportError:
             log.warning("Picamera2 bulunamadı — simülasyon modu aktif")
-            self.simulation = True
-            self.active = True
+            backend = SimulatedCameraBackend()
+            backend.start(self.capture_modes, config.STREAM_MAX_WIDTH)
 
         except Exception as e:
             log.error(f"Kamera başlatma hatası: {e}")
-            self.simulation = True
-            self.active = True
+            backend = SimulatedCameraBackend()
+            backend.start(self.capture_modes, config.STREAM_MAX_WIDTH)
 
-    def capture_frame(self):
+        self.backend = backend
+        self.capture_mode = backend.mode
+        self.simulation = backend.simulation
+        self.active = True
+
+    def request_reconfigure(self):
         """
-        Tek frame yakala, gri tonlamaya çevir, threshold uygula.
-        Simülasyon modunda siyah ekran döndürür.
+        Çözünürlük değişikliği iste (config.CAMERA_WIDTH/HEIGHT).
+        Bloklamaz — kamera thread'i bir sonraki karede uygular.
         """
-        if self.simulation:
-            # Simülasyon — test için siyah ekran + metin
-            h = config.CAMERA_HEIGHT
-            w = config.CAMERA_WIDTH
-            frame = np.zeros((w, h, 3), dtype=np.uint8)  # rotate sonrası boyut
-            cv2.putText(frame, "SIMULASYON", (20, w // 2),
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
-            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-            return gray, gray, frame
+        self._reconfigure_pending = True
 
-        try:
-            frame_rgb = self.picam2.capture_array()
+    def _wanted_capture_mode(self):
+        """Config ve makine durumuna göre istenen yakalama modu."""
+        mode = config.CAPTURE_MODE
+        if mode in self.capture_modes:
+            return mode
 
-            # RGB → Grayscale ve 180° döndür (Baş Aşağı)
-            gray = cv2.cvtColor(frame_rgb, cv2.COLOR_RGB2GRAY)
-            gray_rotated = cv2.rotate(gray, cv2.ROTATE_180)
+        # auto: GRBL Run/Jog veya yürütülen hareket komutu → preview
+        now = time.time()
+        if pnp.in_motion or pnp.grbl_state in ('Run', 'Jog'):
+            self._last_motion_time = now
+            return 'preview'
+        # Histerezis: kısa duraklamalarda mod değiştirip durmamak için bekle
+        if now - self._last_motion_time < config.CAPTURE_IDLE_HOLD:
+            return self.capture_mode
+        return 'full'
+
+    def _apply_capture_mode(self):
+        """Bekleyen çözünürlük ve mod değişikliklerini uygula (sadece kamera thread'inde)."""
+        if self._reconfigure_pending:
+            self._reconfigure_pending = False
+            self.capture_modes = capture_modes()
+            try:
+                self.backend.reconfigure(self.capture_modes, config.STREAM_MAX_WIDTH)
+                if not self.simulation:
+                    log.info("Kamera yeniden başlatıldı")
+            except Exception as e:
+                log.error(f"Kamera yeniden başlatma hatası: {e}")
+                add_error(f"Kamera yeniden başlatma hatası: {e}")
 
-            # OCR için threshold
-            blurred = cv2.GaussianBlur(gray_rotated, (5, 5), 0)
-            thresh = cv2.adaptiveThreshold(
-                blurred, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
-                cv2.THRESH_BINARY, 31, 10
-            )
-            kernel = np.ones((2, 2), np.uint8)
-            thresh = cv2.morphologyEx(thresh, cv2.MORPH_CLOSE, kernel)
+        wanted = self._wanted_capture_mode()
+        if wanted != self.capture_mode:
+            try:
+                self.backend.switch(wanted)
+                self.capture_mode = wanted
+                log.debug(f"Yakalama modu: {wanted} {self.capture_modes[wanted]}")
+            except Exception as e:
+                log.error(f"Yakalama modu değiştirilemedi ({wanted}): {e}")
 
-            # Gösterim için BGR'ye çevir (renkli annotasyonlar için)
-            display = cv2.cvtColor(gray_rotated, cv2.COLOR_GRAY2BGR)
+    def get_frame(self):
+        """
+        Son gri kare ve etiketi.
+        Returns: (gray, {'seq', 'mode', 'scale', 'time'}) — scale: tam çözünürlük / kare çözünürlüğü,
+        time: yakalanma zamanı (time.monotonic)
+        """
+        with self.frame_lock:
+            return self.current_gray, self.frame_info
 
-            return gray_rotated, thresh, display
+    def capture_frame(self):
+        """
+        Tek frame yakala (gri tonlamalı, 180° döndürülmüş — döndürme ISP'de yapılır).
+        Display için arka uç düşük çözünürlüklü ikinci stream sağlıyorsa o da döner;
+        renk dönüşümü stream çözünürlüğünde, sadece annotasyon çizilecekse yapılır.
+        Threshold burada hesaplanmaz — OCR ihtiyaç duyduğunda get_thresh() ile alınır.
+        Returns: (gri frame, display gri frame veya None) — hata durumunda (None, None)
+        """
+        try:
+            return self.backend.capture()
 
         except Exception as e:
             log.error(f"Frame yakalama hatası: {e}")
-            return None, None, None
+            return None, None
+
+    @staticmethod
+    def compute_thresh(gray):
+        """OCR ön-işleme: Gaussian blur + adaptive threshold + morfolojik kapama."""
+        blurred = cv2.GaussianBlur(gray, (5, 5), 0)
+        thresh = cv2.adaptiveThreshold(
+            blurred, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
+            cv2.THRESH_BINARY, 31, 10
+        )
+        kernel = np.ones((2, 2), np.uint8)
+        return cv2.morphologyEx(thresh, cv2.MORPH_CLOSE, kernel)
+
+    def get_thresh(self):
+        """
+        Son karenin threshold görüntüsü (karenin yakalandığı mod çözünürlüğünde).
+        Her kare için en fazla bir kez, sadece istendiğinde hesaplanır ve önbelleğe alınır.
+        Dönen dizi paylaşılır — değiştirilmemeli.
+        Returns: (thresh, frame_info) veya kare yoksa (None, None)
+        """
+        with self.frame_lock:
+            gray = self.current_gray
+            info = self.frame_info
+            cached_seq, cached = self._thresh_cache
+        if gray is None:
+            return None, None
+        seq = info['seq']
+        if cached_seq == seq:
+            return cached, info
+
+        # Hesaplama kilit dışında — kamera döngüsü beklemez
+        thresh = self.compute_thresh(gray)
+        with self.frame_lock:
+            if self._thresh_cache[0] < seq:
+                self._thresh_cache = (seq, thresh)
+        return thresh, info
 
     def iou(self, box1, box2):
         """İki dikdörtgen arasındaki Intersection over Union hesabı."""
@@ -1520,40 +3338,380 @@ class CameraManager:
         union = w1 * h1 + w2 * h2 - inter
         return inter / union if union > 0 else 0.0
 
+    @staticmethod
+    def subpixel_center(thresh, rect, factor=1.0):
+        """
+        Kelimenin alt-piksel merkezi: threshold kesitindeki mürekkep piksellerinin
+        moment ağırlık merkezi (kutu merkezinin aksine kutu kenarı titremesinden etkilenmez).
+        Dönen: (cx, cy) tam çözünürlük piksel koordinatı (float) — mürekkep yoksa kutu merkezi
+        """
+        x, y, w, h = rect
+        crop = thresh[y:y + h, x:x + w]
+        m = cv2.moments(cv2.bitwise_not(crop), binaryImage=True) if crop.size else None
+        if m is None or m['m00'] == 0:
+            cx, cy = x + w / 2.0, y + h / 2.0
+        else:
+            cx, cy = x + m['m10'] / m['m00'], y + m['m01'] / m['m00']
+        if factor != 1.0:
+            # Piksel merkezleri hizalı ölçekleme (kare ↔ tam çözünürlük)
+            cx, cy = (cx + 0.5) * factor - 0.5, (cy + 0.5) * factor - 0.5
+        return (round(cx, 2), round(cy, 2))
+
+    @staticmethod
+    def scale_rect(rect, factor):
+        """(x, y, w, h) kutusunu ölçekle (kare ↔ tam çözünürlük koordinatları)."""
+        if factor == 1.0:
+            return rect
+        return tuple(int(round(v * factor)) for v in rect)
+
+    def evaluate_ocr_gate(self, gray):
+        """
+        Kareye OCR yapılıp yapılmayacağına karar verir (ucuz, küçültülmüş kopyalarla).
+        - 'blur':  Laplacian varyansı düşük → hareket bulanıklığı, OCR atlanır
+        - 'reuse': son OCR karesinden farkı küçük → önceki sonuç yeniden kullanılır
+        - 'ocr':   yeni/değişmiş sahne → tam OCR
+        Returns: (gate dict, küçük gri kopya)
+        """
+        h, w = gray.shape[:2]
+
+        # Keskinlik: orta çözünürlük (ince metin kenarları kaybolmasın)
+        mid_w = min(w, 480)
+        mid = cv2.resize(gray, (mid_w, max(1, int(h * mid_w / w))), interpolation=cv2.INTER_AREA)
+        sharpness = float(cv2.Laplacian(mid, cv2.CV_64F).var())
+
+        # Sahne farkı: çok küçük kopya yeterli (gürültü de ortalanır)
+        small_w = min(w, 160)
+        small = cv2.resize(mid, (small_w, max(1, int(h * small_w / w))), interpolation=cv2.INTER_AREA)
+        ref = self._gate_ref_small
+        diff = float(cv2.absdiff(small, ref).mean()) if ref is not None and ref.shape == small.shape else 255.0
+
+        if not config.OCR_GATE_ENABLED:
+            decision = 'ocr'
+        elif sharpness < config.OCR_GATE_MIN_SHARPNESS:
+            decision = 'blur'
+        elif diff < config.OCR_GATE_DIFF_THRESHOLD:
+            decision = 'reuse'
+        else:
+            decision = 'ocr'
+
+        gate = {'decision': decision, 'diff': round(diff, 2), 'sharpness': round(sharpness, 1)}
+        return gate, small
+
+    def _settle_small(self, gray):
+        """Faz korelasyonu için küçültülmüş float32 kare ve (boyut başına bir kez) Hanning penceresi."""
+        h, w = gray.shape[:2]
+        sw = min(w, config.SETTLE_WIDTH)
+        small = cv2.resize(gray, (sw, max(8, int(h * sw / w))), interpolation=cv2.INTER_AREA)
+        small = small.astype(np.float32)
+        cached = self._settle_window
+        if cached is None or cached.shape != small.shape:
+            cached = cv2.createHanningWindow((small.shape[1], small.shape[0]), cv2.CV_32F)
+            self._settle_window = cached
+        return small, cached
+
+    def wait_for_settle(self, since=None, timeout=None):
+        """
+        Hareket sonrası titreşimin sönmesini bekle (kamera karelerinden).
+        since (time.monotonic, ör. hareketin bittiği an) sonrasında yakalanan ardışık
+        kareler arası global kayma faz korelasyonuyla ölçülür; SETTLE_FRAMES kare
+        boyunca SETTLE_MAX_SHIFT altında kalınca döner. Kısa hareketler hemen oturur,
+        uzun hareketler gerektiği kadar bekler.
+        Returns: {'settled', 'elapsed', 'frames', 'shift', 'settled_after'} —
+        settled_after: sabit serinin başlamasından hemen önceki karenin zamanı
+        (find_target_text(newer_than_time=...) için; sonraki kareler oturmuş kabul edilir)
+        """
+        start = time.monotonic()
+        since = start if since is None else since
+        deadline = start + (config.SETTLE_TIMEOUT if timeout is None else timeout)
+
+        prev = None
+        prev_time = prev_before = since
+        settled_after = since
+        last_seq = -1
+        still = 0
+        frames = 0
+        shift = 0.0
+        while self.active and time.monotonic() < deadline:
+            gray, info = self.get_frame()
+            if gray is None or info['seq'] == last_seq or info['time'] <= since:
+                time.sleep(0.005)
+                continue
+            last_seq = info['seq']
+            frames += 1
+            small, window = self._settle_small(gray)
+            if prev is not None and prev.shape == small.shape:
+                (dx, dy), _ = cv2.phaseCorrelate(prev, small, window)
+                shift = float(np.hypot(dx, dy))
+                if shift < config.SETTLE_MAX_SHIFT:
+                    if still == 0:
+                        settled_after = prev_before
+                    still += 1
+                else:
+                    still = 0
+                if still >= config.SETTLE_FRAMES:
+                    return {'settled': True, 'elapsed': round(time.monotonic() - start, 3),
+                            'frames': frames, 'shift': round(shift, 3), 'settled_after': settled_after}
+            prev_before = prev_time
+            prev, prev_time = small, info['time']
+
+        return {'settled': False, 'elapsed': round(time.monotonic() - start, 3),
+                'frames': frames, 'shift': round(shift, 3), 'settled_after': prev_time}
+
+    def wait_for_frame(self, newer_than_time, timeout=2.0):
+        """
+        newer_than_time (time.monotonic) sonrasında yakalanmış, tam çözünürlüklü
+        (preview modu sabitlenmişse o moddaki) kareyi bekle.
+        Returns: (gray kopyası, frame_info) — süre dolarsa eldeki son kare; kare yoksa (None, None)
+        """
+        deadline = time.monotonic() + timeout
+        gray, info = self.get_frame()
+        while ((info['mode'] != 'full' and config.CAPTURE_MODE != 'preview')
+               or info['time'] <= newer_than_time) and time.monotonic() < deadline:
+            time.sleep(0.02)
+            gray, info = self.get_frame()
+        if gray is None:
+            return None, None
+        return gray.copy(), info
+
+    def vocabulary(self, focus_word=None):
+        """
+        OCR düzeltme indeksi. Sadece OCR_GROUPS / TARGET_GROUP / TARGET_WORDS (config.VOCAB_VERSION
+        artar) veya odaklı moddaki hedef kelime değiştiğinde yeniden oluşturulur.
+        """
+        if focus_word:
+            key = ('focus', focus_word)
+            words = [focus_word]
+        else:
+            key = ('vocab', config.VOCAB_VERSION)
+            words = None
+        if self._vocab_key != key:
+            self._vocab = OCRVocabulary(words if words is not None else vocabulary_words(),
+                                        cache_size=config.OCR_VOCAB_CACHE_SIZE)
+            self._vocab_key = key
+        return self._vocab
+
+    def enroll_templates(self, word=None, rect=None):
+        """
+        Şablon tanıyıcıya kelime kaydet (mevcut karenin threshold görüntüsünden).
+        word + rect (tam çözünürlük) verilirse o kesit, verilmezse şu an okunan
+        ve sözlükte bulunan tüm kelimeler kaydedilir.
+        Dönen: kaydedilen kelime listesi
+        """
+        thresh, info = self.get_thresh()
+        if thresh is None:
+            return []
+        if word and rect:
+            items = [(word, tuple(rect))]
+        else:
+            known = set(vocabulary_words())
+            with self.ocr_lock:
+                items = [(r['text'], r['rect']) for r in self.ocr_results if r['text'] in known]
+
+        img_h, img_w = thresh.shape[:2]
+        enrolled = []
+        for text, full_rect in items:
+            x, y, w, h = self.scale_rect(full_rect, 1.0 / info['scale'])
+            pad = 4
+            x1, y1 = max(0, x - pad), max(0, y - pad)
+            x2, y2 = min(img_w, x + w + pad), min(img_h, y + h + pad)
+            if x2 > x1 and y2 > y1 and self.template_recognizer.enroll(text, thresh[y1:y2, x1:x2].copy()):
+                enrolled.append(text)
+        return enrolled
+
+    def _publish_detections(self, detections, source=None, ocr_run=False):
+        """
+        Algılamaları kararlı kutulara işler ve ocr_results listesini yeniler.
+        source: algılamaların kaynak karesi {'seq', 'time'} — verilirse algılamalar bu
+        kareyle damgalanır ve find_target_text bekleyenleri uyandırılır. OCR yapılmayan
+        karelerde (bulanık / hareket / yeniden kullanım) None: kutular eski damgalarıyla kalır.
+        ocr_run: algılamalar bu karede yapılan gerçek OCR'dan geliyor — hedef takibi yalnızca
+        bu durumda yeniden çapalanır (yeniden kullanılan sonuç takibin güncel konumunu bozmaz).
+        Dönen: işlenen algılamalar (source verildiyse damgalı kopyalar)
+        """
+        with self.ocr_cond:
+            if source is not None:
+                run = self.ocr_source['run'] + 1
+                detections = [dict(d, frame_seq=source['seq'], frame_time=source['time'], ocr_run=run)
+                              for d in detections]
+            self.update_stable_boxes(detections)
+            self.ocr_results = []
+            for sb in self.stable_boxes.values():
+                x, y, w, h = sb['rect']
+                # Merkez noktası hesapla
+                cx = x + w // 2
+                cy = y + h // 2
+                self.ocr_results.append({
+                    'rect': (x, y, w, h),
+                    'text': sb['text'],
+                    'center': (cx, cy),
+                    'center_subpx': sb['center_subpx'] or (x + w / 2.0, y + h / 2.0),
+                    'conf': sb.get('conf', 0.0),
+                    'frame_seq': sb['frame_seq'],
+                    'frame_time': sb['frame_time'],
+                    'ocr_run': sb.get('ocr_run', 0),
+                })
+            if source is not None:
+                self.ocr_source = {'seq': source['seq'], 'time': source['time'], 'run': run}
+                self.ocr_cond.notify_all()
+            anchor = self._track_candidate() if ocr_run and source is not None else None
+        if anchor is not None:
+            self._set_track(self.tracker.anchor(anchor))
+        self.emit_overlay()
+        return detections
+
+    def _track_candidate(self):
+        """Takibin çapalanacağı OCR sonucu: odak kelimesiyle aynı, son takip konumuna en yakın kutu (ocr_cond altında)."""
+        word = self.focus_word
+        if not (config.TRACKER_ENABLED and word):
+            return None
+        matches = [item for item in self.ocr_results if item['text'] == word]
+        if not matches:
+            return None
+        ref = self.track['center'] if self.track else (config.CAMERA_WIDTH // 2, config.CAMERA_HEIGHT // 2)
+        return min(matches, key=lambda it: (it['center'][0] - ref[0]) ** 2 + (it['center'][1] - ref[1]) ** 2)
+
+    def _track_frame(self, gray, frame_scale, info):
+        """Kamera döngüsünden: kareyi takipçiye ver, takip varsa durumu yayınla."""
+        try:
+            state = self.tracker.push(gray, frame_scale, info['seq'], info['time'])
+        except Exception as e:
+            log.debug(f"Hedef takibi hatası: {e}")
+            state = None
+        if state is not None or self.track is not None:
+            self._set_track(state)
+
+    def _set_track(self, state):
+        with self.ocr_cond:
+            self.track = state
+            if state is not None:
+                self.ocr_cond.notify_all()
+
+    def overlay_payload(self):
+        """
+        İstemci tarafı overlay verisi: OCR kutuları (tam çözünürlük koordinatları),
+        auto-center durumu ve zoom. Tarayıcı bunları stream üzerine kendisi çizer.
+        """
+        with self.ocr_lock:
+            boxes = [{'rect': list(item['rect']), 'text': item['text'], 'center': list(item['center'])}
+                     for item in self.ocr_results]
+        gray, info = self.get_frame()
+        if gray is not None:
+            frame_h, frame_w = (int(v * info['scale']) for v in gray.shape[:2])
+        else:
+            frame_h, frame_w = config.CAMERA_HEIGHT, config.CAMERA_WIDTH
+        stream_w, stream_h = self.display_size
+        return {
+            'seq': self.frame_seq,
+            'frame_w': frame_w,
+            'frame_h': frame_h,
+            'stream_w': stream_w,
+            'stream_h': stream_h,
+            'boxes': boxes,
+            'auto_centering': self.auto_centering,
+            'zoom': config.ZOOM_FACTOR,
+        }
+
+    def emit_overlay(self, force=False):
+        """
+        Overlay verisini yayınla (sadece istemci tarafı modda).
+        İçerik değişmediyse en fazla saniyede bir gönderilir.
+        """
+        if not config.OVERLAY_CLIENT_SIDE or self.overlay_callback is None:
+            return
+        payload = self.overlay_payload()
+        key = (tuple((tuple(b['rect']), b['text']) for b in payload['boxes']),
+               payload['auto_centering'], payload['zoom'], payload['stream_w'])
+        now = time.time()
+        if not force and key == self._last_overlay_key and now - self._last_overlay_time < 1.0:
+            return
+        self._last_overlay_key = key
+        self._last_overlay_time = now
+        try:
+            self.overlay_callback(payload)
+        except Exception as e:
+            log.debug(f"Overlay yayın hatası: {e}")
+
+    @staticmethod
+    def pairwise_iou(rects_a, rects_b):
+        """
+        İki kutu kümesi arasındaki IoU matrisi (vektörize).
+        rects_a: (N, 4), rects_b: (M, 4) — (x, y, w, h). Dönen: (N, M)
+        """
+        a = np.asarray(rects_a, dtype=np.float64).reshape(-1, 4)
+        b = np.asarray(rects_b, dtype=np.float64).reshape(-1, 4)
+        ax1, ay1 = a[:, 0:1], a[:, 1:2]
+        ax2, ay2 = ax1 + a[:, 2:3], ay1 + a[:, 3:4]
+        bx1, by1 = b[:, 0], b[:, 1]
+        bx2, by2 = bx1 + b[:, 2], by1 + b[:, 3]
+
+        iw = np.clip(np.minimum(ax2, bx2) - np.maximum(ax1, bx1), 0, None)
+        ih = np.clip(np.minimum(ay2, by2) - np.maximum(ay1, by1), 0, None)
+        inter = iw * ih
+        union = a[:, 2:3] * a[:, 3:4] + b[:, 2] * b[:, 3] - inter
+        return np.divide(inter, union, out=np.zeros_like(inter), where=union > 0)
+
+    @staticmethod
+    def _assign_best_first(scores, valid, higher_is_better=True):
+        """
+        Skor matrisinden benzersiz eşleştirme: en iyi çift önce, her satır/sütun en fazla bir kez.
+        Eşit skorlarda önce satır, sonra sütun sırası (deterministik).
+        Dönen: [(satır, sütun), ...]
+        """
+        rows, cols = np.nonzero(valid)
+        if rows.size == 0:
+            return []
+        key = -scores[rows, cols] if higher_is_better else scores[rows, cols]
+        order = np.lexsort((cols, rows, key))
+
+        pairs = []
+        used_r, used_c = set(), set()
+        for r, c in zip(rows[order].tolist(), cols[order].tolist()):
+            if r in used_r or c in used_c:
+                continue
+            used_r.add(r)
+            used_c.add(c)
+            pairs.append((r, c))
+        return pairs
+
     def update_stable_boxes(self, new_detections):
         """
         Algılama kararlılığı: IoU ile eşleştir, kısa süreli kayıpları tolere et.
         OCR sonuçlarının titremesini (flickering) önler.
+        Eşleştirme kare başına tek IoU/mesafe matrisiyle yapılır; her kutu en fazla
+        bir algılamaya atanır (iki algılama aynı kutuyu sahiplenemez).
         """
         now = time.time()
-
-        for det in new_detections:
-            best_id = None
-            best_score = config.IOU_MATCH_THRESHOLD
-            for bid, sbox in self.stable_boxes.items():
-                score = self.iou(det['rect'], sbox['rect'])
-                if score > best_score:
-                    best_score = score
-                    best_id = bid
-
-            if best_id is None:
-                # ── Fallback Matching (Yedek Eşleştirme) ──
-                # IoU tutmadı ama belki kutu çok büyüdü/küçüldü veya hafif kaydı.
-                # Eğer aynı metin ve merkez noktası çok yakınsa, yine de eşleştir.
-                for bid, sbox in self.stable_boxes.items():
-                    # Aynı metin mi?
-                    if sbox['text'] == det['text']:
-                        # Merkezleri yakın mı? (Örn: 50px içinde)
-                        ocx = sbox['rect'][0] + sbox['rect'][2]/2
-                        ocy = sbox['rect'][1] + sbox['rect'][3]/2
-                        ncx = det['rect'][0] + det['rect'][2]/2
-                        ncy = det['rect'][1] + det['rect'][3]/2
-                        dist = ((ocx-ncx)**2 + (ocy-ncy)**2)**0.5
-                        
-                        if dist < 50:
-                            best_id = bid
-                            break
-
+        track_ids = list(self.stable_boxes.keys())
+        matches = {}  # algılama indeksi → kutu id
+
+        if new_detections and track_ids:
+            det_rects = np.array([d['rect'] for d in new_detections], dtype=np.float64)
+            trk_rects = np.array([self.stable_boxes[bid]['rect'] for bid in track_ids], dtype=np.float64)
+
+            # 1. IoU eşleştirme (en yüksek IoU önce)
+            iou_m = self.pairwise_iou(det_rects, trk_rects)
+            for r, c in self._assign_best_first(iou_m, iou_m > config.IOU_MATCH_THRESHOLD):
+                matches[r] = track_ids[c]
+
+            # ── 2. Fallback Matching (Yedek Eşleştirme) ──
+            # IoU tutmadı ama belki kutu çok büyüdü/küçüldü veya hafif kaydı.
+            # Aynı metin ve merkez noktası 50px içindeyse yine de eşleştir (en yakın önce).
+            det_texts = np.array([d['text'] for d in new_detections], dtype=object)
+            trk_texts = np.array([self.stable_boxes[bid]['text'] for bid in track_ids], dtype=object)
+            det_c = det_rects[:, :2] + det_rects[:, 2:] / 2
+            trk_c = trk_rects[:, :2] + trk_rects[:, 2:] / 2
+            dist = np.hypot(det_c[:, 0:1] - trk_c[:, 0], det_c[:, 1:2] - trk_c[:, 1])
+
+            valid = (det_texts[:, None] == trk_texts[None, :]) & (dist < 50)
+            if matches:
+                taken_tracks = {track_ids.index(bid) for bid in matches.values()}
+                valid[list(matches.keys()), :] = False
+                valid[:, list(taken_tracks)] = False
+            for r, c in self._assign_best_first(dist, valid, higher_is_better=False):
+                matches[r] = track_ids[c]
+
+        for i, det in enumerate(new_detections):
+            best_id = matches.get(i)
             if best_id is not None:
                 # Aniden 1.5x'ten fazla büyüyen kutuları reddet (sapıtma koruması)
                 old_rect = self.stable_boxes[best_id]['rect']
@@ -1566,167 +3724,537 @@ class CameraManager:
                 else:
                     self.stable_boxes[best_id]['rect'] = det['rect']
                     self.stable_boxes[best_id]['text'] = det['text']
+                    self.stable_boxes[best_id]['center_subpx'] = det.get('center_subpx')
+                    self.stable_boxes[best_id]['conf'] = det.get('conf', 0.0)
                     self.stable_boxes[best_id]['last_seen'] = now
+                    # Kaynak kare damgası sadece konum güncellenince ilerler
+                    self.stable_boxes[best_id]['frame_seq'] = det.get('frame_seq', 0)
+                    self.stable_boxes[best_id]['frame_time'] = det.get('frame_time', 0.0)
+                    self.stable_boxes[best_id]['ocr_run'] = det.get('ocr_run', 0)
             else:
                 self.box_id_counter += 1
                 self.stable_boxes[self.box_id_counter] = {
                     'rect': det['rect'],
                     'text': det['text'],
+                    'center_subpx': det.get('center_subpx'),
+                    'conf': det.get('conf', 0.0),
                     'last_seen': now,
+                    'frame_seq': det.get('frame_seq', 0),
+                    'frame_time': det.get('frame_time', 0.0),
+                    'ocr_run': det.get('ocr_run', 0),
                 }
 
         # Süresi dolmuş kutuları temizle
-        expired = [
-            bid for bid, sbox in self.stable_boxes.items()
-            if now - sbox['last_seen'] > config.STABILITY_DURATION
-        ]
-        for bid in expired:
-            del self.stable_boxes[bid]
+        if self.stable_boxes:
+            ids = list(self.stable_boxes.keys())
+            last_seen = np.fromiter((self.stable_boxes[bid]['last_seen'] for bid in ids),
+                                    dtype=np.float64, count=len(ids))
+            for k in np.nonzero(now - last_seen > config.STABILITY_DURATION)[0].tolist():
+                del self.stable_boxes[ids[k]]
+
+    def detect_text_regions(self, thresh):
+        """
+        Ucuz metin bölgesi ön-tespiti (Tesseract'tan önce çalışır).
+        Threshold görüntüsünde harfleri yatay morfoloji ile kelime/satır
+        bloklarına birleştirir, bağlı bileşenlerden aday etiket kutuları çıkarır.
+        Dönen: [(x, y, w, h), ...] — tam çözünürlük, padding uygulanmış
+        """
+        img_h, img_w = thresh.shape[:2]
+        ds = 2  # Yarım çözünürlükte çalış (4x daha az piksel)
+        small = cv2.resize(thresh, (img_w // ds, img_h // ds), interpolation=cv2.INTER_NEAREST)
+        ink = cv2.bitwise_not(small)  # Yazı pikselleri beyaz olsun
+
+        # Harfleri birleştir: yatayda geniş, dikeyde dar kapama
+        kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (9, 3))
+        merged = cv2.morphologyEx(ink, cv2.MORPH_CLOSE, kernel)
+
+        n, _, stats, _ = cv2.connectedComponentsWithStats(merged, connectivity=8)
+        if n <= 1:
+            return []
+
+        stats = stats[1:]  # 0 = arkaplan
+        xs = stats[:, cv2.CC_STAT_LEFT]
+        ys = stats[:, cv2.CC_STAT_TOP]
+        ws = stats[:, cv2.CC_STAT_WIDTH]
+        hs = stats[:, cv2.CC_STAT_HEIGHT]
+        areas = stats[:, cv2.CC_STAT_AREA]
+
+        small_h, small_w = merged.shape[:2]
+        aspect = ws / np.maximum(hs, 1)
+        fill = areas / np.maximum(ws * hs, 1)
+
+        # Vektörel filtre: boyut, en/boy oranı ve doluluk (etiket satırına benzemeyenler elenir)
+        keep = (
+            (hs >= 4) & (ws >= 6) &
+            (ws * hs <= small_w * small_h * 0.25) &
+            (aspect >= 0.8) & (aspect <= 20.0) &
+            (fill >= 0.15) & (fill <= 0.95)
+        )
+        idx = np.nonzero(keep)[0]
+        if idx.size == 0:
+            return []
+
+        # En büyük bölgeler öncelikli (gürültü lekeleri sona kalır)
+        idx = idx[np.argsort(-(ws[idx] * hs[idx]))][:config.OCR_REGION_MAX]
+
+        pad = config.OCR_REGION_PAD
+        regions = []
+        for i in idx:
+            x1 = max(0, int(xs[i]) * ds - pad)
+            y1 = max(0, int(ys[i]) * ds - pad)
+            x2 = min(img_w, int(xs[i] + ws[i]) * ds + pad)
+            y2 = min(img_h, int(ys[i] + hs[i]) * ds + pad)
+            regions.append((x1, y1, x2 - x1, y2 - y1))
+        return regions
+
+    @staticmethod
+    def merge_windows(windows):
+        """
+        Çakışan [x1, y1, x2, y2] pencerelerini birleştir (sonuçta hiçbir pencere çakışmaz).
+        x'e göre sıralı süpürme ile çakışan çiftler bulunur, birleşim-bul (union-find) ile
+        gruplanır; grupların sınırlayıcı kutuları yeniden çakışırsa (büyüme) tekrarlanır.
+        """
+        windows = [list(w) for w in windows]
+        while len(windows) > 1:
+            order = sorted(range(len(windows)), key=lambda k: windows[k][0])
+            parent = list(range(len(windows)))
+
+            def find(k):
+                while parent[k] != k:
+                    parent[k] = parent[parent[k]]
+                    k = parent[k]
+                return k
+
+            active = []
+            for k in order:
+                x1, y1, _, y2 = windows[k]
+                active = [a for a in active if windows[a][2] > x1]   # x'te hâlâ kesişebilenler
+                for a in active:
+                    if windows[a][1] < y2 and y1 < windows[a][3]:
+                        parent[find(a)] = find(k)
+                active.append(k)
+
+            groups = {}
+            for k, w in enumerate(windows):
+                g = groups.setdefault(find(k), list(w))
+                g[0], g[1] = min(g[0], w[0]), min(g[1], w[1])
+                g[2], g[3] = max(g[2], w[2]), max(g[3], w[3])
+            if len(groups) == len(windows):
+                break
+            windows = list(groups.values())
+        return windows
+
+    def tracking_regions(self, img_w, img_h):
+        """
+        Takip edilen kararlı kutuların çevresinde OCR pencereleri üret.
+        Kutular hareket payı kadar genişletilir, çakışan pencereler birleştirilir.
+        Dönen: [(x, y, w, h), ...]
+        """
+        margin = config.OCR_TRACK_MARGIN
+        with self.ocr_lock:
+            rects = [sb['rect'] for sb in self.stable_boxes.values()]
+
+        windows = []
+        for (x, y, w, h) in rects:
+            windows.append([max(0, x - margin), max(0, y - margin),
+                            min(img_w, x + w + margin), min(img_h, y + h + margin)])
+
+        # Çakışan pencereleri birleştir (aynı bölge iki kez okunmasın)
+        windows = self.merge_windows(windows)
+
+        return [(x1, y1, x2 - x1, y2 - y1) for x1, y1, x2, y2 in windows]
+
+    def set_focus_target(self, word):
+        """
+        Odaklı OCR modunu aç: whitelist hedef kelimenin harfleriyle sınırlanır,
+        arama alanı hedefin son görüldüğü yer + beklenen hareket payıdır.
+        """
+        self.tracker.reset()
+        with self.ocr_lock:
+            self.focus_rect = None
+            self.focus_word = word
+            self.track = None
+        log.info(f"Odaklı OCR modu: '{word}'")
+
+    def clear_focus_target(self):
+        """Odaklı modu kapat — normal tam kare OCR'a dön."""
+        with self.ocr_lock:
+            self.focus_word = None
+            self.focus_rect = None
+            self.track = None
+        self.tracker.reset()
+
+    def shift_focus_region(self, dx, dy):
+        """Hedef penceresini beklenen hareket kadar kaydır (motor hareketi sonrası, px)."""
+        with self.ocr_lock:
+            if self.focus_rect is not None:
+                x, y, w, h = self.focus_rect
+                self.focus_rect = (int(x + dx), int(y + dy), w, h)
+
+    def focus_regions(self, img_w, img_h):
+        """Odaklı mod penceresi. Hedef henüz görülmediyse boş liste (tam kare arama)."""
+        with self.ocr_lock:
+            rect = self.focus_rect
+        if rect is None:
+            return []
+
+        m = config.OCR_FOCUS_MARGIN
+        x, y, w, h = rect
+        x1 = max(0, x - m)
+        y1 = max(0, y - m)
+        x2 = min(img_w, x + w + m)
+        y2 = min(img_h, y + h + m)
+        if x2 <= x1 or y2 <= y1:
+            return []
+        return [(x1, y1, x2 - x1, y2 - y1)]
+
+    def _update_focus_rect(self, detections):
+        """Odaklı modda hedefin yeni konumunu kaydet (önceki konuma en yakın algılama)."""
+        with self.ocr_lock:
+            if not detections:
+                self.focus_rect = None  # Kayıp → sonraki tur tam kare arama
+                return
+            if self.focus_rect is not None:
+                px, py, pw, ph = self.focus_rect
+                ref_x, ref_y = px + pw / 2, py + ph / 2
+            else:
+                ref_x, ref_y = config.CAMERA_WIDTH / 2, config.CAMERA_HEIGHT / 2
+
+            def dist(det):
+                x, y, w, h = det['rect']
+                return (x + w / 2 - ref_x) ** 2 + (y + h / 2 - ref_y) ** 2
+
+            self.focus_rect = min(detections, key=dist)['rect']
+
+    def _recognize_regions(self, engine, image, regions, max_area=None, cache_tag=''):
+        """
+        Bölgeleri oku: önbellekte olan kesitler (dHash eşleşmesi) motora gitmez,
+        kalanlar tek çağrıda toplu tanınır ve önbelleğe yazılır.
+        Dönen: [((x, y, w, h), text, conf), ...] — kare koordinatlarında
+        """
+        words = []
+        misses = []
+        use_cache = config.OCR_CACHE_ENABLED
+        for r in regions:
+            rx, ry, rw, rh = r
+            if use_cache:
+                key = self.ocr_cache.key(image[ry:ry + rh, rx:rx + rw], (engine.name, cache_tag))
+                cached = self.ocr_cache.get(key)
+                if cached is not None:
+                    # Kayıtlar bölgeye göreli — kare koordinatına taşı
+                    words.extend(((rx + x, ry + y, w, h), text, conf) for (x, y, w, h), text, conf in cached)
+                    continue
+            else:
+                key = None
+            misses.append((r, key))
+
+        if misses:
+            miss_regions = [r for r, _ in misses]
+            per_region = [[] for _ in misses]
+            for rect, text, conf in engine.recognize(image, miss_regions, max_area=max_area):
+                words.append((rect, text, conf))
+                # Kelimeyi merkezini içeren bölgeye ata (önbellek kaydı bölgeye göreli)
+                cx, cy = rect[0] + rect[2] / 2, rect[1] + rect[3] / 2
+                for i, (rx, ry, rw, rh) in enumerate(miss_regions):
+                    if rx <= cx < rx + rw and ry <= cy < ry + rh:
+                        per_region[i].append(((rect[0] - rx, rect[1] - ry, rect[2], rect[3]), text, conf))
+                        break
+            if use_cache:
+                for (_, key), result in zip(misses, per_region):
+                    self.ocr_cache.put(key, result)
+        return words
 
     def ocr_worker(self):
         """
         OCR arka plan thread'i.
-        Threshold görüntüsü üzerinde tesserocr ile yazı algılama yapar.
+        Threshold görüntüsü üzerinde seçili OCR motoru (OCR_BACKEND) ile yazı algılama yapar.
         """
-        if not TESSEROCR_AVAILABLE:
-            log.warning("tesserocr bulunamadı — OCR devre dışı.")
-            return
-
-        # PSM ve whitelist'i config'den oku — değiştikçe API yeniden oluşturulur
+        # PSM ve whitelist'i config'den oku — değiştikçe motor yeniden yapılandırılır
+        current_backend = config.OCR_BACKEND
         current_psm = config.OCR_PSM_MODE
         current_whitelist = config.OCR_WHITELIST
 
-        def create_api(psm_mode, whitelist):
-            """Tesseract API oluştur."""
-            psm_map = {
-                3: tesserocr.PSM.AUTO,
-                6: tesserocr.PSM.SINGLE_BLOCK,
-                11: tesserocr.PSM.SPARSE_TEXT,
-            }
-            psm = psm_map.get(psm_mode, tesserocr.PSM.SINGLE_BLOCK)
-            _api = tesserocr.PyTessBaseAPI(
-                path='/usr/share/tesseract-ocr/5/tessdata/',
-                lang='eng',
-                psm=psm,
-                oem=tesserocr.OEM.LSTM_ONLY
-            )
-            _api.SetVariable("tessedit_do_invert", "0")
-            if whitelist:
-                _api.SetVariable("tessedit_char_whitelist", whitelist)
-            return _api
+        engine = create_ocr_engine(self)
+        if engine is None:
+            # Motor yok (ör. tesserocr kurulu değil, şablon henüz kaydedilmedi): periyodik yeniden denenir
+            log.warning("Kullanılabilir OCR motoru yok — motor bulunana kadar OCR beklemede.")
+            current_psm = None
+        else:
+            self.ocr_engine_name = engine.name
+            log.info(f"OCR worker başlatıldı (Motor={engine.name}, PSM={current_psm}, Whitelist='{current_whitelist}').")
+        next_engine_try = time.monotonic() + 2.0
 
-        try:
-            api = create_api(current_psm, current_whitelist)
-        except Exception as e:
-            log.error(f"Tesseract başlatılamadı: {e}")
-            return
+        active_whitelist = current_whitelist
+
+        # OCR kapısı durumu
+        last_frame_seq = -1
+        last_detections = []
+        last_focus_word = None   # Son OCR'ın yapıldığı odak kelimesi
+        last_move_seq = -1       # Son OCR'daki motor hareket sayacı
 
-        log.info(f"OCR worker başlatıldı (PSM={current_psm}, Whitelist='{current_whitelist}').")
+        # Takip modu durumu
+        frames_since_full = 0
+        scan_move_seq = -1       # Son tam taramadaki motor hareket sayacı
+        force_full = True
 
         while self.active:
-            # Config değişikliği kontrolü — PSM veya whitelist değiştiyse API'yi yeniden oluştur
+            if engine is None:
+                # Motor bekleniyor — birkaç saniyede bir yeniden denenir
+                if time.monotonic() < next_engine_try:
+                    time.sleep(0.1)
+                    continue
+                next_engine_try = time.monotonic() + 2.0
+                current_backend = config.OCR_BACKEND
+                engine = create_ocr_engine(self)
+                if engine is None:
+                    continue
+                self.ocr_engine_name = engine.name
+                log.info(f"OCR motoru hazır: {engine.name}")
+
+            # Motor değişikliği (OCR_BACKEND) — yeni motor oluşturulur
+            if config.OCR_BACKEND != current_backend:
+                current_backend = config.OCR_BACKEND
+                new_engine = create_ocr_engine(self)
+                if new_engine is not None:
+                    engine.close()
+                    engine = new_engine
+                    self.ocr_engine_name = engine.name
+                    current_psm = None  # PSM / whitelist yeni motora uygulanır
+                    log.info(f"OCR motoru değişti: {engine.name}")
+
+            # Config değişikliği kontrolü — PSM veya whitelist değiştiyse motoru yeniden yapılandır
             if config.OCR_PSM_MODE != current_psm or config.OCR_WHITELIST != current_whitelist:
                 current_psm = config.OCR_PSM_MODE
                 current_whitelist = config.OCR_WHITELIST
                 try:
-                    api.End()
-                    api = create_api(current_psm, current_whitelist)
-                    log.info(f"OCR API yeniden oluşturuldu (PSM={current_psm}, Whitelist='{current_whitelist}')")
+                    engine.configure(current_psm, current_whitelist)
+                    active_whitelist = current_whitelist
+                    log.info(f"OCR motoru yeniden yapılandırıldı (PSM={current_psm}, Whitelist='{current_whitelist}')")
                 except Exception as e:
-                    log.error(f"OCR API yeniden oluşturma hatası: {e}")
-
-            if self.current_thresh is not None:
-                t_start = time.time()
-
-                with self.frame_lock:
-                    frame_ocr = self.current_thresh.copy()
-
-                img_h, img_w = frame_ocr.shape[:2]
+                    log.error(f"OCR motoru yeniden yapılandırma hatası: {e}")
 
+            # Odaklı mod: whitelist sadece hedef kelimenin harfleri
+            focus_word = self.focus_word
+            wanted_whitelist = focus_whitelist(focus_word) if focus_word else current_whitelist
+            if wanted_whitelist != active_whitelist:
                 try:
-                    pil_image = Image.fromarray(frame_ocr)
-                    api.SetImage(pil_image)
-
-                    # WORD seviyesinde algılama
-                    boxes = api.GetComponentImages(tesserocr.RIL.WORD, True)
-
-                    new_detections = []
-                    for i, (im, box, _, _) in enumerate(boxes):
-                        x = box['x']
-                        y = box['y']
-                        w_box = box['w']
-                        h_box = box['h']
-
-                        # Sınır kontrolü
-                        if x < 0 or y < 0 or x + w_box > img_w or y + h_box > img_h:
-                            continue
-                        if w_box <= 0 or h_box <= 0:
-                            continue
-                        # Minimum boyut filtresi (çok küçük gürültü)
-                        if w_box < 5 or h_box < 5:
-                            continue
-                        # Maksimum boyut filtresi (frame alanının %25'inden büyükse sapıtma)
-                        box_area = w_box * h_box
-                        frame_area = img_w * img_h
-                        if box_area > frame_area * 0.25:
-                            continue
-
-                        api.SetRectangle(x, y, w_box, h_box)
-                        text = api.GetUTF8Text().strip()
-                        conf = api.MeanTextConf()
-
-                        if conf > config.OCR_CONFIDENCE_THRESHOLD and text and len(text) >= config.OCR_MIN_WORD_LENGTH:
-                            # ── Fuzzy Matching (Bulanık Eşleşme) ──
-                            # Algılanan metni, tanımlı gruplardaki kelimelerle karşılaştır
-                            # Eğer benzerlik %80 üzerindeyse, doğrusuyla değiştir
-                            best_match = None
-                            highest_ratio = 0.0
-                            
-                            # Tüm gruplardaki kelimeleri kontrol et
-                            all_known_words = []
-                            for words in config.OCR_GROUPS.values():
-                                all_known_words.extend(words)
-                                
-                            matches = difflib.get_close_matches(text, all_known_words, n=1, cutoff=0.7)
-                            if matches:
-                                # Eğer eşleşme varsa, metni düzelt
-                                corrected_text = matches[0]
-                                if corrected_text != text:
-                                    log.debug(f"OCR Düzeltme: '{text}' -> '{corrected_text}'")
-                                    text = corrected_text
-
-                            new_detections.append({
-                                'rect': (x, y, w_box, h_box),
-                                'text': text
-                            })
-
-                    # Kararlı kutuları güncelle
-                    with self.ocr_lock:
-                        self.update_stable_boxes(new_detections)
-                        self.ocr_results = []
-                        for sb in self.stable_boxes.values():
-                            x, y, w, h = sb['rect']
-                            # Merkez noktası hesapla
-                            cx = x + w // 2
-                            cy = y + h // 2
-                            self.ocr_results.append({
-                                'rect': (x, y, w, h),
-                                'text': sb['text'],
-                                'center': (cx, cy)
-                            })
-
+                    engine.set_whitelist(wanted_whitelist)
+                    active_whitelist = wanted_whitelist
                 except Exception as e:
-                    log.error(f"OCR hatası: {e}")
-
-                elapsed = time.time() - t_start
-                if elapsed > 0:
-                    self.ocr_fps = 1.0 / elapsed
+                    log.error(f"OCR whitelist değiştirme hatası: {e}")
 
-            time.sleep(0.001)
+            with self.frame_lock:
+                frame_seq = self.frame_seq
+                frame_info = self.frame_info
+                gate = self.current_gate
+                gate_small = self._gate_small
+
+            # Sadece yeni karelerde çalış; OCR kapısı kararına göre atla/yeniden kullan
+            ocr_ran = False
+            if self.current_gray is not None and frame_seq != last_frame_seq:
+                decision = gate['decision'] if gate else 'ocr'
+                if decision == 'reuse' and (focus_word != last_focus_word or pnp.move_seq != last_move_seq
+                                            or self._fresh_waiters):
+                    # Odak değişti (önceki sonuçta odak süzgecinden geçmemiş kelimeler olabilir),
+                    # motor hareket etti (küçük hareket farkı eşiğin altında kalabilir) veya taze
+                    # sonuç bekleyen var: eski sonuç bu kareye ait sayılamaz
+                    decision = 'ocr'
+                self.ocr_gate['counts'][decision] += 1
+                if gate:
+                    self.ocr_gate.update(decision=decision, diff=gate['diff'], sharpness=gate['sharpness'])
+
+                if decision in ('blur', 'motion'):
+                    # Hareket bulanıklığı / hareket: OCR atlanır, eski kutular süresi dolunca düşer
+                    last_frame_seq = frame_seq
+                    self._publish_detections([])
+                elif decision == 'reuse':
+                    # Sahne değişmedi: son OCR sonucu yeniden kullanılır (kutular canlı kalır).
+                    # Damgalar OCR yapılan karede kalır — yeniden kullanım tazelik sayılmaz
+                    last_frame_seq = frame_seq
+                    self._publish_detections(last_detections)
+                else:
+                    t_start = time.time()
+                    move_seq = pnp.move_seq
+                    ocr_ran = True
+
+                    # Threshold sadece burada (OCR yapılacak karelerde) hesaplanır
+                    frame_ocr, frame_info = self.get_thresh()
+                    last_frame_seq = frame_info['seq']
+                    frame_scale = frame_info['scale']  # Kare → tam çözünürlük
+                    if frame_info['seq'] != frame_seq:
+                        # Bu arada yeni kare geldi: referans OCR yapılan karenin küçük kopyası olmalı
+                        with self.frame_lock:
+                            gate_small = self._gate_small if self.frame_info['seq'] == frame_info['seq'] else None
+                    # Sonraki fark ölçümü bu kareye göre (kopya bulunamazsa sonraki kare yeniden okunur)
+                    self._gate_ref_small = gate_small
+
+                    img_h, img_w = frame_ocr.shape[:2]
+                    frame_area = img_w * img_h
+                    full_w, full_h = int(img_w * frame_scale), int(img_h * frame_scale)
 
-        api.End()
+                    try:
+                        # ── 1. Tespit aşaması: aday metin bölgeleri (ucuz OpenCV) ──
+                        t_detect = time.time()
+
+                        n_tracked = 0
+                        if focus_word:
+                            # Odaklı mod: hedefin son görüldüğü yer + beklenen hareket payı
+                            scan_mode = 'focus'
+                            regions = self.focus_regions(full_w, full_h)
+                        else:
+                            # Takip modu: kilitlenmiş kutular varsa sadece çevrelerini oku.
+                            # Her N karede, takip kaybında veya motor hareketinde tam tarama.
+                            tracking = (config.OCR_TRACKING_ENABLED and not force_full
+                                        and frames_since_full < config.OCR_FULL_SCAN_INTERVAL
+                                        and pnp.move_seq == scan_move_seq)
+                            n_tracked = len(self.stable_boxes) if tracking else 0
+                            regions = self.tracking_regions(full_w, full_h) if tracking else []
+                            scan_mode = 'track' if regions else 'full'
+
+                        if regions:
+                            # Kutular tam çözünürlükte — kare çözünürlüğüne indir
+                            regions = [self.scale_rect(r, 1.0 / frame_scale) for r in regions]
+                            if scan_mode == 'track':
+                                frames_since_full += 1
+                        else:
+                            if scan_mode == 'full':
+                                frames_since_full = 0
+                                scan_move_seq = pnp.move_seq
+                            # None → bölge tespiti kapalı, tam kare okunur
+                            regions = self.detect_text_regions(frame_ocr) if config.OCR_REGION_DETECT else None
+                        detect_ms = (time.time() - t_detect) * 1000.0
+
+                        # ── 2. Tanıma aşaması: OCR motoru (sadece kesitler, önbellekte olmayanlar) ──
+                        t_recog = time.time()
+                        vocab = self.vocabulary(focus_word)
+                        if regions is None and engine.needs_regions:
+                            # Tam kare okuyamayan motorlar her zaman aday bölgelerle çalışır
+                            regions = self.detect_text_regions(frame_ocr)
+                        # Maksimum boyut filtresi (frame alanının %25'inden büyükse sapıtma)
+                        if regions is None:
+                            word_boxes = engine.recognize(frame_ocr, None, max_area=frame_area * 0.25)
+                        else:
+                            word_boxes = self._recognize_regions(engine, frame_ocr, regions,
+                                                                 max_area=frame_area * 0.25,
+                                                                 cache_tag=(current_psm, active_whitelist))
+
+                        new_detections = []
+                        for rect, text, conf in word_boxes:
+                            x, y, w_box, h_box = rect
+
+                            if conf > config.OCR_CONFIDENCE_THRESHOLD and text and len(text) >= config.OCR_MIN_WORD_LENGTH:
+                                # ── Fuzzy Matching (Bulanık Eşleşme) ──
+                                # Algılanan metni sözlükteki kelimelerle karşılaştır (önceden
+                                # oluşturulmuş indeks, odaklı modda sadece hedef kelime)
+                                # Eğer benzerlik %70 üzerindeyse, doğrusuyla değiştir
+                                corrected_text = vocab.correct(text)
+                                if corrected_text:
+                                    # Eğer eşleşme varsa, metni düzelt
+                                    if corrected_text != text:
+                                        log.debug(f"OCR Düzeltme: '{text}' -> '{corrected_text}'")
+                                        text = corrected_text
+
+                                # Odaklı modda hedef dışındaki kelimeler yayınlanmaz (tam eşleşme:
+                                # "R1" odağında "R10" / "R12" yayınlanmaz)
+                                if focus_word and text != focus_word:
+                                    continue
+
+                                new_detections.append({
+                                    'rect': self.scale_rect((x, y, w_box, h_box), frame_scale),
+                                    'text': text,
+                                    'center_subpx': self.subpixel_center(frame_ocr, (x, y, w_box, h_box), frame_scale),
+                                    'conf': float(conf),
+                                })
+                        recognize_ms = (time.time() - t_recog) * 1000.0
+
+                        # Takip edilen kutulardan biri bile bulunamadıysa sonraki kare tam tarama
+                        force_full = scan_mode == 'track' and len(new_detections) < n_tracked
+                        if scan_mode == 'focus':
+                            self._update_focus_rect(new_detections)
+
+                        self.ocr_timing = {
+                            'detect_ms': round(detect_ms, 1),
+                            'recognize_ms': round(recognize_ms, 1),
+                            'regions': len(regions) if regions is not None else 0,
+                            'mode': scan_mode,
+                        }
+
+                        # Kararlı kutuları güncelle (kaynak kare damgasıyla)
+                        last_detections = self._publish_detections(new_detections, source=frame_info, ocr_run=True)
+                        last_focus_word = focus_word
+                        last_move_seq = move_seq
+
+                    except Exception as e:
+                        log.error(f"OCR hatası: {e}")
+
+                    elapsed = time.time() - t_start
+                    if elapsed > 0:
+                        self.ocr_fps = 1.0 / elapsed
+
+            # Odaklı modda OCR yapılan karenin ardından bekleme yok — sonuçlar olabilecek en yüksek
+            # hızda yayınlanır. Kapıdan geçmeyen (bulanık / hareket / yeniden kullanım) karelerde
+            # beklenir, art arda reddedilen karelerde thread boşa dönmez
+            if not focus_word or not ocr_ran:
+                time.sleep(0.001)
+
+        if engine is not None:
+            engine.close()
         log.info("OCR worker durduruldu.")
 
+    def get_hud_layer(self, img_h, img_w):
+        """
+        Statik HUD katmanı (kılavuz çizgileri, nişangah daireleri, cetvel çentikleri).
+        Stream çözünürlüğü başına bir kez çizilir; boyut değişince yeniden oluşturulur.
+        Returns: (ys, xs, piksel değerleri) — display[ys, xs] = değerler ile bindirilir
+        """
+        cached = self._hud_cache
+        if cached is not None and cached[0] == (img_h, img_w):
+            return cached[1]
+
+        layer = np.zeros((img_h, img_w, 3), dtype=np.uint8)
+
+        # Her zaman frame boyutundan dinamik hesapla
+        tx = img_w // 2
+        ty = img_h // 2
+
+        # Renkler: Cyan (Turkuaz)
+        color_main = (255, 255, 0)  # BGR
+        color_sub = (100, 100, 0)   # Daha sönük
+        gap = 25 # Merkez boşluğu
+
+        # 1. Tam Ekran Kılavuz Çizgileri (Boşluklu)
+        # Yatay Sol
+        cv2.line(layer, (0, ty), (tx - gap, ty), color_main, 1)
+        # Yatay Sağ
+        cv2.line(layer, (tx + gap, ty), (img_w, ty), color_main, 1)
+        # Dikey Üst
+        cv2.line(layer, (tx, 0), (tx, ty - gap), color_main, 1)
+        # Dikey Alt
+        cv2.line(layer, (tx, ty + gap), (tx, img_h), color_main, 1)
+
+        # 2. Eşmerkezli Daireler (Nişangah)
+        for rad in [50, 100, 150, 200]:
+            cv2.circle(layer, (tx, ty), rad, color_sub, 1)
+
+        # 3. Cetvel Çentikleri (Ticks) - Her 50px
+        # Yatay Eksen Çentikleri
+        for i in range(0, img_w, 50):
+            if abs(i - tx) < gap: continue
+            cv2.line(layer, (i, ty - 5), (i, ty + 5), color_sub, 1)
+        # Dikey Eksen Çentikleri
+        for i in range(0, img_h, 50):
+            if abs(i - ty) < gap: continue
+            cv2.line(layer, (tx - 5, i), (tx + 5, i), color_sub, 1)
+
+        # 4. Merkez Nokta (Küçük kırmızı nokta, en ortada)
+        cv2.circle(layer, (tx, ty), 2, (0, 0, 255), -1)
+
+        # Maske: çizilen pikseller (tüm HUD renkleri sıfırdan farklı)
+        ys, xs = np.nonzero(layer.any(axis=2))
+        hud = (ys, xs, layer[ys, xs])
+        self._hud_cache = ((img_h, img_w), hud)
+        return hud
+
     def camera_worker(self):
         """
         Kamera arka plan thread'i.
@@ -1739,34 +4267,83 @@ class CameraManager:
         log.info("Kamera worker başlatıldı.")
 
         while self.active:
-            gray, thresh, display_full = self.capture_frame()
+            # Bekleyen çözünürlük / mod değişiklikleri (HTTP isteklerini bloklamadan burada)
+            self._apply_capture_mode()
+
+            gray, lores = self.capture_frame()
 
-            if display_full is None:
+            if gray is None:
                 time.sleep(0.01)
                 continue
 
-            # OCR thread'ine threshold ver (TAM ÇÖZÜNÜRLÜK)
+            # Kare etiketi: yakalandığı mod, tam çözünürlüğe ölçek ve yakalanma zamanı
+            frame_mode = self.capture_mode
+            frame_scale = self.capture_modes['full'][0] / self.capture_modes[frame_mode][0]
+            frame_time = self.backend.frame_time
+
+            # OCR kapısı: bulanık / değişmemiş kareler için OCR atlanacak
+            if frame_mode == 'preview' and config.CAPTURE_MODE == 'auto':
+                # Makine hareket ediyor: OCR yapılmaz (kutular süresi dolunca düşer)
+                gate, gate_small = {'decision': 'motion', 'diff': 0.0, 'sharpness': 0.0}, None
+            else:
+                gate, gate_small = self.evaluate_ocr_gate(gray)
+
+            # OCR thread'ine gri kareyi ver — threshold tembel hesaplanır
             with self.frame_lock:
-                self.current_thresh = thresh.copy()
                 self.current_gray = gray
+                self.current_gate = gate
+                self._gate_small = gate_small
+                self.frame_seq += 1
+                self.frame_info = {'seq': self.frame_seq, 'mode': frame_mode, 'scale': frame_scale,
+                                   'time': frame_time}
+
+            # Auto-center hedef takibi: OCR sonuçları arasında hedef bu karede izlenir
+            if config.TRACKER_ENABLED and self.focus_word:
+                self._track_frame(gray, frame_scale, self.frame_info)
 
             # ─── Display Frame Optimizasyonu (Resize) ─────────────
-            h_full, w_full = display_full.shape[:2]
+            # Kamera lores stream'i hazır boyutta veriyorsa resize yok;
+            # değilse küçültme tek kanalda yapılır (3 kanala göre 1/3 bellek trafiği)
+            h_full, w_full = gray.shape[:2]
             target_w = config.STREAM_MAX_WIDTH
             
-            if w_full > target_w:
+            if lores is not None and lores.shape[1] == (target_w & ~1):
+                display_gray = lores
+                scale = lores.shape[1] / w_full
+            elif w_full > target_w:
                 scale = target_w / w_full
                 new_h = int(h_full * scale)
-                display = cv2.resize(display_full, (target_w, new_h), interpolation=cv2.INTER_AREA)
+                display_gray = cv2.resize(gray, (target_w, new_h), interpolation=cv2.INTER_AREA)
             else:
                 scale = 1.0
-                display = display_full
+                display_gray = gray
 
-            img_h, img_w = display.shape[:2]
+            img_h, img_w = display_gray.shape[:2]
+            # OCR kutuları tam çözünürlük koordinatında — preview karelerde ölçek buna göre
+            scale /= frame_scale
 
-            # Temiz frame'i kaydet (doğrulama tabı için — annotasyonsuz)
+            frame_count += 1
+            elapsed = time.time() - fps_start
+            if elapsed >= 1.0:
+                self.display_fps = frame_count / elapsed
+                frame_count = 0
+                fps_start = time.time()
+
+            # İstemci tarafı overlay: annotasyon yok, tek temiz frame yayınlanır
+            if config.OVERLAY_CLIENT_SIDE:
+                with self.frame_lock:
+                    self.raw_display_frame = display_gray
+                    self.display_size = (img_w, img_h)
+                    self.display_seq += 1
+                time.sleep(0.001)
+                continue
+
+            # Temiz frame'i kaydet (doğrulama tabı için — annotasyonsuz, gri JPEG)
             with self.frame_lock:
-                self.raw_display_frame = display.copy()
+                self.raw_display_frame = display_gray
+
+            # Renkli annotasyonlar için BGR'ye sadece stream çözünürlüğünde çevir
+            display = cv2.cvtColor(display_gray, cv2.COLOR_GRAY2BGR)
 
             # ─── Annotasyonlar (kutu, çapraz çizgi, merkez) ─────────────
             with self.ocr_lock:
@@ -1808,49 +4385,11 @@ class CameraManager:
                             cv2.FONT_HERSHEY_SIMPLEX, font_scale, (0, 0, 255), thickness)
 
             # ─── Hedef nokta crosshair (Grid / Profesyonel Görünüm) ──────────
-            # Her zaman frame boyutundan dinamik hesapla
-            tx = img_w // 2
-            ty = img_h // 2
-            
-            # Renkler: Cyan (Turkuaz)
-            color_main = (255, 255, 0)  # BGR
-            color_sub = (100, 100, 0)   # Daha sönük
-            gap = 25 # Merkez boşluğu
-            
-            # 1. Tam Ekran Kılavuz Çizgileri (Boşluklu)
-            # Yatay Sol
-            cv2.line(display, (0, ty), (tx - gap, ty), color_main, 1)
-            # Yatay Sağ
-            cv2.line(display, (tx + gap, ty), (img_w, ty), color_main, 1)
-            # Dikey Üst
-            cv2.line(display, (tx, 0), (tx, ty - gap), color_main, 1)
-            # Dikey Alt
-            cv2.line(display, (tx, ty + gap), (tx, img_h), color_main, 1)
-
-            # 2. Eşmerkezli Daireler (Nişangah)
-            for rad in [50, 100, 150, 200]:
-                cv2.circle(display, (tx, ty), rad, color_sub, 1)
-
-            # 3. Cetvel Çentikleri (Ticks) - Her 50px
-            # Yatay Eksen Çentikleri
-            for i in range(0, img_w, 50):
-                if abs(i - tx) < gap: continue
-                cv2.line(display, (i, ty - 5), (i, ty + 5), color_sub, 1)
-            # Dikey Eksen Çentikleri
-            for i in range(0, img_h, 50):
-                if abs(i - ty) < gap: continue
-                cv2.line(display, (tx - 5, i), (tx + 5, i), color_sub, 1)
-            
-            # 4. Merkez Nokta (Küçük kırmızı nokta, en ortada)
-            cv2.circle(display, (tx, ty), 2, (0, 0, 255), -1)
+            # Statik katman çözünürlük başına bir kez çizilir, burada sadece kopyalanır
+            hud_ys, hud_xs, hud_px = self.get_hud_layer(img_h, img_w)
+            display[hud_ys, hud_xs] = hud_px
 
             # ─── FPS bilgisi (Artık Client-side overlay'e taşındı, buraya yazmıyoruz) ────
-            frame_count += 1
-            elapsed = time.time() - fps_start
-            if elapsed >= 1.0:
-                self.display_fps = frame_count / elapsed
-                frame_count = 0
-                fps_start = time.time()
 
             # Auto-center durumu
             if self.auto_centering:
@@ -1916,45 +4455,101 @@ class CameraManager:
             # Annotasyonlu frame'i kaydet (stream için)
             with self.frame_lock:
                 self.annotated_frame = display.copy()
+                self.display_size = (img_w, img_h)
+                self.display_seq += 1
 
             time.sleep(0.001)
 
         log.info("Kamera worker durduruldu.")
 
+    def get_encoded_frame(self, kind='annotated'):
+        """
+        Display frame'in JPEG hali — her yeni frame için en fazla bir kez encode edilir,
+        aynı anda bağlı tüm istemciler aynı byte'ları paylaşır.
+        İstemci tarafı overlay modunda 'annotated' istekleri de temiz frame'e düşer.
+        Returns: (display_seq, jpeg bytes) veya None
+        """
+        if kind == 'annotated' and config.OVERLAY_CLIENT_SIDE:
+            kind = 'raw'
+        with self.frame_lock:
+            seq = self.display_seq
+            cached = self._jpeg_cache.get(kind)
+            if cached is not None and cached[0] == seq:
+                return cached
+            frame = self.annotated_frame if kind == 'annotated' else self.raw_display_frame
+        if frame is None:
+            return None
+
+        # Encode kilit dışında — kamera döngüsü beklemez (saklanan frame'ler değiştirilmez)
+        _, jpeg = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 80])
+        entry = (seq, jpeg.tobytes())
+        with self.frame_lock:
+            self._jpeg_cache[kind] = entry
+        return entry
+
     def get_mjpeg_frame(self):
         """Annotasyonlu frame'i JPEG olarak döndür (MJPEG stream için)."""
-        with self.frame_lock:
-            if self.annotated_frame is None:
-                return None
-            _, jpeg = cv2.imencode('.jpg', self.annotated_frame, [
-                cv2.IMWRITE_JPEG_QUALITY, 80
-            ])
-            return jpeg.tobytes()
+        entry = self.get_encoded_frame('annotated')
+        return entry[1] if entry else None
 
     def get_raw_mjpeg_frame(self):
         """Temiz (annotasyonsuz) frame'i JPEG olarak döndür."""
-        with self.frame_lock:
-            if self.raw_display_frame is None:
-                return None
-            _, jpeg = cv2.imencode('.jpg', self.raw_display_frame, [
-                cv2.IMWRITE_JPEG_QUALITY, 80
-            ])
-            return jpeg.tobytes()
+        entry = self.get_encoded_frame('raw')
+        return entry[1] if entry else None
 
-    def find_target_text(self, specific_word=None):
+    def find_target_text(self, specific_word=None, newer_than_time=None, newer_than_seq=None, timeout=0.0,
+                         use_track=True):
         """
         Hedef yazıları OCR sonuçlarından bul.
         Birden fazla eşleşme varsa ekran merkezine en yakın olanı döndürür.
+
+        Tazelik koşulu: newer_than_time (time.monotonic, ör. hareketin bittiği an) ve/veya
+        newer_than_seq (kare sırası) verilirse sadece bu koşulu sağlayan karelerden gelen
+        sonuçlar kabul edilir; böyle bir kare tanınana kadar en fazla timeout saniye
+        beklenir. Kare tanındıktan sonra hedef yoksa None döner (zaman aşımı beklenmez).
+        Dönen sonuçta frame_seq / frame_time kaynak kareyi gösterir.
+
+        use_track: odaklı modda hedef optik akışla izleniyorsa, koşulu sağlayan takip
+        karesi de kabul edilir ve OCR sonucundan yeniyse takip konumu döner
+        (tracked=True, age: son OCR çapasından bu yana geçen süre, s).
         """
         target_exact = specific_word.strip() if specific_word else config.SELECTED_TARGET_WORD.strip()
         # Ekran merkezi (180 derece olduğu için en/boy değişmez)
         center_x = config.CAMERA_WIDTH // 2
         center_y = config.CAMERA_HEIGHT // 2
 
+        def is_fresh(src):
+            if newer_than_time is not None and src['time'] <= newer_than_time:
+                return False
+            if newer_than_seq is not None and src['seq'] <= newer_than_seq:
+                return False
+            return True
+
+        def usable_track():
+            track = self.track
+            if not use_track or track is None or not is_fresh({'seq': track['frame_seq'], 'time': track['frame_time']}):
+                return None
+            if target_exact and target_exact not in track['text']:
+                return None
+            if track['frame_time'] - track['anchor_time'] > config.TRACK_MAX_AGE:
+                return None
+            return track
+
         candidates = []
 
-        with self.ocr_lock:
+        with self.ocr_cond:
+            # Koşulu sağlayan kare tanınana (veya izlenene) kadar bekle
+            deadline = time.monotonic() + timeout
+            while not is_fresh(self.ocr_source) and usable_track() is None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self.active:
+                    return None
+                self._wait_fresh(remaining)
+            track = usable_track()
+
             for item in self.ocr_results:
+                if not is_fresh({'seq': item['frame_seq'], 'time': item['frame_time']}):
+                    continue
                 txt = item['text']
                 txt_lower = txt.lower()
                 matched = False
@@ -1978,28 +4573,360 @@ class CameraManager:
                     dist = ((cx - center_x) ** 2 + (cy - center_y) ** 2) ** 0.5
                     candidates.append((dist, item))
 
-        if not candidates:
-            return None
+        best = None
+        if candidates:
+            # Merkeze en yakın olanı seç
+            candidates.sort(key=lambda x: x[0])
+            best = dict(candidates[0][1], tracked=False, age=0.0)
+
+        # Takip konumu OCR sonucundan daha yeni bir kareye aitse onu döndür
+        if track is not None and (best is None or track['frame_seq'] > best['frame_seq']):
+            return dict(track, tracked=True, age=round(track['frame_time'] - track['anchor_time'], 3))
+        return best
+
+    def _wait_fresh(self, timeout):
+        """ocr_cond altında bekle; bekleyen varken OCR kapısı sonucu yeniden kullanmaz."""
+        self._fresh_waiters += 1
+        try:
+            self.ocr_cond.wait(timeout)
+        finally:
+            self._fresh_waiters -= 1
 
-        # Merkeze en yakın olanı seç
-        candidates.sort(key=lambda x: x[0])
-        return candidates[0][1]
+    def wait_for_results(self, newer_than_time, timeout=None):
+        """
+        newer_than_time (time.monotonic) sonrasında yakalanan bir kare tanınana kadar bekle.
+        Returns: o kareye ait (taze) OCR sonuçlarının kopyası — süre dolarsa None
+        """
+        timeout = config.AUTO_CENTER_RESULT_TIMEOUT if timeout is None else timeout
+        with self.ocr_cond:
+            deadline = time.monotonic() + timeout
+            while self.ocr_source['time'] <= newer_than_time:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self.active:
+                    return None
+                self._wait_fresh(remaining)
+            return [dict(item) for item in self.ocr_results if item['frame_time'] > newer_than_time]
+
+    def refine_target(self, specific_word, since, samples=None):
+        """
+        Hedefin alt-piksel merkezini since sonrasındaki ayrı OCR çalışmalarından ortala
+        (her ocr_run bir örnek — aynı sonucun yeniden yayınlanması örnek sayılmaz).
+        Dönen: son sonuç (center_subpx ortalama ile değiştirilmiş, subpx_samples örnek sayısı,
+        subpx_spread: örneklerin ortalamadan en büyük sapması, px) veya hedef bulunamazsa None
+        """
+        samples = samples or config.SUBPX_SAMPLES
+        # Sadece OCR sonuçları: takip konumları çapanın hatasını taşır, bağımsız örnek değildir
+        target = self.find_target_text(specific_word, newer_than_time=since,
+                                       timeout=config.AUTO_CENTER_RESULT_TIMEOUT, use_track=False)
+        if target is None:
+            return None
+        points = {target['ocr_run']: target['center_subpx']}
+        while len(points) < samples:
+            nxt = self.find_target_text(specific_word, newer_than_seq=target['frame_seq'],
+                                        timeout=config.AUTO_CENTER_RESULT_TIMEOUT, use_track=False)
+            if nxt is None:
+                break
+            target = nxt
+            points[target['ocr_run']] = target['center_subpx']
+        pts = np.array(list(points.values()), dtype=np.float64)
+        mean = pts.mean(axis=0)
+        spread = float(np.hypot(*(pts - mean).T).max())
+        return dict(target, center_subpx=(round(float(mean[0]), 2), round(float(mean[1]), 2)),
+                    subpx_samples=len(points), subpx_spread=round(spread, 2))
 
     def stop(self):
         """Kamerayı ve thread'leri durdur."""
         self.active = False
-        if self.picam2:
+        if self.backend:
             try:
-                self.picam2.stop()
+                self.backend.stop()
             except Exception:
                 pass
         log.info("Kamera durduruldu.")
 
 
+# ═════════════════════════════════════════════════════════════════════════════
+#  KART HARİTASI (Etiket → makine XY indeksi)
+# ═════════════════════════════════════════════════════════════════════════════
+
+def motor_to_machine(dx, dy):
+    """move_relative'e verilen hareketin makine koordinatındaki karşılığı (INVERT_X/Y uygulanır)."""
+    return (-dx if config.INVERT_X else dx), (-dy if config.INVERT_Y else dy)
+
+
+class BoardMap:
+    """
+    Tek kart tipinin etiket → makine XY indeksi.
+    Konum: etiketin görüntü merkezine geldiği makine XY'si. Kayıtlar BOARD_MAP_MERGE_MM
+    boyutlu ızgara hücrelerine kovalanır; aynı metnin birleştirme mesafesindeki
+    gözlemleri tek kayıtta (OCR güveni ağırlıklı ortalama) toplanır.
+    confidence: ortalama OCR güveni (0..1) × görüldüğü kare / görüş alanında olduğu kare.
+    """
+
+    def __init__(self, board_type, area=None, labels=None, updated=None):
+        self.board_type = board_type
+        self.area = area or {}
+        self.updated = updated
+        self.cell = max(0.1, config.BOARD_MAP_MERGE_MM)
+        self.labels = [dict(lab) for lab in labels or []]
+        self.grid = {}
+        self._reindex()
+
+    def _key(self, x, y):
+        return int(np.floor(x / self.cell)), int(np.floor(y / self.cell))
+
+    def _reindex(self):
+        self.grid = {}
+        for k, lab in enumerate(self.labels):
+            self.grid.setdefault(self._key(lab['x'], lab['y']), []).append(k)
+
+    def near(self, x, y, radius):
+        """(x, y) çevresinde radius (mm) içindeki etiketler."""
+        r = int(np.ceil(radius / self.cell)) + 1
+        ci, cj = self._key(x, y)
+        found = []
+        for i in range(ci - r, ci + r + 1):
+            for j in range(cj - r, cj + r + 1):
+                for k in self.grid.get((i, j), ()):
+                    lab = self.labels[k]
+                    if np.hypot(lab['x'] - x, lab['y'] - y) <= radius:
+                        found.append(lab)
+        return found
+
+    def observe(self, text, x, y, conf):
+        """Gözlem ekle (makine XY, OCR güveni 0..1): yakında aynı metin varsa onunla birleştir."""
+        same = [lab for lab in self.near(x, y, config.BOARD_MAP_MERGE_MM) if lab['text'] == text]
+        weight = max(conf, 1e-3)
+        if same:
+            lab = min(same, key=lambda l: np.hypot(l['x'] - x, l['y'] - y))
+            total = lab['weight'] + weight
+            lab['x'] = (lab['x'] * lab['weight'] + x * weight) / total
+            lab['y'] = (lab['y'] * lab['weight'] + y * weight) / total
+            lab['weight'] = total
+            lab['hits'] += 1
+        else:
+            self.labels.append({'text': text, 'x': x, 'y': y, 'weight': weight, 'hits': 1})
+            self.grid.setdefault(self._key(x, y), []).append(len(self.labels) - 1)
+
+    def finalize(self, views, half_x, half_y):
+        """Tarama sonunda güvenleri hesapla (views: görüntü merkezleri, half_x/y: görüş alanı yarı boyu, mm)."""
+        centers = np.asarray(views, dtype=np.float64).reshape(-1, 2)
+        for lab in self.labels:
+            visible = int(np.sum((np.abs(centers[:, 0] - lab['x']) <= half_x) &
+                                 (np.abs(centers[:, 1] - lab['y']) <= half_y)))
+            lab['visible'] = max(visible, lab['hits'])
+            lab['conf'] = round(lab['weight'] / lab['hits'], 3)
+            lab['confidence'] = round(lab['conf'] * lab['hits'] / lab['visible'], 3)
+            lab['x'], lab['y'] = round(lab['x'], 3), round(lab['y'], 3)
+        self.updated = datetime.now().isoformat(timespec='seconds')
+        self._reindex()
+
+    def lookup(self, word, min_confidence=None):
+        """Kelimenin en güvenilir konumu (tam eşleşme öncelikli) veya None."""
+        min_conf = config.BOARD_MAP_MIN_CONFIDENCE if min_confidence is None else min_confidence
+        for match in (lambda t: t == word, lambda t: word in t):
+            found = [lab for lab in self.labels if match(lab['text']) and lab.get('confidence', 0) >= min_conf]
+            if found:
+                return max(found, key=lambda l: l['confidence'])
+        return None
+
+    def to_dict(self):
+        return {'area': self.area, 'updated': self.updated, 'labels': self.labels}
+
+
+class BoardMapStore:
+    """Kart tipi → BoardMap; BOARD_MAPS_FILE'da saklanır."""
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.maps = {}
+        self.load()
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+            self.maps = {name: BoardMap(name, m.get('area'), m.get('labels'), m.get('updated'))
+                         for name, m in data.items()}
+            log.info(f"Kart haritaları yüklendi: {len(self.maps)} kart tipi")
+        except Exception as e:
+            log.error(f"Kart haritası yükleme hatası: {e}")
+
+    def save(self):
+        try:
+            with self.lock:
+                data = {name: m.to_dict() for name, m in self.maps.items()}
+            temp_file = self.path + ".tmp"
+            with open(temp_file, 'w') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+            os.replace(temp_file, self.path)
+        except Exception as e:
+            log.error(f"Kart haritası kayıt hatası: {e}")
+
+    def get(self, board_type):
+        with self.lock:
+            return self.maps.get(board_type)
+
+    def put(self, board_map):
+        with self.lock:
+            self.maps[board_map.board_type] = board_map
+        self.save()
+
+    def delete(self, board_type):
+        with self.lock:
+            removed = self.maps.pop(board_type, None)
+        if removed is not None:
+            self.save()
+        return removed is not None
+
+    def summary(self):
+        with self.lock:
+            return {name: {'area': m.area, 'updated': m.updated, 'labels': len(m.labels)}
+                    for name, m in self.maps.items()}
+
+    def lookup(self, word, board_type=None):
+        """Aktif (veya verilen) kart tipinin indeksinde kelimeyi ara."""
+        board_map = self.get(board_type if board_type is not None else config.BOARD_TYPE)
+        return board_map.lookup(word) if board_map and word else None
+
+
+board_maps = BoardMapStore(config.BOARD_MAPS_FILE)
+
+
+def view_half_extent_mm():
+    """Görüş alanının makine eksenlerindeki yarı boyu (mm) — dönük görüntüde eksenlere hizalı iç dikdörtgen."""
+    hw, hh = config.CAMERA_WIDTH / 2.0, config.CAMERA_HEIGHT / 2.0
+    corners = [motor_to_machine(*pixel_to_motor(sx * hw, sy * hh)) for sx in (-1, 1) for sy in (-1, 1)]
+    return min(abs(c[0]) for c in corners), min(abs(c[1]) for c in corners)
+
+
+def base_xy(base):
+    """Kayıtlı konumun XY'si — konum bir kart etiketine bağlıysa (label) aktif kart haritasındaki konumu."""
+    label = base.get('label')
+    indexed = board_maps.lookup(label) if label else None
+    if indexed is not None:
+        return indexed['x'], indexed['y']
+    return base['x'], base['y']
+
+
+def base_center_label(base):
+    """Konum aktif kart haritasında bulunan bir etikete bağlıysa o etiket (varıştan sonra merkezlenir), yoksa None."""
+    label = base.get('label')
+    return label if label and board_maps.lookup(label) is not None else None
+
+
+board_map_running = False
+board_map_stop_flag = False
+
+
+def run_board_map(camera_ref, pnp_ref, socketio_ref, board_type, area):
+    """
+    Kart haritası çıkar: area ({'x0','y0','x1','y1'}, makine mm) görüş alanı adımlı
+    (BOARD_MAP_OVERLAP örtüşmeli) yılan sırasıyla taranır. Her görüntüde oturma ve taze
+    OCR sonucu beklenir; her etiketin alt-piksel merkezi lens + afin kalibrasyon ve
+    mevcut makine konumuyla makine XY'sine çevrilip indekse eklenir.
+    Sonuç board_maps.json'a kart tipi başına kaydedilir.
+    board_map_running route'ta (thread başlamadan) atanır, burada iş bitince temizlenir.
+    """
+    global board_map_running
+
+    def emit(status, message, data=None):
+        payload = {'status': status, 'message': message}
+        if data is not None:
+            payload['data'] = data
+        socketio_ref.emit('board_map_update', payload)
+        log.info(f"Kart haritası: {message}")
+
+    try:
+        x0, x1 = sorted((float(area['x0']), float(area['x1'])))
+        y0, y1 = sorted((float(area['y0']), float(area['y1'])))
+        half_x, half_y = view_half_extent_mm()
+        keep = min(max(1.0 - config.BOARD_MAP_OVERLAP, 0.1), 1.0)
+        nx = max(1, int(np.ceil((x1 - x0) / (2 * half_x * keep))) + 1) if x1 > x0 else 1
+        ny = max(1, int(np.ceil((y1 - y0) / (2 * half_y * keep))) + 1) if y1 > y0 else 1
+        xs = np.linspace(x0, x1, nx)
+        ys = np.linspace(y0, y1, ny)
+        views = [(float(x), float(y)) for j, y in enumerate(ys) for x in (xs if j % 2 == 0 else xs[::-1])]
+
+        board_map = BoardMap(board_type, {'x0': x0, 'y0': y0, 'x1': x1, 'y1': y1})
+        emit('running', f"'{board_type}' taranıyor: {len(views)} görüntü ({nx}×{ny}), "
+                        f"görüş alanı {2 * half_x:.1f}×{2 * half_y:.1f} mm")
+
+        visited = []
+        for i, (vx, vy) in enumerate(views):
+            if board_map_stop_flag:
+                emit('stopped', f"Tarama durduruldu ({i}/{len(views)} görüntü) — harita kaydedilmedi.")
+                return
+            pnp_ref.move_absolute(x=vx, y=vy)
+            socketio_ref.emit('motor_update', pnp_ref.get_status())
+            settle = camera_ref.wait_for_settle(time.monotonic())
+            results = camera_ref.wait_for_results(settle['settled_after'])
+            if results is None:
+                emit('warning', f"Görüntü {i+1}: OCR sonucu gelmedi, atlanıyor.")
+                continue
+            mx0, my0 = pnp_ref.current_x, pnp_ref.current_y
+            visited.append((mx0, my0))
+            for item in results:
+                dx_px, dy_px = camera_ref.lens.ideal_offset(*item['center_subpx'])
+                ddx, ddy = motor_to_machine(*pixel_to_motor(dx_px, dy_px))
+                board_map.observe(item['text'], mx0 + ddx, my0 + ddy, item.get('conf', 0.0) / 100.0)
+            emit('progress', f"Görüntü {i+1}/{len(views)}: {len(results)} etiket "
+                             f"(toplam {len(board_map.labels)})",
+                 data={'index': i, 'total': len(views), 'labels': len(board_map.labels)})
+
+        board_map.finalize(visited, half_x, half_y)
+        board_maps.put(board_map)
+        emit('done', f"'{board_type}' haritası kaydedildi: {len(board_map.labels)} etiket, "
+                     f"{len(visited)} görüntü", data=board_map.to_dict())
+
+    except Exception as e:
+        emit('error', f"Kart haritası hatası: {e}")
+        log.error(f"Kart haritası iptal edildi: {e}")
+
+    finally:
+        board_map_running = False
+
+
 # ═════════════════════════════════════════════════════════════════════════════
 #  AUTO-CENTER ALGORİTMASI
 # ═════════════════════════════════════════════════════════════════════════════
 
+def plan_search_spiral(radius_mm=None, overlap=None, max_rings=None):
+    """
+    Hedef arama planı: başlangıç görüntüsünün çevresinde halka halka genişleyen kare spiral.
+    Adım, görüş alanının (field_of_view_mm) SEARCH_OVERLAP kadar örtüşen kısmı kadardır;
+    başlangıçtan SEARCH_RADIUS_MM içindeki alana hiç değmeyen görüntüler atlanır,
+    max_rings halka sayısını sınırlar.
+    Returns: görüntü merkezlerinin başlangıca göre piksel ofsetleri [(dx_px, dy_px), ...]
+    (sırayla ziyaret edilir; motor hareketi pixel_to_motor farklarıyla bulunur)
+    """
+    radius = config.SEARCH_RADIUS_MM if radius_mm is None else radius_mm
+    overlap = config.SEARCH_OVERLAP if overlap is None else overlap
+    keep = min(max(1.0 - overlap, 0.1), 1.0)
+    fov_w, fov_h = field_of_view_mm()
+    step_mm = (fov_w * keep, fov_h * keep)
+    step_px = (config.CAMERA_WIDTH * keep, config.CAMERA_HEIGHT * keep)
+    rings = int(np.ceil((radius + max(fov_w, fov_h) / 2) / max(1e-6, min(step_mm))))
+    if max_rings is not None:
+        rings = min(rings, max_rings)
+
+    cells = []
+    for r in range(1, rings + 1):
+        cells += [(r, j) for j in range(-r + 1, r + 1)]          # Sağ kenar, aşağı
+        cells += [(i, r) for i in range(r - 1, -r - 1, -1)]      # Alt kenar, sola
+        cells += [(-r, j) for j in range(r - 1, -r - 1, -1)]     # Sol kenar, yukarı
+        cells += [(i, -r) for i in range(-r + 1, r + 1)]         # Üst kenar, sağa
+
+    def reach(i, j):
+        # Görüntü dikdörtgeninin başlangıca en yakın noktasının uzaklığı (mm)
+        return np.hypot(max(0.0, abs(i * step_mm[0]) - fov_w / 2), max(0.0, abs(j * step_mm[1]) - fov_h / 2))
+
+    return [(i * step_px[0], j * step_px[1]) for i, j in cells if reach(i, j) <= radius]
+
+
 def auto_center(camera: CameraManager, pnp: PNPDriver, socketio: SocketIO, target_word=None):
     """
     Tespit edilen hedef yazıyı ekranın merkezine taşır.
@@ -2011,8 +4938,14 @@ def auto_center(camera: CameraManager, pnp: PNPDriver, socketio: SocketIO, targe
     """
     camera.auto_centering = True
     camera.auto_center_status = "Başlatılıyor..."
+    camera.emit_overlay(force=True)
     what_to_search = target_word if target_word else (config.SELECTED_TARGET_WORD if config.SELECTED_TARGET_WORD else config.TARGET_GROUP)
 
+    # Tek bir kelime aranıyorsa OCR'ı o kelimeye odakla (grup aramasında normal mod)
+    focus_word = target_word or config.SELECTED_TARGET_WORD.strip()
+    if focus_word:
+        camera.set_focus_target(focus_word)
+
     def emit(status, message, phase=None):
         """Log + SocketIO ile kullanıcıya bildir."""
         prefix = f"[{phase}] " if phase else ""
@@ -2022,115 +4955,134 @@ def auto_center(camera: CameraManager, pnp: PNPDriver, socketio: SocketIO, targe
         log.info(f"Auto-Center: {full_msg}")
 
     try:
-        # ─── TARAMA DESENLERİ ───
-        scan_step = 0.5  # mm
-        scan_pattern_small = [
-            (scan_step, 0), (0, scan_step), (-scan_step, 0), (-scan_step, 0),
-            (0, -scan_step), (0, -scan_step), (scan_step, 0), (scan_step, 0)
-        ]
-        scan_step_wide = 1.0
-        scan_pattern_wide = [
-            (scan_step_wide, 0), (0, scan_step_wide),
-            (-scan_step_wide, 0), (-scan_step_wide, 0),
-            (0, -scan_step_wide), (0, -scan_step_wide),
-            (scan_step_wide, 0), (scan_step_wide, 0),
-            (scan_step_wide, 0), (0, scan_step_wide), (0, scan_step_wide),
-            (-scan_step_wide, 0), (-scan_step_wide, 0), (-scan_step_wide, 0),
-            (0, -scan_step_wide), (0, -scan_step_wide),
-        ]
-
-        def search_target(scan_word, max_wait=3, scan_pattern=None):
-            """Hedef yazıyı ara: önce bekle, bulamazsa tarama yap."""
+        def find_fresh(word, since, use_track=True):
+            """since (time.monotonic) sonrasında yakalanan bir karenin OCR (veya takip) sonucunu bekle."""
+            return camera.find_target_text(word, newer_than_time=since,
+                                           timeout=config.AUTO_CENTER_RESULT_TIMEOUT, use_track=use_track)
+
+        def settle():
+            """Hareketten sonra görüntünün oturmasını bekle; sonuçlar bu andan sonraki karelerden alınır."""
+            result = camera.wait_for_settle(time.monotonic())
+            if not result['settled']:
+                log.debug(f"Auto-Center: oturma zaman aşımı (kayma {result['shift']}px)")
+            return result['settled_after']
+
+        def move_view(src, dst):
+            """Görüntü merkezini src piksel ofsetinden dst'ye taşı."""
+            dx, dy = pixel_to_motor(dst[0] - src[0], dst[1] - src[1])
+            pnp.move_relative(dx=dx, dy=dy)
+
+        def search_target(scan_word, max_wait=3, max_rings=None):
+            """
+            Hedef yazıyı ara: önce yeni kareleri bekle, bulamazsa görüş alanı adımlı spiral tarama
+            (max_rings=0 → tarama yok). İlk tespitte durur; bulunamazsa başlangıç konumuna döner.
+            """
             for wait_try in range(max_wait):
-                time.sleep(0.8)
-                t = camera.find_target_text(scan_word)
+                t = find_fresh(scan_word, time.monotonic())
                 if t is not None:
                     return t
                 emit('moving', f"OCR taranıyor... ({wait_try+1}/{max_wait})")
 
-            if scan_pattern is None:
+            views = plan_search_spiral(max_rings=max_rings)
+            if not views:
                 return None
 
-            emit('moving', f"Hedef görünmüyor — etraf taranıyor ({len(scan_pattern)} adım)...")
-            for si, (sdx, sdy) in enumerate(scan_pattern):
-                motor_dx, motor_dy = screen_to_motor(sdx, sdy)
-                pnp.move_relative(dx=motor_dx, dy=motor_dy)
-                time.sleep(0.8)
-                t = camera.find_target_text(scan_word)
+            fov_w, fov_h = field_of_view_mm()
+            emit('moving', f"Hedef görünmüyor — spiral tarama ({len(views)} görüntü, "
+                           f"görüş alanı {fov_w:.1f}×{fov_h:.1f} mm)...")
+            pos = (0.0, 0.0)
+            for si, view in enumerate(views):
+                move_view(pos, view)
+                pos = view
+                t = find_fresh(scan_word, settle())
                 if t is not None:
-                    emit('moving', f"Hedef bulundu! (tarama adım {si+1}/{len(scan_pattern)})")
+                    emit('moving', f"Hedef bulundu! (tarama adım {si+1}/{len(views)})")
                     return t
                 if (si + 1) % 4 == 0:
-                    emit('moving', f"Tarama devam ediyor... ({si+1}/{len(scan_pattern)})")
+                    emit('moving', f"Tarama devam ediyor... ({si+1}/{len(views)})")
+            move_view(pos, (0.0, 0.0))
+            settle()
             return None
 
-        # Merkez koordinatları (180 derece olduğu için en/boy değişmez)
-        tx = config.CAMERA_WIDTH // 2
-        ty = config.CAMERA_HEIGHT // 2
+        # Hedef ofsetleri camera.lens.ideal_offset ile görüntü merkezine göre (distorsiyonsuz) hesaplanır
 
         # ══════════════════════════════════════════
         #  AŞAMA 0: BAŞLANGIÇ — HEDEF ARAMA
         # ══════════════════════════════════════════
         emit('started', f"'{what_to_search}' aranıyor...", phase="AŞAMA 0")
-        time.sleep(0.5)
-        target = camera.find_target_text(what_to_search)
+
+        # Kart haritası: hedef aktif kart tipinin indeksindeyse doğrudan konumuna git; orada
+        # görülürse kaba aşama atlanır (hassas merkezleme açıksa veya hedef zaten kaba tolerans içindeyse)
+        indexed = board_maps.lookup(what_to_search)
+        look_from = time.monotonic()
+        if indexed is not None:
+            emit('moving', f"Kart haritası ({config.BOARD_TYPE}): '{indexed['text']}' → "
+                           f"X{indexed['x']:.2f} Y{indexed['y']:.2f} (güven {indexed['confidence']:.2f})", phase="AŞAMA 0")
+            pnp.move_absolute(x=indexed['x'], y=indexed['y'])
+            look_from = settle()
+        target = find_fresh(what_to_search, look_from)
+        skip_coarse = False
+        if indexed is not None and target is not None:
+            dx_px, dy_px = camera.lens.ideal_offset(*target['center_subpx'])
+            tol = config.AUTO_CENTER_TOLERANCE
+            skip_coarse = config.FINE_TUNE_ENABLED or (abs(dx_px) <= tol and abs(dy_px) <= tol)
 
         if target is None:
             emit('moving', f"'{what_to_search}' ekranda yok — geniş tarama başlatılıyor...", phase="AŞAMA 0")
-            target = search_target(what_to_search, max_wait=2, scan_pattern=scan_pattern_wide)
+            target = search_target(what_to_search, max_wait=2)
             if target is None:
                 emit('error', f"'{what_to_search}' hiçbir yerde bulunamadı!", phase="AŞAMA 0")
                 return
 
         cx, cy = target['center']
         emit('moving', f"Hedef bulundu! Konum: ({cx},{cy}) — Merkezleme başlıyor.", phase="AŞAMA 0")
-        time.sleep(0.5)
+        moved_at = time.monotonic()   # Son hareketin bittiği an — kararlar sadece sonraki karelerden
 
         # ══════════════════════════════════════════
         #  AŞAMA 1: KABA MERKEZLEME
         # ══════════════════════════════════════════
-        emit('moving', "Kaba merkezleme başlıyor...", phase="AŞAMA 1")
         coarse_tolerance = config.AUTO_CENTER_TOLERANCE
-        success_first_pass = False
+        success_first_pass = skip_coarse
+        if skip_coarse:
+            emit('moving', "Kart haritası konumunda hedef görüldü — kaba merkezleme atlanıyor.", phase="AŞAMA 1")
+        else:
+            emit('moving', "Kaba merkezleme başlıyor...", phase="AŞAMA 1")
 
-        for iteration in range(config.AUTO_CENTER_MAX_ITER):
-            time.sleep(0.5)
-            target = camera.find_target_text(what_to_search)
+        for iteration in range(0 if skip_coarse else config.AUTO_CENTER_MAX_ITER):
+            target = find_fresh(what_to_search, moved_at)
             if target is None:
                 emit('moving', f"Hedef kayıp — yeniden aranıyor (iterasyon {iteration+1})...", phase="AŞAMA 1")
-                target = search_target(what_to_search, max_wait=3, scan_pattern=scan_pattern_small if iteration < 3 else None)
+                target = search_target(what_to_search, max_wait=3, max_rings=1 if iteration < 3 else 0)
                 if target is None:
                     emit('error', f"Hedef kayboldu ve bulunamadı! ({what_to_search})", phase="AŞAMA 1")
                     return
 
-            cx, cy = target['center']
-            dx_px = cx - tx
-            dy_px = cy - ty
+            cx, cy = target['center_subpx']
+            dx_px, dy_px = camera.lens.ideal_offset(cx, cy)  # Kenarlarda distorsiyon düzeltmesi
             dist_px = (dx_px**2 + dy_px**2) ** 0.5
 
-            emit('moving', f"İterasyon {iteration+1}: Fark = {dist_px:.0f}px (dx={dx_px}, dy={dy_px})", phase="AŞAMA 1")
+            source = f"takip, {target['age']:.2f}s" if target.get('tracked') else "OCR"
+            emit('moving', f"İterasyon {iteration+1}: Fark = {dist_px:.0f}px (dx={dx_px:.1f}, dy={dy_px:.1f}) [{source}]", phase="AŞAMA 1")
 
             if abs(dx_px) <= coarse_tolerance and abs(dy_px) <= coarse_tolerance:
                 emit('moving', f"Kaba merkezleme tamamlandı ✓ (fark: {dist_px:.0f}px)", phase="AŞAMA 1")
                 success_first_pass = True
                 break
 
-            screen_dx_mm = dx_px * config.PIXEL_TO_MM_X
-            screen_dy_mm = dy_px * config.PIXEL_TO_MM_Y
-            motor_dx, motor_dy = screen_to_motor(screen_dx_mm, screen_dy_mm)
+            motor_dx, motor_dy = pixel_to_motor(dx_px, dy_px)
             pnp.move_relative(dx=motor_dx, dy=motor_dy)
-            emit('moving', "Stabilizasyon bekleniyor (1.5s)...", phase="AŞAMA 1")
-            time.sleep(1.5)
+            camera.shift_focus_region(-dx_px, -dy_px)  # Hedef merkeze kayacak
+            emit('moving', "Görüntünün oturması bekleniyor...", phase="AŞAMA 1")
+            moved_at = settle()
 
         if not success_first_pass:
             emit('error', "Kaba merkezleme başarısız — maksimum iterasyon aşıldı.", phase="AŞAMA 1")
             return
 
         # ══════════════════════════════════════════
-        #  GEÇİŞ BEKLEMESİ
+        #  GEÇİŞ
         # ══════════════════════════════════════════
-        emit('moving', "Hassas merkezlemeye geçiş — stabilizasyon (2s)...", phase="GEÇİŞ")
-        time.sleep(2.0)
+        emit('moving', "Hassas merkezlemeye geçiş...", phase="GEÇİŞ")
 
         # ══════════════════════════════════════════
         #  AŞAMA 2: HASSAS MERKEZLEME
@@ -2140,49 +5092,50 @@ def auto_center(camera: CameraManager, pnp: PNPDriver, socketio: SocketIO, targe
             fine_tolerance = max(1, coarse_tolerance // 2)
 
             for i in range(5):
-                time.sleep(0.5)
-                target = camera.find_target_text(what_to_search)
+                # Alt-piksel merkez: son SUBPX_SAMPLES taze karenin moment merkezlerinin ortalaması
+                target = camera.refine_target(what_to_search, moved_at)
                 if not target:
                     emit('moving', "Hassas aşamada hedef kayıp — bekleniyor...", phase="AŞAMA 2")
-                    target = search_target(what_to_search, max_wait=2, scan_pattern=None)
+                    target = search_target(what_to_search, max_wait=2, max_rings=0)
                     if not target:
                         emit('moving', "Hedef kaybedildi, mevcut konumla devam.", phase="AŞAMA 2")
                         break
 
-                cx, cy = target['center']
-                dx_px = cx - tx
-                dy_px = cy - ty
+                cx, cy = target['center_subpx']
+                dx_px, dy_px = camera.lens.ideal_offset(cx, cy)
                 dist_px = (dx_px**2 + dy_px**2) ** 0.5
 
-                emit('moving', f"Hassas düzeltme {i+1}: Fark = {dist_px:.1f}px", phase="AŞAMA 2")
+                emit('moving', f"Hassas düzeltme {i+1}: Fark = {dist_px:.2f}px "
+                               f"({target.get('subpx_samples', 1)} OCR ortalaması)", phase="AŞAMA 2")
 
                 if abs(dx_px) <= fine_tolerance and abs(dy_px) <= fine_tolerance:
                     emit('moving', f"Hassas merkezleme tamamlandı ✓ (fark: {dist_px:.1f}px)", phase="AŞAMA 2")
                     break
 
-                screen_dx_mm = dx_px * config.PIXEL_TO_MM_X
-                screen_dy_mm = dy_px * config.PIXEL_TO_MM_Y
+                motor_dx, motor_dy = pixel_to_motor(dx_px, dy_px)
 
-                if abs(screen_dx_mm) > config.FINE_TUNE_STEP_MM:
-                    screen_dx_mm = config.FINE_TUNE_STEP_MM * (1 if screen_dx_mm > 0 else -1)
-                if abs(screen_dy_mm) > config.FINE_TUNE_STEP_MM:
-                    screen_dy_mm = config.FINE_TUNE_STEP_MM * (1 if screen_dy_mm > 0 else -1)
+                # En az iki ayrı OCR ölçümü hassas tolerans içinde uyuşuyorsa tam düzeltme tek
+                # hamlede; aksi halde adım FINE_TUNE_STEP_MM ile sınırlanır (yön korunarak)
+                k = 1.0
+                agreed = target.get('subpx_samples', 1) >= 2 and target.get('subpx_spread', 0.0) <= fine_tolerance
+                if not agreed:
+                    largest = max(abs(motor_dx), abs(motor_dy))
+                    if largest > config.FINE_TUNE_STEP_MM:
+                        k = config.FINE_TUNE_STEP_MM / largest
 
-                motor_dx, motor_dy = screen_to_motor(screen_dx_mm, screen_dy_mm)
-                pnp.move_relative(dx=motor_dx, dy=motor_dy)
-                time.sleep(1.0)
+                pnp.move_relative(dx=motor_dx * k, dy=motor_dy * k)
+                camera.shift_focus_region(-dx_px * k, -dy_px * k)
+                moved_at = settle()
 
         # ══════════════════════════════════════════
         #  AŞAMA 3: SON KONTROL
         # ══════════════════════════════════════════
         emit('moving', "Son kontrol yapılıyor...", phase="AŞAMA 3")
-        time.sleep(1.0)
-        target = camera.find_target_text(what_to_search)
+        target = find_fresh(what_to_search, moved_at, use_track=False)  # Son karar gerçek OCR sonucuyla
 
         if target:
-            cx, cy = target['center']
-            dx_px = cx - tx
-            dy_px = cy - ty
+            cx, cy = target['center_subpx']
+            dx_px, dy_px = camera.lens.ideal_offset(cx, cy)  # Kenarlarda distorsiyon düzeltmesi
             dist_px = (dx_px**2 + dy_px**2) ** 0.5
             emit('done', f"MERKEZLENDİ ✓ — '{what_to_search}' fark: {dist_px:.1f}px", phase="TAMAMLANDI")
         else:
@@ -2196,12 +5149,33 @@ def auto_center(camera: CameraManager, pnp: PNPDriver, socketio: SocketIO, targe
 
     finally:
         camera.auto_centering = False
+        camera.clear_focus_target()
+        camera.emit_overlay(force=True)
 
 # ═════════════════════════════════════════════════════════════════════════════
 #  GÖRÜNTÜ İŞLEME İLE DOĞRULUK KONTROLÜ (VERIFICATION)
 # ═════════════════════════════════════════════════════════════════════════════
 verification_running = False
 
+def verification_roi_rect(box, img_w, img_h, lens):
+    """
+    Oransal ROI kutusunun (x, y, w, h 0..1) kare üzerindeki piksel dikdörtgeni.
+    ROI'ler varsayılan olarak ham piksellerde tanımlıdır; LENS_UNDISTORT_ROIS açık ve lens
+    modeli hazırsa ideal koordinatlarda kabul edilir ve köşeleri ham kareye taşınıp
+    sınırlayıcı kutu alınır.
+    """
+    bx = int(box.get('x', 0) * img_w)
+    by = int(box.get('y', 0) * img_h)
+    bw = int(box.get('w', 0.1) * img_w)
+    bh = int(box.get('h', 0.1) * img_h)
+    if config.LENS_UNDISTORT_ROIS and lens.ready:
+        corners = lens.distort_points(
+            [(bx, by), (bx + bw, by), (bx, by + bh), (bx + bw, by + bh)], frame_w=img_w)
+        bx, by = (int(v) for v in np.floor(corners.min(axis=0)))
+        bw, bh = (int(v) for v in np.ceil(corners.max(axis=0)) - (bx, by))
+    return bx, by, bw, bh
+
+
 def run_verification(camera_ref, pnp_ref, socketio_ref):
     """
     Belirtilen konuma gidip kamera üzerinden Binary Threshold ile 
@@ -2238,29 +5212,32 @@ def run_verification(camera_ref, pnp_ref, socketio_ref):
                 emit('running', f"'{base_name}' konumuna gidiliyor...")
                 current_z = pnp_ref.current_z
                 target_z = target['z']
+                target_x, target_y = base_xy(target)
                 if target_z < current_z:
-                    pnp_ref.move_absolute(x=target['x'], y=target['y'])
+                    pnp_ref.move_absolute(x=target_x, y=target_y)
                     pnp_ref.move_absolute(z=target_z)
                 else:
                     pnp_ref.move_absolute(z=target_z)
-                    pnp_ref.move_absolute(x=target['x'], y=target['y'])
-                time.sleep(1.0)
+                    pnp_ref.move_absolute(x=target_x, y=target_y)
+                label = base_center_label(target)
+                if label:
+                    emit('running', f"'{label}' etiketine merkezleniyor...")
+                    auto_center(camera_ref, pnp_ref, socketio_ref, label)
             else:
                 emit('warning', f"Doğrulama konumu '{base_name}' bulunamadı. Mevcut konumda devam ediliyor.")
         else:
             emit('info', "Doğrulama konumu seçilmemiş. Mevcut konumda devam ediliyor.")
 
         emit('running', "Görüntü stabilize ediliyor...")
-        time.sleep(1.0)
-
-        for _ in range(5):
-            time.sleep(0.1)
-
-        with camera_ref.frame_lock:
-            if camera_ref.current_gray is None:
-                emit('error', "Kameradan görüntü alınamıyor!")
-                return
-            frame_gray = camera_ref.current_gray.copy()
+        settle = camera_ref.wait_for_settle(time.monotonic())
+        if not settle['settled']:
+            log.warning(f"Verification: görüntü oturmadı (kayma {settle['shift']}px), devam ediliyor.")
+
+        # Doğrulama tam çözünürlük ister — oturmuş ve (preview'dan dönülmüşse) tam çözünürlüklü kareyi bekle
+        frame_gray, _ = camera_ref.wait_for_frame(settle['settled_after'])
+        if frame_gray is None:
+            emit('error', "Kameradan görüntü alınamıyor!")
+            return
 
         # 2. Binary Threshold uygula
         blurred = cv2.GaussianBlur(frame_gray, (5, 5), 0)
@@ -2278,10 +5255,7 @@ def run_verification(camera_ref, pnp_ref, socketio_ref):
         img_h, img_w = thresh.shape[:2]
 
         for i, box in enumerate(boxes):
-            bx = int(box.get('x', 0) * img_w)
-            by = int(box.get('y', 0) * img_h)
-            bw = int(box.get('w', 0.1) * img_w)
-            bh = int(box.get('h', 0.1) * img_h)
+            bx, by, bw, bh = verification_roi_rect(box, img_w, img_h, camera_ref.lens)
             name = box.get('name', 'Bilinmeyen')
             target_ratio = float(box.get('target_ratio', 10.0))
 
@@ -2336,6 +5310,148 @@ def run_verification(camera_ref, pnp_ref, socketio_ref):
     finally:
         verification_running = False
 
+# ═════════════════════════════════════════════════════════════════════════════
+#  OTOMATİK AFİN KALİBRASYON (Kamera → Makine)
+# ═════════════════════════════════════════════════════════════════════════════
+calibration_running = False
+
+
+def measure_frame_shift(ref_gray, gray, width=640):
+    """
+    İki kare arasındaki global kaymayı faz korelasyonuyla ölç (gray, ref_gray'e göre).
+    Kareler width genişliğine küçültülüp Hanning penceresiyle korelasyona girer;
+    sonuç giriş karesinin piksel biriminde döner.
+    Returns: ((dx, dy), response) — response: korelasyon tepe gücü (0..1, düşükse ölçüm güvenilmez)
+    """
+    h, w = ref_gray.shape[:2]
+    sw = min(w, width)
+    size = (sw, max(8, int(h * sw / w)))
+    a = cv2.resize(ref_gray, size, interpolation=cv2.INTER_AREA).astype(np.float32)
+    b = cv2.resize(gray, size, interpolation=cv2.INTER_AREA).astype(np.float32)
+    window = cv2.createHanningWindow(size, cv2.CV_32F)
+    (dx, dy), response = cv2.phaseCorrelate(a, b, window)
+    factor = w / sw
+    return (dx * factor, dy * factor), float(response)
+
+
+def fit_affine(pixel_offsets, motor_offsets):
+    """
+    [motor_dx, motor_dy] = M · [piksel_dx, piksel_dy, 1] için 2×3 M'yi en küçük kareler ile oturt.
+    Öteleme sütunu (M[:, 2]) sadece tanılama içindir: sıfır piksel ofseti sıfır hareket demektir,
+    büyük bir değer referans karedeki kayma ölçüm hatasını gösterir (pixel_to_motor kullanmaz).
+    Returns: (M (2×3 ndarray), artıklar (N×2 ndarray, mm))
+    """
+    px = np.asarray(pixel_offsets, dtype=np.float64)
+    mm = np.asarray(motor_offsets, dtype=np.float64)
+    A = np.hstack([px, np.ones((len(px), 1))])
+    sol, _, rank, _ = np.linalg.lstsq(A, mm, rcond=None)
+    if rank < 3:
+        raise ValueError("Ölçüm noktaları doğrusal bağımsız değil — ızgara yetersiz.")
+    return sol.T, mm - A @ sol
+
+
+def run_affine_calibration(camera_ref, pnp_ref, socketio_ref):
+    """
+    Kafayı mevcut konum çevresinde CALIBRATION_GRID × CALIBRATION_GRID noktalık,
+    CALIBRATION_STEP_MM aralıklı bir ızgarada gezdirir; her noktada görüntü oturduktan
+    sonra referans kareye göre kaymayı faz korelasyonuyla ölçer. Motor ofsetleri ve
+    (hedefi merkeze getirecek) piksel ofsetlerinden 2×3 afin matris oturtulur,
+    artıklar raporlanır ve matris config.json'a kaydedilir. Sonunda başlangıç
+    konumuna dönülür. calibration_running route'ta (thread başlamadan) atanır.
+    """
+    global calibration_running
+
+    def emit(status, message, data=None):
+        payload = {'status': status, 'message': message}
+        if data is not None:
+            payload['data'] = data
+        socketio_ref.emit('calibration_update', payload)
+        log.info(f"Afin kalibrasyon: {message}")
+
+    def capture():
+        settle = camera_ref.wait_for_settle(time.monotonic())
+        if not settle['settled']:
+            log.warning(f"Afin kalibrasyon: görüntü oturmadı (kayma {settle['shift']}px)")
+        return camera_ref.wait_for_frame(settle['settled_after'])
+
+    pos = (0.0, 0.0)
+    try:
+        n = max(2, int(config.CALIBRATION_GRID))
+        step = float(config.CALIBRATION_STEP_MM)
+        values = (np.arange(n) - (n - 1) / 2.0) * step
+        # Yılan sırası — ardışık noktalar arası hareket kısa kalır
+        grid = [(float(x), float(y)) for j, y in enumerate(values)
+                for x in (values if j % 2 == 0 else values[::-1])]
+
+        emit('running', f"Kalibrasyon başlatılıyor ({n}×{n} ızgara, {step:g} mm adım)...")
+        ref, ref_info = capture()
+        if ref is None:
+            emit('error', "Kameradan görüntü alınamıyor!")
+            return
+
+        pixel_offsets, motor_offsets, points = [], [], []
+        for i, (ox, oy) in enumerate(grid):
+            if not pnp_ref.move_relative(dx=ox - pos[0], dy=oy - pos[1]):
+                emit('error', "Motor hareketi başarısız — kalibrasyon iptal edildi.")
+                return
+            pos = (ox, oy)
+            if ox == 0 and oy == 0:
+                shift, response = (0.0, 0.0), 1.0
+            else:
+                gray, info = capture()
+                if gray is None or gray.shape != ref.shape:
+                    emit('warning', f"Nokta {i+1}: kare alınamadı, atlanıyor.")
+                    continue
+                shift, response = measure_frame_shift(ref, gray)
+            point = {'motor': [round(ox, 3), round(oy, 3)],
+                     'shift_px': [round(shift[0], 2), round(shift[1], 2)],
+                     'response': round(response, 3)}
+            if response < 0.05:
+                emit('warning', f"Nokta {i+1}: korelasyon zayıf ({response:.3f}), atlanıyor.")
+                continue
+            # Ekranda (sx, sy) kadar kayan desen, (-sx, -sy) ofsetindeki hedefin merkeze gelmesi demek
+            pixel_offsets.append((-shift[0] * ref_info['scale'], -shift[1] * ref_info['scale']))
+            motor_offsets.append((ox, oy))
+            points.append(point)
+            emit('progress', f"Nokta {i+1}/{len(grid)}: motor ({ox:+.2f}, {oy:+.2f}) mm → "
+                             f"kayma ({shift[0]:+.1f}, {shift[1]:+.1f}) px", data=point)
+
+        if len(points) < 3:
+            emit('error', f"Yeterli ölçüm yok ({len(points)} nokta) — yüzeyde desen olduğundan emin olun.")
+            return
+
+        M, residuals = fit_affine(pixel_offsets, motor_offsets)
+        errors = np.hypot(residuals[:, 0], residuals[:, 1])
+        for point, err in zip(points, errors):
+            point['residual_mm'] = round(float(err), 4)
+
+        # Manuel PIXEL_TO_MM_X/Y korunur (matris silinince geri dönülür); matris varken
+        # eksen ölçekleri matrisin sütun normlarından türetilir (pixel_to_motor / field_of_view_mm)
+        config.CAMERA_TO_MOTOR_AFFINE = [[round(float(v), 6) for v in row] for row in M]
+        config.save_config()
+
+        result = {
+            'matrix': config.CAMERA_TO_MOTOR_AFFINE,
+            'rms_mm': round(float(np.sqrt(np.mean(errors ** 2))), 4),
+            'max_mm': round(float(errors.max()), 4),
+            'pixel_to_mm_x': round(float(np.hypot(M[0, 0], M[1, 0])), 6),
+            'pixel_to_mm_y': round(float(np.hypot(M[0, 1], M[1, 1])), 6),
+            'offset_mm': [round(float(M[0, 2]), 4), round(float(M[1, 2]), 4)],
+            'points': points,
+        }
+        emit('done', f"Kalibrasyon tamamlandı ✓ — artık RMS {result['rms_mm']:.4f} mm, "
+                     f"en büyük {result['max_mm']:.4f} mm ({len(points)} nokta)", data=result)
+
+    except Exception as e:
+        emit('error', f"Kalibrasyon hatası: {e}")
+        log.error(f"Afin kalibrasyon iptal edildi: {e}")
+
+    finally:
+        if pos != (0.0, 0.0):
+            pnp_ref.move_relative(dx=-pos[0], dy=-pos[1])
+            socketio_ref.emit('motor_update', pnp_ref.get_status())
+        calibration_running = False
+
 # ═════════════════════════════════════════════════════════════════════════════
 #  FLASK WEB SUNUCUSU
 # ═════════════════════════════════════════════════════════════════════════════
@@ -2413,17 +5529,19 @@ def index():
 
 # ─── Video stream ────────────────────────────────────────────────────────────
 
-def generate_mjpeg():
-    """MJPEG stream generator — her frame'i multipart response olarak verir."""
+def generate_mjpeg(kind='annotated'):
+    """MJPEG stream generator — her yeni frame'i bir kez multipart response olarak verir."""
+    last_seq = -1
     while True:
-        frame = camera.get_mjpeg_frame()
-        if frame is not None:
+        entry = camera.get_encoded_frame(kind)
+        if entry is not None and entry[0] != last_seq:
+            last_seq, frame = entry
             yield (
                 b'--frame\r\n'
                 b'Content-Type: image/jpeg\r\n\r\n' + frame + b'\r\n'
             )
         else:
-            time.sleep(0.05)
+            time.sleep(0.01 if entry is not None else 0.05)
 
 
 @app.route('/video_feed')
@@ -2436,25 +5554,12 @@ def video_feed():
     )
 
 
-def generate_mjpeg_raw():
-    """Temiz (annotasyonsuz) MJPEG stream generator."""
-    while True:
-        frame = camera.get_raw_mjpeg_frame()
-        if frame is not None:
-            yield (
-                b'--frame\r\n'
-                b'Content-Type: image/jpeg\r\n\r\n' + frame + b'\r\n'
-            )
-        else:
-            time.sleep(0.05)
-
-
 @app.route('/video_feed_raw')
 @login_required
 def video_feed_raw():
     """Temiz kamera görüntüsü (crosshair/PIP/OCR yok) — doğrulama tab için."""
     return Response(
-        generate_mjpeg_raw(),
+        generate_mjpeg('raw'),
         mimetype='multipart/x-mixed-replace; boundary=frame'
     )
 
@@ -2471,7 +5576,9 @@ def api_status():
             ocr_data.append({
                 'text': item['text'],
                 'rect': item['rect'],
-                'center': item['center']
+                'center': item['center'],
+                'center_subpx': item['center_subpx'],
+                'frame_seq': item['frame_seq']
             })
 
     return jsonify({
@@ -2480,6 +5587,11 @@ def api_status():
             'simulation': camera.simulation,
             'fps': round(camera.display_fps, 1),
             'ocr_fps': round(camera.ocr_fps, 1),
+            'ocr_timing': camera.ocr_timing,
+            'ocr_gate': camera.ocr_gate,
+            'capture_mode': camera.capture_mode,
+            'ocr_cache': camera.ocr_cache.stats(),
+            'ocr_engine': camera.ocr_engine_name,
         },
         'motor': pnp.get_status(),
         'ocr': ocr_data,
@@ -2514,6 +5626,46 @@ def screen_to_motor(screen_dx, screen_dy):
     return motor_dx, motor_dy
 
 
+def pixel_to_motor(dx_px, dy_px):
+    """
+    Tam çözünürlük piksel ofsetini (hedef - merkez) hedefi merkeze getirecek motor
+    hareketine (mm) dönüştür. Afin kalibrasyon varsa matrisin 2×2 doğrusal kısmı
+    (öteleme sütunu uygulanmaz — ofset farkları için de doğrudur), yoksa
+    PIXEL_TO_MM_X/Y ölçekleri + screen_to_motor kullanılır.
+    """
+    m = config.CAMERA_TO_MOTOR_AFFINE
+    if m:
+        return (m[0][0] * dx_px + m[0][1] * dy_px,
+                m[1][0] * dx_px + m[1][1] * dy_px)
+    return screen_to_motor(dx_px * config.PIXEL_TO_MM_X, dy_px * config.PIXEL_TO_MM_Y)
+
+
+def field_of_view_mm():
+    """Görüş alanının (tam kare) makine düzlemindeki genişlik ve yüksekliği (mm)."""
+    w, h = config.CAMERA_WIDTH, config.CAMERA_HEIGHT
+    m = config.CAMERA_TO_MOTOR_AFFINE
+    if m:
+        return float(np.hypot(m[0][0], m[1][0]) * w), float(np.hypot(m[0][1], m[1][1]) * h)
+    return w * config.PIXEL_TO_MM_X, h * config.PIXEL_TO_MM_Y
+
+
+# Gantry'yi uzun süre kullanan işler (afin kalibrasyon / kart taraması / auto-center) sürerken
+# hareket komutları reddedilir. İş başlatan route'lar kontrolü ve bayrağı bu kilit altında yapar
+# (bayrak thread başlamadan önce atanır — yakın iki istek aynı işi iki kez başlatamaz).
+motion_job_lock = threading.Lock()
+
+
+def motion_block_reason():
+    """Hareket komutu şu an reddedilmeliyse kullanıcı mesajı, değilse None."""
+    if calibration_running:
+        return 'Kalibrasyon çalışırken hareket edilemez!'
+    if board_map_running:
+        return 'Kart taraması çalışırken hareket edilemez!'
+    if camera.auto_centering:
+        return 'Auto-center çalışırken hareket edilemez!'
+    return None
+
+
 @app.route('/api/move', methods=['POST'])
 @login_required
 def api_move():
@@ -2522,6 +5674,10 @@ def api_move():
     JSON body: {"x": float, "y": float}  (mm cinsinden göreceli hareket)
     Kalibrasyon ayarlarına göre eksen dönüşümü uygulanır.
     """
+    blocked = motion_block_reason()
+    if blocked:
+        return jsonify({'success': False, 'message': blocked})
+
     data = request.get_json()
     screen_dx = float(data.get('x', 0))
     screen_dy = float(data.get('y', 0))
@@ -2532,10 +5688,42 @@ def api_move():
     socketio.emit('motor_update', pnp.get_status())
     return jsonify({'success': success, 'motor': pnp.get_status()})
 
+@app.route('/api/move_to_pixel', methods=['POST'])
+@login_required
+def api_move_to_pixel():
+    """
+    Tıkla-git: görüntüde seçilen noktayı merkeze getir.
+    JSON body: {"nx": float, "ny": float} (0..1, kareye göre) veya {"x": int, "y": int} (tam çözünürlük piksel)
+    Afin kalibrasyon varsa tek hamlede doğru konuma gidilir (pixel_to_motor).
+    """
+    blocked = motion_block_reason()
+    if blocked:
+        return jsonify({'success': False, 'message': blocked})
+
+    data = request.get_json(silent=True) or {}
+    if 'nx' in data and 'ny' in data:
+        px = float(data['nx']) * config.CAMERA_WIDTH
+        py = float(data['ny']) * config.CAMERA_HEIGHT
+    else:
+        px = float(data.get('x', config.CAMERA_WIDTH // 2))
+        py = float(data.get('y', config.CAMERA_HEIGHT // 2))
+
+    dx_px, dy_px = camera.lens.ideal_offset(px, py)
+    motor_dx, motor_dy = pixel_to_motor(dx_px, dy_px)
+    log.info(f"Tıkla-git: ({px:.0f},{py:.0f}) px → motor ({motor_dx:+.3f}, {motor_dy:+.3f}) mm")
+    success = pnp.move_relative(dx=motor_dx, dy=motor_dy)
+    socketio.emit('motor_update', pnp.get_status())
+    return jsonify({'success': success, 'dx': round(motor_dx, 4), 'dy': round(motor_dy, 4),
+                    'motor': pnp.get_status()})
+
 @app.route('/api/move_z_absolute', methods=['POST'])
 @login_required
 def api_move_z_absolute():
     """Mutlak Z hareketi."""
+    blocked = motion_block_reason()
+    if blocked:
+        return jsonify({'success': False, 'message': blocked})
+
     data = request.get_json()
     z = float(data.get('z', -163))
     success = pnp.move_absolute_z(z_mm=z)
@@ -2547,6 +5735,10 @@ def api_move_z_absolute():
 @login_required
 def api_home():
     """Home komutu — tüm eksenleri sıfırla."""
+    blocked = motion_block_reason()
+    if blocked:
+        return jsonify({'success': False, 'message': blocked})
+
     def _home():
         success = pnp.home()
         socketio.emit('motor_update', pnp.get_status())
@@ -2575,8 +5767,13 @@ def api_home():
 @login_required
 def api_auto_center():
     """Auto-center başlat — hedef yazıyı ekran merkezine taşı. JSON: {"target_word": "TEST"}"""
-    if camera.auto_centering:
-        return jsonify({'success': False, 'message': 'Auto-center zaten çalışıyor!'})
+    with motion_job_lock:
+        if camera.auto_centering:
+            return jsonify({'success': False, 'message': 'Auto-center zaten çalışıyor!'})
+        blocked = motion_block_reason()
+        if blocked:
+            return jsonify({'success': False, 'message': blocked})
+        camera.auto_centering = True
 
     data = request.get_json() or {}
     target_word = data.get('target_word', '').strip()
@@ -2634,6 +5831,10 @@ def api_bases():
             'y': float(data.get('y', 0)),
             'z': float(data.get('z', 0))
         }
+        # Opsiyonel: kart etiketi — aktif kart haritasında varsa XY oradan alınır
+        label = str(data.get('label') or '').strip()
+        if label:
+            entry['label'] = label
         
         # İsim kontrolü
         exists = False
@@ -2663,6 +5864,10 @@ def api_delete_base(name):
 @app.route('/api/goto_base', methods=['POST'])
 def api_goto_base():
     """Kayıtlı konuma git (Akıllı Z sıralaması)."""
+    blocked = motion_block_reason()
+    if blocked:
+        return jsonify({'success': False, 'message': blocked})
+
     data = request.get_json()
     name = data.get('name')
     target = next((b for b in config.BASES if b['name'] == name), None)
@@ -2670,21 +5875,27 @@ def api_goto_base():
     if target:
         current_z = pnp.current_z  # Mevcut Z pozisyonu
         target_z = target['z']
+        target_x, target_y = base_xy(target)  # Etikete bağlı konumlar kart haritasından
         
         if target_z < current_z:
             # Z aşağı gidecek → çarpışma riski: önce XY, sonra Z indir
             log.info(f"Goto '{name}': Z aşağı ({current_z:.2f} → {target_z:.2f}), sıra: XY → Z")
-            pnp.move_absolute(x=target['x'], y=target['y'])
+            pnp.move_absolute(x=target_x, y=target_y)
             success = pnp.move_absolute(z=target_z)
             order_msg = "XY → Z"
         else:
             # Z yukarı gidecek veya aynı → güvenli: önce Z yukarı, sonra XY
             log.info(f"Goto '{name}': Z yukarı ({current_z:.2f} → {target_z:.2f}), sıra: Z → XY")
             pnp.move_absolute(z=target_z)
-            success = pnp.move_absolute(x=target['x'], y=target['y'])
+            success = pnp.move_absolute(x=target_x, y=target_y)
             order_msg = "Z → XY"
         
         socketio.emit('motor_update', pnp.get_status())
+        label = base_center_label(target)
+        if label and success and not camera.auto_centering:
+            # Kart haritası konumu: hassas merkezleme arka planda (ilerleme auto_center_update ile)
+            threading.Thread(target=auto_center, args=(camera, pnp, socketio, label), daemon=True).start()
+            order_msg += f", '{label}' merkezleniyor"
         return jsonify({'success': success, 'message': f"'{name}' konumuna varıldı ({order_msg})."})
     
     return jsonify({'success': False, 'message': 'Konum bulunamadı'})
@@ -2731,13 +5942,19 @@ def run_scenario(scenario, pnp_ref, camera_ref, socketio_ref):
                 if target:
                     current_z = pnp_ref.current_z
                     target_z = target['z']
+                    target_x, target_y = base_xy(target)
                     if target_z < current_z:
-                        pnp_ref.move_absolute(x=target['x'], y=target['y'])
+                        pnp_ref.move_absolute(x=target_x, y=target_y)
                         pnp_ref.move_absolute(z=target_z)
                     else:
                         pnp_ref.move_absolute(z=target_z)
-                        pnp_ref.move_absolute(x=target['x'], y=target['y'])
+                        pnp_ref.move_absolute(x=target_x, y=target_y)
                     socketio_ref.emit('motor_update', pnp_ref.get_status())
+                    label = base_center_label(target)
+                    if label:
+                        # Kart haritası konumu + hassas merkezleme (harita hatası giderilir)
+                        emit('running', f"'{label}' etiketine merkezleniyor...", i)
+                        auto_center(camera_ref, pnp_ref, socketio_ref, label)
                 else:
                     emit('warning', f"Konum bulunamadı: {base_name}", i)
 
@@ -2922,6 +6139,9 @@ def api_run_scenario():
     global scenario_running
     if scenario_running:
         return jsonify({'success': False, 'message': 'Bir senaryo zaten çalışıyor!'})
+    blocked = motion_block_reason()
+    if blocked:
+        return jsonify({'success': False, 'message': blocked})
 
     data = request.get_json()
     name = data.get('name')
@@ -2982,6 +6202,9 @@ def api_run_master_scenario():
     global scenario_running
     if scenario_running:
         return jsonify({'success': False, 'message': 'Bir senaryo zaten çalışıyor!'})
+    blocked = motion_block_reason()
+    if blocked:
+        return jsonify({'success': False, 'message': blocked})
 
     data = request.get_json()
     name = data.get('name')
@@ -3043,6 +6266,9 @@ def api_verification_run():
     global verification_running
     if verification_running:
         return jsonify({'success': False, 'message': 'Doğrulama zaten çalışıyor!'})
+    blocked = motion_block_reason()
+    if blocked:
+        return jsonify({'success': False, 'message': blocked})
 
     threading.Thread(
         target=run_verification,
@@ -3058,9 +6284,36 @@ def api_set_config():
     data = request.get_json()
     config.update_from_dict(data)
     log.info(f"Konfigürasyon güncellendi: {data}")
+    if 'preview_width' in data:
+        camera.request_reconfigure()  # Preview modu konfigürasyonu yeniden oluşturulur
     return jsonify({'success': True, 'config': config.to_dict()})
 
 
+@app.route('/api/camera/mode', methods=['GET'])
+@login_required
+def api_get_camera_mode():
+    """Yakalama modunu döndür (ayar + aktif mod + mod çözünürlükleri)."""
+    return jsonify({
+        'setting': config.CAPTURE_MODE,
+        'active': camera.capture_mode,
+        'modes': {m: list(wh) for m, wh in camera.capture_modes.items()}
+    })
+
+
+@app.route('/api/camera/mode', methods=['POST'])
+@login_required
+def api_set_camera_mode():
+    """Yakalama modunu ayarla. JSON: {mode: 'auto'|'full'|'preview'} — geçiş kamera thread'inde yapılır."""
+    data = request.get_json() or {}
+    mode = str(data.get('mode', 'auto'))
+    if mode != 'auto' and mode not in camera.capture_modes:
+        return jsonify({'success': False, 'message': f"Geçersiz mod: {mode}"})
+    config.CAPTURE_MODE = mode
+    config.save_config()
+    log.info(f"Yakalama modu: {mode}")
+    return jsonify({'success': True, 'setting': mode, 'active': camera.capture_mode})
+
+
 @app.route('/api/camera/resolution', methods=['GET'])
 @login_required
 def api_get_camera_resolution():
@@ -3088,20 +6341,9 @@ def api_set_camera_resolution():
 
     config.save_config()
 
-    # Kamerayı yeniden başlat
+    # Kamerayı yeniden başlat (kamera thread'inde uygulanır — istek bloklanmaz)
     log.info(f"Kamera çözünürlüğü değiştirildi: {new_w}x{new_h}, Yeni Merkez: ({config.TARGET_X}, {config.TARGET_Y})")
-    try:
-        if hasattr(camera, 'picam2') and camera.picam2:
-            camera.picam2.stop()
-            cam_config = camera.picam2.create_preview_configuration(
-                main={"size": (new_w, new_h), "format": "RGB888"}
-            )
-            camera.picam2.configure(cam_config)
-            camera.picam2.start()
-            log.info("Kamera yeniden başlatıldı")
-    except Exception as e:
-        log.error(f"Kamera yeniden başlatma hatası: {e}")
-        add_error(f"Kamera yeniden başlatma hatası: {e}")
+    camera.request_reconfigure()
 
     return jsonify({
         'success': True,
@@ -3139,10 +6381,58 @@ def api_set_target_words():
         config.TARGET_WORDS = [w.strip() for w in words if w.strip()]
         log.info(f"Hedef kelimeler güncellendi: {config.TARGET_WORDS}")
 
+    config.VOCAB_VERSION += 1
     config.save_config()
     return jsonify({'success': True, 'words': config.TARGET_WORDS})
 
 
+@app.route('/api/ocr/engines', methods=['GET'])
+@login_required
+def api_get_ocr_engines():
+    """OCR motorları: seçili, çalışan ve bu makinede kullanılabilir olanlar."""
+    return jsonify({
+        'selected': config.OCR_BACKEND,
+        'active': camera.ocr_engine_name,
+        'available': available_ocr_engines(camera),
+        'registered': list(OCR_ENGINES)
+    })
+
+
+@app.route('/api/ocr/templates', methods=['GET'])
+@login_required
+def api_get_ocr_templates():
+    """Kayıtlı OCR şablonları (kelime → şablon sayısı)."""
+    return jsonify({
+        'backend': config.OCR_BACKEND,
+        'templates': camera.template_recognizer.summary()
+    })
+
+
+@app.route('/api/ocr/templates/enroll', methods=['POST'])
+@login_required
+def api_enroll_ocr_templates():
+    """
+    Şablon kaydı. JSON (opsiyonel): {word: "R1", rect: [x, y, w, h]}
+    Boş gövde → şu an okunan ve sözlükte bulunan tüm kelimeler kaydedilir.
+    """
+    data = request.get_json(silent=True) or {}
+    enrolled = camera.enroll_templates(data.get('word'), data.get('rect'))
+    if not enrolled:
+        return jsonify({'success': False, 'message': 'Kaydedilecek kelime bulunamadı'})
+    log.info(f"OCR şablonları kaydedildi: {enrolled}")
+    return jsonify({'success': True, 'enrolled': enrolled,
+                    'templates': camera.template_recognizer.summary()})
+
+
+@app.route('/api/ocr/templates/clear', methods=['POST'])
+@login_required
+def api_clear_ocr_templates():
+    """Tüm OCR şablonlarını sil."""
+    camera.template_recognizer.clear()
+    log.info("OCR şablonları silindi.")
+    return jsonify({'success': True})
+
+
 @app.route('/api/calibration/test', methods=['POST'])
 @login_required
 def api_calibration_test():
@@ -3151,6 +6441,10 @@ def api_calibration_test():
     JSON body: {"axis": "x"|"y", "direction": 1|-1, "step": float}
     Bu endpoint screen_to_motor dönüşümünü atlar — doğrudan motor eksenine gider.
     """
+    blocked = motion_block_reason()
+    if blocked:
+        return jsonify({'success': False, 'message': blocked})
+
     data = request.get_json()
     axis = data.get('axis', 'x')
     direction = int(data.get('direction', 1))
@@ -3194,6 +6488,161 @@ def api_save_calibration():
     })
 
 
+@app.route('/api/calibration/affine', methods=['POST'])
+@login_required
+def api_calibration_affine():
+    """
+    Otomatik afin kalibrasyonu başlat. JSON body (opsiyonel): {"step_mm": float, "grid": int}
+    İlerleme ve sonuç (matris, artıklar) 'calibration_update' soket olayıyla gelir.
+    """
+    global calibration_running
+    with motion_job_lock:
+        if calibration_running:
+            return jsonify({'success': False, 'message': 'Kalibrasyon zaten çalışıyor!'})
+        blocked = motion_block_reason()
+        if blocked:
+            return jsonify({'success': False, 'message': blocked})
+        calibration_running = True
+
+    data = request.get_json(silent=True) or {}
+    if 'step_mm' in data:
+        config.CALIBRATION_STEP_MM = float(data['step_mm'])
+    if 'grid' in data:
+        config.CALIBRATION_GRID = int(data['grid'])
+
+    threading.Thread(
+        target=run_affine_calibration,
+        args=(camera, pnp, socketio),
+        daemon=True
+    ).start()
+    return jsonify({'success': True, 'message': 'Afin kalibrasyon başlatıldı'})
+
+
+@app.route('/api/calibration/affine/clear', methods=['POST'])
+@login_required
+def api_calibration_affine_clear():
+    """Afin matrisi sil — swap/negate bayrakları ve PIXEL_TO_MM_X/Y'ye geri dönülür."""
+    config.CAMERA_TO_MOTOR_AFFINE = None
+    config.save_config()
+    log.info("Afin kalibrasyon silindi.")
+    return jsonify({'success': True})
+
+
+@app.route('/api/lens')
+@login_required
+def api_lens_status():
+    """Lens distorsiyon modeli durumu (toplanan görünümler, RMS, katsayılar)."""
+    return jsonify({'success': True, 'lens': camera.lens.status()})
+
+
+@app.route('/api/lens/capture', methods=['POST'])
+@login_required
+def api_lens_capture():
+    """Mevcut tam çözünürlüklü karede dama tahtasını bul ve görünüm olarak ekle."""
+    gray, _ = camera.wait_for_frame(0.0)
+    if gray is None:
+        return jsonify({'success': False, 'message': 'Kameradan görüntü alınamıyor!'})
+    corners = camera.lens.add_view(gray)
+    if not corners:
+        return jsonify({'success': False, 'lens': camera.lens.status(),
+                        'message': f"Dama tahtası bulunamadı ({config.CHECKERBOARD_COLS}×{config.CHECKERBOARD_ROWS} iç köşe)"})
+    log.info(f"Lens kalibrasyonu: görünüm eklendi ({len(camera.lens.views)})")
+    return jsonify({'success': True, 'corners': corners, 'lens': camera.lens.status()})
+
+
+@app.route('/api/lens/fit', methods=['POST'])
+@login_required
+def api_lens_fit():
+    """Toplanan görünümlerden lens modelini oturt ve lens_model.json'a kaydet."""
+    try:
+        rms = camera.lens.fit()
+    except Exception as e:
+        return jsonify({'success': False, 'message': f"Lens modeli oturtulamadı: {e}"})
+    return jsonify({'success': True, 'rms': rms, 'lens': camera.lens.status()})
+
+
+@app.route('/api/lens/clear', methods=['POST'])
+@login_required
+def api_lens_clear():
+    """Lens modelini ve toplanan görünümleri sil (düzeltme devre dışı)."""
+    camera.lens.clear()
+    log.info("Lens modeli silindi.")
+    return jsonify({'success': True, 'lens': camera.lens.status()})
+
+
+@app.route('/api/board_maps')
+@login_required
+def api_board_maps():
+    """Kayıtlı kart haritaları (kart tipi başına alan, etiket sayısı) ve aktif kart tipi."""
+    return jsonify({'success': True, 'board_type': config.BOARD_TYPE, 'maps': board_maps.summary(),
+                    'running': board_map_running})
+
+
+@app.route('/api/board_maps/<board_type>', methods=['GET', 'DELETE'])
+@login_required
+def api_board_map(board_type):
+    """Kart haritasının etiket indeksi (GET) veya haritayı sil (DELETE)."""
+    if request.method == 'DELETE':
+        if board_maps.delete(board_type):
+            return jsonify({'success': True, 'message': 'Kart haritası silindi', 'maps': board_maps.summary()})
+        return jsonify({'success': False, 'message': 'Kart haritası bulunamadı'})
+    board_map = board_maps.get(board_type)
+    if board_map is None:
+        return jsonify({'success': False, 'message': 'Kart haritası bulunamadı'})
+    return jsonify({'success': True, 'board_type': board_type, **board_map.to_dict()})
+
+
+@app.route('/api/board_map/scan', methods=['POST'])
+@login_required
+def api_board_map_scan():
+    """
+    Kart haritası taramasını başlat.
+    JSON body: {"board_type": str, "x0": float, "y0": float, "x1": float, "y1": float}
+    Alan verilmezse kart tipinin önceki haritasındaki alan kullanılır. Tarama
+    board_type hemen aktif kart tipi olur. İlerleme 'board_map_update' olayıyla gelir.
+    """
+    global board_map_running, board_map_stop_flag
+    data = request.get_json() or {}
+    board_type = str(data.get('board_type') or config.BOARD_TYPE).strip()
+    if not board_type:
+        return jsonify({'success': False, 'message': 'Kart tipi gerekli'})
+    keys = ('x0', 'y0', 'x1', 'y1')
+    if all(k in data for k in keys):
+        area = {k: float(data[k]) for k in keys}
+    else:
+        previous = board_maps.get(board_type)
+        if previous is None or not previous.area:
+            return jsonify({'success': False, 'message': 'Tarama alanı (x0, y0, x1, y1) gerekli'})
+        area = previous.area
+
+    with motion_job_lock:
+        if board_map_running:
+            return jsonify({'success': False, 'message': 'Kart taraması zaten çalışıyor!'})
+        blocked = motion_block_reason()
+        if blocked:
+            return jsonify({'success': False, 'message': blocked})
+        board_map_running = True
+        board_map_stop_flag = False
+
+    config.BOARD_TYPE = board_type
+    config.save_config()
+    threading.Thread(
+        target=run_board_map,
+        args=(camera, pnp, socketio, board_type, area),
+        daemon=True
+    ).start()
+    return jsonify({'success': True, 'message': f"'{board_type}' kart taraması başlatıldı"})
+
+
+@app.route('/api/board_map/stop', methods=['POST'])
+@login_required
+def api_board_map_stop():
+    """Süren kart taramasını durdur (harita kaydedilmez)."""
+    global board_map_stop_flag
+    board_map_stop_flag = True
+    return jsonify({'success': True})
+
+
 @app.route('/api/errors')
 @login_required
 def api_get_errors():
@@ -3217,6 +6666,9 @@ def api_send_gcode():
     cmd = data.get('command', '').strip()
     if not cmd:
         return jsonify({'success': False, 'message': 'Komut boş!'})
+    blocked = motion_block_reason()
+    if blocked:
+        return jsonify({'success': False, 'message': blocked})
 
     log.info(f"Manuel G-code: {cmd}")
     success = pnp.send(cmd)
@@ -3514,6 +6966,8 @@ def handle_connect():
         'config': config.to_dict(),
         'camera_fps': round(camera.display_fps, 1),
         'ocr_fps': round(camera.ocr_fps, 1),
+        'ocr_timing': camera.ocr_timing,
+        'ocr_gate': camera.ocr_gate,
         'ocr': ocr_data,
         'auto_centering': camera.auto_centering,
     })
@@ -3537,6 +6991,8 @@ def handle_status_request():
         'motor': pnp.get_status(),
         'camera_fps': round(camera.display_fps, 1),
         'ocr_fps': round(camera.ocr_fps, 1),
+        'ocr_timing': camera.ocr_timing,
+        'ocr_gate': camera.ocr_gate,
         'ocr': ocr_data,
         'auto_centering': camera.auto_centering,
     })
@@ -3559,6 +7015,8 @@ def periodic_status_emitter():
                 'motor': pnp.get_status(),
                 'camera_fps': round(camera.display_fps, 1),
                 'ocr_fps': round(camera.ocr_fps, 1),
+                'ocr_timing': camera.ocr_timing,
+                'ocr_gate': camera.ocr_gate,
                 'ocr': ocr_data,
                 'auto_centering': camera.auto_centering,
             })
@@ -3571,6 +7029,148 @@ def periodic_status_emitter():
 #  ANA PROGRAM
 # ═════════════════════════════════════════════════════════════════════════════
 
+def run_ocr_benchmark(folder):
+    """
+    Kayıtlı kareler üzerinde kullanılabilir tüm OCR motorlarını karşılaştır
+    (hız + doğruluk) ve doğruluk eşiğini (OCR_ACCURACY_BAR) geçen en hızlı motoru öner.
+    folder: kare görüntüleri (*.png / *.jpg) + labels.json {"dosya.png": ["R1", "C2", ...]}
+    Kullanım: python app.py --ocr-benchmark <klasör>
+    """
+    labels_path = os.path.join(folder, 'labels.json')
+    with open(labels_path) as f:
+        labels = json.load(f)
+
+    frames = []
+    for name, expected in sorted(labels.items()):
+        gray = cv2.imread(os.path.join(folder, name), cv2.IMREAD_GRAYSCALE)
+        if gray is None:
+            log.warning(f"Kare okunamadı: {name}")
+            continue
+        frames.append((name, gray, list(expected)))
+    if not frames:
+        print("Karşılaştırılacak kare bulunamadı.")
+        return {}
+
+    # Motorlar doğrudan çağrılır (OCR sonuç önbelleği devre dışı kalır) — global config değişmez
+    bench = CameraManager(backend=SimulatedCameraBackend())
+    vocab = bench.vocabulary()
+
+    # Eşik ve aday bölgeler motordan bağımsız — bir kez hesaplanır
+    prepared = []
+    for _, gray, expected in frames:
+        thresh = bench.compute_thresh(gray)
+        prepared.append((thresh, bench.detect_text_regions(thresh), expected))
+
+    names = available_ocr_engines(bench)
+    if not names:
+        print("Kullanılabilir OCR motoru yok (tesserocr / DNN modeli / kayıtlı şablon bulunamadı).")
+        return {}
+
+    results = {}
+    for name in names:
+        try:
+            engine = OCR_ENGINES[name].create(bench)
+        except Exception as e:
+            log.error(f"OCR motoru başlatılamadı ({name}): {e}")
+            continue
+        total_ms = 0.0
+        tp = n_pred = n_true = 0
+        for thresh, regions, expected in prepared:
+            t0 = time.perf_counter()
+            words = engine.recognize(thresh, regions, max_area=thresh.size * 0.25)
+            total_ms += (time.perf_counter() - t0) * 1000.0
+
+            predicted = []
+            for _, text, conf in words:
+                if conf > config.OCR_CONFIDENCE_THRESHOLD and text and len(text) >= config.OCR_MIN_WORD_LENGTH:
+                    predicted.append(vocab.correct(text) or text)
+            remaining = list(expected)
+            for text in predicted:
+                if text in remaining:
+                    remaining.remove(text)
+                    tp += 1
+            n_pred += len(predicted)
+            n_true += len(expected)
+        engine.close()
+
+        ms = total_ms / len(prepared)
+        results[name] = {
+            'ms_per_frame': round(ms, 2),
+            'fps': round(1000.0 / ms, 1) if ms > 0 else 0.0,
+            'precision': round(tp / n_pred, 3) if n_pred else 0.0,
+            'recall': round(tp / n_true, 3) if n_true else 0.0,
+        }
+
+    # Öneri: doğruluk eşiğini geçenler arasında en hızlısı
+    bar = config.OCR_ACCURACY_BAR
+    passing = [n for n, r in results.items() if r['precision'] >= bar and r['recall'] >= bar]
+    recommended = min(passing, key=lambda n: results[n]['ms_per_frame']) if passing else None
+
+    print(f"OCR karşılaştırması — {len(prepared)} kare, doğruluk eşiği {bar:.2f}")
+    print(f"{'Motor':<12}{'ms/kare':>10}{'kare/s':>10}{'Kesinlik':>10}{'Duyarlılık':>12}")
+    for name, r in results.items():
+        mark = '  ← önerilen' if name == recommended else ''
+        print(f"{name:<12}{r['ms_per_frame']:>10.2f}{r['fps']:>10.1f}{r['precision']:>10.3f}{r['recall']:>12.3f}{mark}")
+    if recommended:
+        print(f'Öneri: config.json → "ocr_backend": "{recommended}"')
+    else:
+        print("Doğruluk eşiğini geçen motor yok.")
+    return {'results': results, 'recommended': recommended}
+
+
+def run_capture_benchmark(seconds=5.0):
+    """
+    Kare gecikmesi karşılaştırması: aynı süreçte (thread) yakalama ve ayrı yakalama süreci.
+    Sentetik kamera + GIL'i meşgul eden saf Python yük thread'leri (OCR son işleme /
+    Flask benzeri) ile kare yakalanmasından ana süreçte görünmesine kadar geçen süre ölçülür.
+    Kullanım: python app.py --capture-benchmark [saniye]
+    """
+    def gil_load(stop):
+        while not stop.is_set():
+            sum(i * i for i in range(2000))
+
+    results = {}
+    for name in ('thread', 'process'):
+        if name == 'thread':
+            backend = SimulatedCameraBackend(frame_source=synthetic_frame)
+        else:
+            backend = ProcessCameraBackend(kind='synthetic')
+        cam = CameraManager(backend=backend)
+        cam.start()
+        stop = threading.Event()
+        threads = [threading.Thread(target=cam.camera_worker, daemon=True)]
+        threads += [threading.Thread(target=gil_load, args=(stop,), daemon=True) for _ in range(2)]
+        for t in threads:
+            t.start()
+
+        latencies = []
+        last_seq = 0
+        t_end = time.monotonic() + seconds
+        while time.monotonic() < t_end:
+            _, info = cam.get_frame()
+            if info['seq'] != last_seq and info['time']:
+                latencies.append((time.monotonic() - info['time']) * 1000.0)
+                last_seq = info['seq']
+            time.sleep(0.001)
+
+        stop.set()
+        cam.stop()
+        threads[0].join(timeout=2.0)
+        if latencies:
+            lat = np.array(latencies)
+            results[name] = {
+                'fps': round(len(lat) / seconds, 1),
+                'latency_ms': round(float(lat.mean()), 2),
+                'latency_p95_ms': round(float(np.percentile(lat, 95)), 2),
+            }
+
+    print(f"Yakalama karşılaştırması — {config.CAMERA_WIDTH}x{config.CAMERA_HEIGHT}, {seconds:.0f} s, 2 GIL yük thread'i")
+    print(f"{'Mod':<10}{'kare/s':>10}{'gecikme ms':>12}{'p95 ms':>10}")
+    for name, r in results.items():
+        print(f"{name:<10}{r['fps']:>10.1f}{r['latency_ms']:>12.2f}{r['latency_p95_ms']:>10.2f}")
+    return results
+
+
 def main():
     """
     Ana giriş noktası.
@@ -3616,6 +7216,9 @@ def main():
     except Exception as ne:
         log.warning(f"Nozzle bağlantısı kurulamadı: {ne} — nozzle olmadan devam")
 
+    # İstemci tarafı overlay verisi Socket.IO üzerinden yayınlanır
+    camera.overlay_callback = lambda payload: socketio.emit('overlay_update', payload)
+
     # 3. Kamera thread'ini başlat
     cam_thread = threading.Thread(target=camera.camera_worker, daemon=True)
     cam_thread.start()
@@ -3668,4 +7271,9 @@ def main():
 
 
 if __name__ == '__main__':
-    main()
+    if len(sys.argv) > 2 and sys.argv[1] == '--ocr-benchmark':
+        run_ocr_benchmark(sys.argv[2])
+    elif len(sys.argv) > 1 and sys.argv[1] == '--capture-benchmark':
+        run_capture_benchmark(float(sys.argv[2]) if len(sys.argv) > 2 else 5.0)
+    else:
+        main()
@@ -5,10 +5,12 @@ const MAX_LOG = 300;
 
 /* ═══ INIT ═══ */
 document.addEventListener('DOMContentLoaded', () => {
-    initSocket(); loadConfig(); loadWords(); loadErrors();
+    initSocket(); loadConfig(); loadWords(); loadErrors(); loadLensStatus(); loadBoardMaps();
     addC('Arayüz yüklendi. Ok tuşları=Hareket, H=Home, C=Center, E=Acil Durdur', 'info');
     setInterval(pollGrbl, 2000);
     setInterval(pollUptime, 5000);
+    // Tıkla-git: canlı görüntüde çift tıklanan nokta merkeze getirilir
+    ['camFeed', 'mainCam'].forEach(id => { const img = $(id); if (img) img.addEventListener('dblclick', moveToClick); });
     // Apply saved theme
     const t = localStorage.getItem('pnp-theme') || 'dark';
     document.documentElement.setAttribute('data-theme', t);
@@ -38,6 +40,7 @@ function initSocket() {
         if (d.config) applyConfig(d.config);
     });
     socket.on('motor_update', (d) => { if (d) updateMotor(d); });
+    socket.on('overlay_update', (d) => { overlayState = d; });
     socket.on('auto_center_update', (d) => {
         // Show overlay status
         if (d.status === 'started' || d.status === 'moving') {
@@ -104,6 +107,27 @@ function initSocket() {
             setTimeout(hideOverlay, 3000);
         }
     });
+    socket.on('board_map_update', d => {
+        const box = $('bmStatus');
+        if (box) box.textContent = d.message;
+        if (d.status === 'done') { showToast('Kart haritası kaydedildi ✓', 'success'); loadBoardMaps(); }
+        else if (d.status === 'error') showToast('Kart haritası: ' + d.message, 'error');
+        if (d.status !== 'progress') addC('Kart haritası: ' + d.message, d.status === 'error' ? 'error' : 'info');
+    });
+    socket.on('calibration_update', d => {
+        const box = $('affStatus');
+        if (d.status === 'done' || d.status === 'error') affineBusy = false;
+        if (d.status === 'done') {
+            showToast('Afin kalibrasyon tamamlandı ✓', 'success');
+            if (box) box.textContent = affineSummary(d.data);
+        } else if (d.status === 'error') {
+            showToast('Kalibrasyon: ' + d.message, 'error');
+            if (box) box.textContent = '❌ ' + d.message;
+        } else if (box) {
+            box.textContent = d.message;
+        }
+        addC('Kalibrasyon: ' + d.message, d.status === 'error' ? 'error' : 'info');
+    });
     socket.on('verification_update', d => {
         if (d.status === 'running' || d.status === 'info' || d.status === 'warning') {
             showToast('Doğrulama: ' + d.message, d.status === 'warning' ? 'warning' : 'info');
@@ -382,6 +406,9 @@ function applyConfig(c) {
     if (c.swap_axes !== undefined) { $('calSwapCb').checked = c.swap_axes; $('calSwap').textContent = c.swap_axes ? 'Evet' : 'Hayır'; }
     if (c.negate_screen_x !== undefined) { $('calNegXCb').checked = c.negate_screen_x; $('calNegX').textContent = c.negate_screen_x ? 'Evet' : 'Hayır'; }
     if (c.negate_screen_y !== undefined) { $('calNegYCb').checked = c.negate_screen_y; $('calNegY').textContent = c.negate_screen_y ? 'Evet' : 'Hayır'; }
+    if (c.camera_to_motor_affine !== undefined && $('affStatus') && !affineBusy) {
+        $('affStatus').textContent = c.camera_to_motor_affine ? affineSummary({ matrix: c.camera_to_motor_affine }) : 'Afin matris tanımlı değil.';
+    }
     // Camera
     if (c.camera_width !== undefined) { $('camW').value = c.camera_width; }
     if (c.camera_height !== undefined) { $('camH').value = c.camera_height; }
@@ -410,6 +437,11 @@ function applyConfig(c) {
         const el = $('cfgAutoHome');
         if (el) el.checked = c.auto_home;
     }
+    if (c.overlay_client_side !== undefined) {
+        const el = $('cfgOverlayClient');
+        if (el) el.checked = c.overlay_client_side;
+        setClientOverlay(c.overlay_client_side);
+    }
 }
 async function loadConfig() { try { const r = await fetch('/api/config').then(r => r.json()); applyConfig(r); } catch (e) { } }
 async function saveConfig() {
@@ -423,11 +455,123 @@ async function saveOcrConfig() {
         ocr_whitelist: $('cfgOcrWhitelist').value.toUpperCase(),
         ocr_min_word_length: +$('cfgMinWordLen').value,
         box_growth_limit: +$('cfgBoxGrowth').value,
-        auto_home: $('cfgAutoHome').checked
+        auto_home: $('cfgAutoHome').checked,
+        overlay_client_side: $('cfgOverlayClient').checked
     });
+    setClientOverlay($('cfgOverlayClient').checked);
     addC('OCR ayarları kaydedildi.', 'info'); showToast('OCR ayarları kaydedildi', 'info');
 }
 
+/* ═══ CLIENT-SIDE OVERLAY ═══ */
+// Sunucu tek temiz stream yayınlar; kutular, HUD ve PIP burada canvas'a çizilir
+let overlayState = null, clientOverlay = false, overlayRaf = null;
+const OVERLAY_TARGETS = [['camFeed', 'camOverlay'], ['mainCam', 'mainCamOverlay']];
+const pipCanvas = document.createElement('canvas');
+
+function setClientOverlay(on) {
+    clientOverlay = !!on;
+    OVERLAY_TARGETS.forEach(([, cid]) => { const c = $(cid); if (c) c.style.display = clientOverlay ? 'block' : 'none'; });
+    if (clientOverlay && !overlayRaf) overlayRaf = requestAnimationFrame(drawOverlays);
+}
+
+function drawOverlays() {
+    overlayRaf = null;
+    if (!clientOverlay) return;
+    OVERLAY_TARGETS.forEach(([iid, cid]) => {
+        const img = $(iid), cv = $(cid);
+        if (img && cv && cv.offsetParent) drawOverlay(cv, img, overlayState);
+    });
+    overlayRaf = requestAnimationFrame(drawOverlays);
+}
+
+function drawOverlay(cv, img, st) {
+    const dpr = window.devicePixelRatio || 1;
+    const cw = cv.clientWidth, ch = cv.clientHeight;
+    if (cv.width !== Math.round(cw * dpr) || cv.height !== Math.round(ch * dpr)) {
+        cv.width = Math.round(cw * dpr); cv.height = Math.round(ch * dpr);
+    }
+    const ctx = cv.getContext('2d');
+    ctx.setTransform(dpr, 0, 0, dpr, 0, 0);
+    ctx.clearRect(0, 0, cw, ch);
+    if (!st || !st.stream_w || !cw || !ch) return;
+
+    // object-fit: contain → görüntünün canvas içindeki gerçek alanı
+    const aspect = st.stream_w / st.stream_h;
+    let dw = cw, dh = cw / aspect;
+    if (dh > ch) { dh = ch; dw = ch * aspect; }
+    const ox = (cw - dw) / 2, oy = (ch - dh) / 2;
+    const k = dw / st.stream_w;          // stream px → canvas px
+    const f = dw / st.frame_w;           // tam çözünürlük px → canvas px
+    ctx.save();
+    ctx.translate(ox, oy);
+
+    // ── OCR kutuları
+    const fontPx = Math.max(0.4, st.stream_w / 800 * 0.6) * 22 * k;
+    ctx.font = `${fontPx}px sans-serif`;
+    ctx.textBaseline = 'bottom';
+    st.boxes.forEach(b => {
+        const [x, y, w, h] = b.rect.map(v => v * f);
+        ctx.strokeStyle = 'rgb(0,255,0)'; ctx.lineWidth = 2;
+        ctx.strokeRect(x, y, w, h);
+        ctx.strokeStyle = 'rgb(255,165,0)'; ctx.lineWidth = 1;
+        ctx.beginPath(); ctx.moveTo(x, y); ctx.lineTo(x + w, y + h); ctx.moveTo(x + w, y); ctx.lineTo(x, y + h); ctx.stroke();
+        ctx.fillStyle = 'rgb(255,0,0)';
+        ctx.beginPath(); ctx.arc(b.center[0] * f, b.center[1] * f, 5 * k, 0, Math.PI * 2); ctx.fill();
+        const tw = ctx.measureText(b.text).width;
+        ctx.fillStyle = '#fff'; ctx.fillRect(x, y - fontPx - 6 * k, tw, fontPx + 6 * k);
+        ctx.fillStyle = 'rgb(255,0,0)'; ctx.fillText(b.text, x, y - 3 * k);
+    });
+
+    // ── HUD: kılavuz çizgileri, nişangah daireleri, cetvel çentikleri
+    const tx = Math.floor(st.stream_w / 2) * k, ty = Math.floor(st.stream_h / 2) * k, gap = 25 * k;
+    ctx.lineWidth = 1;
+    ctx.strokeStyle = 'rgb(0,255,255)';
+    ctx.beginPath();
+    ctx.moveTo(0, ty); ctx.lineTo(tx - gap, ty); ctx.moveTo(tx + gap, ty); ctx.lineTo(dw, ty);
+    ctx.moveTo(tx, 0); ctx.lineTo(tx, ty - gap); ctx.moveTo(tx, ty + gap); ctx.lineTo(tx, dh);
+    ctx.stroke();
+    ctx.strokeStyle = 'rgb(0,100,100)';
+    ctx.beginPath();
+    [50, 100, 150, 200].forEach(r => { ctx.moveTo(tx + r * k, ty); ctx.arc(tx, ty, r * k, 0, Math.PI * 2); });
+    for (let i = 0; i < st.stream_w; i += 50) { if (Math.abs(i * k - tx) < gap) continue; ctx.moveTo(i * k, ty - 5 * k); ctx.lineTo(i * k, ty + 5 * k); }
+    for (let i = 0; i < st.stream_h; i += 50) { if (Math.abs(i * k - ty) < gap) continue; ctx.moveTo(tx - 5 * k, i * k); ctx.lineTo(tx + 5 * k, i * k); }
+    ctx.stroke();
+    ctx.fillStyle = 'rgb(255,0,0)';
+    ctx.beginPath(); ctx.arc(tx, ty, 2 * k, 0, Math.PI * 2); ctx.fill();
+
+    // ── Auto-center bandı
+    if (st.auto_centering) {
+        const text = 'OTOMATIK-MERKEZLEME AKTIF';
+        ctx.font = `bold ${22 * k}px sans-serif`;
+        const tw = ctx.measureText(text).width;
+        ctx.fillStyle = '#000'; ctx.fillRect((dw - tw) / 2 - 10 * k, 50 * k - 32 * k, tw + 20 * k, 42 * k);
+        ctx.fillStyle = 'rgb(255,0,0)'; ctx.fillText(text, (dw - tw) / 2, 50 * k);
+    }
+    ctx.restore();
+
+    // ── PIP zoom (sol alt): görüntü + overlay'in merkez kesiti
+    if (st.zoom > 1 && img.naturalWidth) {
+        try {
+            const ph = 150 * k, pw = ph * aspect, px = ox + 10 * k, py = oy + dh - ph - 10 * k;
+            const zw = dw / st.zoom, zh = dh / st.zoom;
+            const nw = img.naturalWidth / st.zoom, nh = img.naturalHeight / st.zoom;
+            // Overlay kesiti önce ayrı canvas'a alınır (PIP alanı kesitle çakışabilir)
+            pipCanvas.width = Math.round(zw * dpr); pipCanvas.height = Math.round(zh * dpr);
+            pipCanvas.getContext('2d').drawImage(cv, (ox + (dw - zw) / 2) * dpr, (oy + (dh - zh) / 2) * dpr, zw * dpr, zh * dpr, 0, 0, pipCanvas.width, pipCanvas.height);
+            ctx.drawImage(img, (img.naturalWidth - nw) / 2, (img.naturalHeight - nh) / 2, nw, nh, px, py, pw, ph);
+            ctx.drawImage(pipCanvas, px, py, pw, ph);
+            ctx.strokeStyle = 'rgb(0,165,255)'; ctx.lineWidth = 4; ctx.strokeRect(px + 2, py + 2, pw - 4, ph - 4);
+            const pcx = px + pw / 2, pcy = py + ph / 2;
+            [['#000', 4], ['rgb(0,255,0)', 2]].forEach(([c, lw]) => {
+                ctx.strokeStyle = c; ctx.lineWidth = lw;
+                ctx.beginPath(); ctx.moveTo(pcx - 15, pcy); ctx.lineTo(pcx + 15, pcy); ctx.moveTo(pcx, pcy - 15); ctx.lineTo(pcx, pcy + 15); ctx.stroke();
+            });
+            ctx.font = `bold ${13 * k}px sans-serif`; ctx.fillStyle = 'rgb(255,255,0)';
+            ctx.fillText(`ZOOM x${(+st.zoom).toFixed(1)}`, px + 5 * k, py + 20 * k);
+        } catch (e) { /* PIP hatası overlay'i bozmasın */ }
+    }
+}
+
 /* ═══ OCR WORDS & GROUPS ═══ */
 let ocrGroups = {};
 let targetGroup = "Varsayilan";
@@ -762,6 +906,122 @@ async function saveCalibration() {
 }
 
 
+let affineBusy = false;
+
+function affineSummary(d) {
+    const m = d.matrix.map(r => r.map(v => v.toFixed(5).padStart(10)).join(' ')).join('\n');
+    let t = 'Matris (motor mm = M · [px, py, 1]):\n' + m;
+    if (d.rms_mm !== undefined) t += `\nArtık RMS: ${d.rms_mm} mm — en büyük: ${d.max_mm} mm (${d.points.length} nokta)`;
+    return t;
+}
+
+async function runAffineCalibration() {
+    const step_mm = parseFloat($('affStep').value) || 1;
+    const grid = parseInt($('affGrid').value) || 3;
+    const r = await api('/api/calibration/affine', { step_mm, grid });
+    if (r.success) {
+        affineBusy = true;
+        $('affStatus').textContent = 'Kalibrasyon başlatıldı...';
+    } else {
+        showToast(r.message || 'Kalibrasyon başlatılamadı!', 'error');
+    }
+}
+
+async function clearAffineCalibration() {
+    const r = await api('/api/calibration/affine/clear', {});
+    if (r.success) {
+        $('affStatus').textContent = 'Afin matris tanımlı değil.';
+        showToast('Afin kalibrasyon silindi', 'info');
+    }
+}
+
+async function moveToClick(e) {
+    // object-fit: contain → tıklamayı görüntünün gerçek alanına göre 0..1 koordinata çevir
+    const img = e.currentTarget, rect = img.getBoundingClientRect();
+    if (!img.naturalWidth || !rect.width) return;
+    const aspect = img.naturalWidth / img.naturalHeight;
+    let dw = rect.width, dh = rect.width / aspect;
+    if (dh > rect.height) { dh = rect.height; dw = rect.height * aspect; }
+    const nx = (e.clientX - rect.left - (rect.width - dw) / 2) / dw;
+    const ny = (e.clientY - rect.top - (rect.height - dh) / 2) / dh;
+    if (nx < 0 || nx > 1 || ny < 0 || ny > 1) return;
+    const r = await api('/api/move_to_pixel', { nx, ny });
+    if (r.success) addC(`Tıkla-git: motor (${r.dx}, ${r.dy}) mm`, 'info');
+    else showToast('Tıkla-git hareketi başarısız!', 'error');
+}
+
+function renderLensStatus(l) {
+    const box = $('lensStatus');
+    if (!box || !l) return;
+    let t = `Toplanan görünüm: ${l.views} (en az ${l.min_views})`;
+    t += l.ready ? `\nModel: ${l.size[0]}×${l.size[1]}, RMS ${l.rms} px\nKatsayılar: ${l.dist_coeffs.join(', ')}` : '\nLens modeli yok.';
+    box.textContent = t;
+}
+
+async function loadLensStatus() {
+    try {
+        const r = await fetch('/api/lens').then(res => res.json());
+        renderLensStatus(r.lens);
+    } catch (e) { console.error('Lens status error', e); }
+}
+
+async function lensCapture() {
+    const r = await api('/api/lens/capture', {});
+    renderLensStatus(r.lens);
+    if (r.success) showToast(`Dama tahtası bulundu (${r.corners} köşe)`, 'info');
+    else showToast(r.message || 'Dama tahtası bulunamadı!', 'error');
+}
+
+async function lensFit() {
+    const r = await api('/api/lens/fit', {});
+    if (r.success) { renderLensStatus(r.lens); showToast(`Lens modeli kaydedildi (RMS ${r.rms} px)`, 'success'); }
+    else showToast(r.message || 'Lens modeli oturtulamadı!', 'error');
+}
+
+async function lensClear() {
+    const r = await api('/api/lens/clear', {});
+    if (r.success) { renderLensStatus(r.lens); showToast('Lens modeli silindi', 'info'); }
+}
+
+/* ═══ KART HARİTASI ═══ */
+async function loadBoardMaps() {
+    try {
+        const r = await fetch('/api/board_maps').then(res => res.json());
+        const cont = $('bmList');
+        if (!cont) return;
+        if (r.board_type && !$('bmType').value) $('bmType').value = r.board_type;
+        const names = Object.keys(r.maps || {});
+        cont.innerHTML = names.length ? names.map(n => {
+            const m = r.maps[n];
+            return `<div class="cfg-r"><label>${n === r.board_type ? '✅ ' : ''}${esc(n)} — ${m.labels} etiket
+                <span style="color:#888">(${m.updated || '-'})</span></label>
+                <span><button class="btn-sm" style="background:#1976d2;color:#fff" onclick="setBoardType('${esc(n)}')">Aktif</button>
+                <button class="btn-sm" style="background:#d32f2f;color:#fff" onclick="deleteBoardMap('${esc(n)}')">Sil</button></span></div>`;
+        }).join('') : '<div class="ocr-empty">Kayıtlı kart haritası yok.</div>';
+    } catch (e) { console.error('Board maps load error', e); }
+}
+
+async function boardMapScan() {
+    const board_type = $('bmType').value.trim();
+    if (!board_type) { showToast('Kart tipi gerekli!', 'error'); return; }
+    const body = { board_type };
+    ['x0', 'y0', 'x1', 'y1'].forEach(k => { body[k] = parseFloat($('bm' + k.toUpperCase()).value) || 0; });
+    const r = await api('/api/board_map/scan', body);
+    showToast(r.message, r.success ? 'info' : 'error');
+}
+
+async function setBoardType(name) {
+    await api('/api/config', { board_type: name });
+    $('bmType').value = name;
+    loadBoardMaps();
+}
+
+async function deleteBoardMap(name) {
+    if (!confirm(name + ' kart haritası silinsin mi?')) return;
+    await fetch('/api/board_maps/' + encodeURIComponent(name), { method: 'DELETE' }).then(res => res.json());
+    loadBoardMaps();
+}
+
 /* ═══ BASES ═══ */
 async function loadBases() {
     try {
@@ -784,7 +1044,7 @@ function renderBases(list) {
         h += '<tr style="border-bottom:1px solid #444; text-align:left; color:#aaa"><th style="padding:4px">İsim</th><th>X</th><th>Y</th><th>Z</th><th></th></tr>';
         list.forEach(b => {
             h += `<tr id="baseRow_${esc(b.name)}" style="border-bottom:1px solid #333">
-                <td style="padding:8px">${esc(b.name)}</td>
+                <td style="padding:8px">${esc(b.name)}${b.label ? ` <span style="color:#888">🏷️ ${esc(b.label)}</span>` : ''}</td>
                 <td>${b.x}</td><td>${b.y}</td><td>${b.z}</td>
                 <td style="text-align:right; white-space:nowrap">
                     <button class="btn-sm" style="background:#4caf50;color:#fff" onclick="editBase('${esc(b.name)}')">✏️</button>
@@ -851,7 +1111,8 @@ async function saveEditBase(originalName) {
     if (newName !== originalName) {
         await fetch('/api/bases/' + encodeURIComponent(originalName), { method: 'DELETE' }).then(r => r.json());
     }
-    const r = await api('/api/bases', { name: newName, x, y, z });
+    const label = (_basesList.find(item => item.name === originalName) || {}).label || '';
+    const r = await api('/api/bases', { name: newName, x, y, z, label });
     if (r.success) {
         showToast('Konum güncellendi.', 'info');
         renderBases(r.bases);
@@ -871,7 +1132,8 @@ async function saveBase() {
     const y = parseFloat($('baseY').value) || 0;
     const z = parseFloat($('baseZ').value) || 0;
 
-    const r = await api('/api/bases', { name, x, y, z });
+    const label = $('baseLabel').value.trim();
+    const r = await api('/api/bases', { name, x, y, z, label });
     if (r.success) {
         showToast('Konum kaydedildi.', 'info');
         renderBases(r.bases);
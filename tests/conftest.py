@@ -0,0 +1,23 @@
+"""Ortak test düzeneği: app modülü (import sırasında yeniden yazılan config.json korunur)."""
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+@pytest.fixture(scope='session')
+def app_module():
+    # app import edilirken config.json yeniden yazılır — testlerden sonra eski hali geri yüklenir
+    path = os.path.join(ROOT, 'config.json')
+    saved = None
+    if os.path.exists(path):
+        with open(path, 'rb') as f:
+            saved = f.read()
+    import app
+    yield app
+    if saved is not None:
+        with open(path, 'wb') as f:
+            f.write(saved)
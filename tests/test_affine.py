@@ -0,0 +1,31 @@
+"""Afin kamera → motor kalibrasyonu: matris oturtma ve piksel ofseti dönüşümü."""
+import numpy as np
+import pytest
+
+KNOWN = np.array([[0.021, -0.0015, 0.12],
+                  [0.0012, 0.0198, -0.08]])
+
+
+def test_fit_affine_recovers_known_matrix(app_module):
+    rng = np.random.default_rng(2)
+    px = rng.uniform(-600, 600, (25, 2))
+    mm = np.hstack([px, np.ones((25, 1))]) @ KNOWN.T
+    M, residuals = app_module.fit_affine(px, mm + rng.normal(0, 1e-4, mm.shape))
+    assert np.allclose(M, KNOWN, atol=1e-4)
+    assert np.abs(residuals).max() < 1e-3
+
+
+def test_fit_affine_rejects_degenerate_grid(app_module):
+    px = [(x, 2 * x) for x in range(5)]
+    with pytest.raises(ValueError):
+        app_module.fit_affine(px, px)
+
+
+def test_pixel_to_motor_ignores_intercept(app_module, monkeypatch):
+    monkeypatch.setattr(app_module.config, 'CAMERA_TO_MOTOR_AFFINE', KNOWN.tolist())
+    p2m = app_module.pixel_to_motor
+    assert p2m(0, 0) == (0, 0)
+    # Doğrusal: farkların dönüşümü dönüşümlerin farkı
+    a, b = np.array(p2m(120, -40)), np.array(p2m(-30, 75))
+    assert np.allclose(a - b, p2m(150, -115))
+    assert np.allclose(p2m(100, 50), KNOWN[:, :2] @ [100, 50])
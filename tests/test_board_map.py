@@ -0,0 +1,93 @@
+"""Kart haritası: gözlem birleştirme, güven hesabı, etiket arama ve board_maps.json gidiş-dönüşü."""
+import json
+
+import pytest
+
+
+@pytest.fixture
+def cfg(app_module, monkeypatch):
+    config = app_module.config
+    monkeypatch.setattr(config, 'BOARD_MAP_MERGE_MM', 1.0)
+    monkeypatch.setattr(config, 'BOARD_MAP_MIN_CONFIDENCE', 0.5)
+    monkeypatch.setattr(config, 'BOARD_TYPE', 'KART-A')
+    return config
+
+
+def scanned_map(app):
+    board_map = app.BoardMap('KART-A', {'x0': 0.0, 'y0': 0.0, 'x1': 20.0, 'y1': 10.0})
+    board_map.observe('R1', 10.0, 5.0, 0.9)
+    board_map.observe('R1', 10.3, 5.0, 0.6)      # Aynı etiket, 0.3 mm öteden → birleşir
+    board_map.observe('R1', 17.0, 5.0, 0.6)      # Aynı metin ama uzak → ayrı kayıt (daha az güvenilir)
+    board_map.observe('C1', 10.1, 5.0, 0.9)      # Yakın ama farklı metin → ayrı kayıt
+    board_map.observe('R10', 2.0, 2.0, 0.95)
+    views = [(10.0, 5.0), (11.0, 5.0), (30.0, 30.0)]
+    board_map.finalize(views, half_x=3.0, half_y=2.0)
+    return board_map
+
+
+def test_observe_merges_duplicates(app_module, cfg):
+    board_map = scanned_map(app_module)
+    r1 = [lab for lab in board_map.labels if lab['text'] == 'R1']
+    assert len(board_map.labels) == 4 and len(r1) == 2
+    merged = next(lab for lab in r1 if lab['hits'] == 2)
+    # OCR güveni ağırlıklı ortalama: (10*0.9 + 10.3*0.6) / 1.5
+    assert merged['x'] == pytest.approx(10.12) and merged['y'] == pytest.approx(5.0)
+    assert merged['conf'] == pytest.approx(0.75)
+
+
+def test_finalize_confidence_uses_visible_views(app_module, cfg):
+    board_map = scanned_map(app_module)
+    by_pos = {(lab['text'], round(lab['x'])): lab for lab in board_map.labels}
+    # İki görüntüde görüş alanındaydı, ikisinde de okundu
+    assert by_pos[('R1', 10)]['visible'] == 2 and by_pos[('R1', 10)]['confidence'] == pytest.approx(0.75)
+    # Görüş alanında iki kez, sadece bir kez okundu → güven yarıya iner
+    assert by_pos[('C1', 10)]['visible'] == 2 and by_pos[('C1', 10)]['confidence'] == pytest.approx(0.45)
+    # Hiçbir görüntü merkezine yeterince yakın değil: görülme sayısı okuma sayısından az olamaz
+    assert by_pos[('R10', 2)]['visible'] == 1 and by_pos[('R10', 2)]['confidence'] == pytest.approx(0.95)
+
+
+def test_lookup_prefers_exact_and_confident(app_module, cfg):
+    board_map = scanned_map(app_module)
+    assert board_map.lookup('R1')['x'] == pytest.approx(10.12)   # 'R10' alt dizgi eşleşmesinden önce
+    assert board_map.lookup('C1') is None                          # Güven 0.45 < 0.5
+    assert board_map.lookup('C1', min_confidence=0.4)['text'] == 'C1'
+    assert board_map.lookup('R10')['x'] == 2.0
+    assert board_map.lookup('U1') is None
+
+
+def test_store_json_round_trip(app_module, cfg, tmp_path):
+    path = str(tmp_path / 'board_maps.json')
+    store = app_module.BoardMapStore(path)
+    store.put(scanned_map(app_module))
+    with open(path) as f:
+        assert set(json.load(f)) == {'KART-A'}
+
+    loaded = app_module.BoardMapStore(path)
+    original = store.get('KART-A')
+    again = loaded.get('KART-A')
+    assert again.to_dict() == original.to_dict()
+    # Izgara indeksi yüklemede yeniden kurulur
+    assert [lab['text'] for lab in again.near(10.0, 5.0, 0.5)] == ['R1', 'C1']
+    assert loaded.lookup('R1') == store.lookup('R1')
+    assert loaded.summary()['KART-A']['labels'] == 4
+    assert loaded.delete('KART-A') and app_module.BoardMapStore(path).get('KART-A') is None
+
+
+def test_base_xy_follows_label(app_module, cfg, tmp_path, monkeypatch):
+    store = app_module.BoardMapStore(str(tmp_path / 'board_maps.json'))
+    store.put(scanned_map(app_module))
+    monkeypatch.setattr(app_module, 'board_maps', store)
+
+    bound = {'name': 'r1', 'x': 0.0, 'y': 0.0, 'z': 0.0, 'label': 'R1'}
+    assert app_module.base_xy(bound) == (pytest.approx(10.12), 5.0)
+    assert app_module.base_center_label(bound) == 'R1'
+
+    # Etiket yok, haritada yok veya güveni düşük → kayıtlı XY
+    for label in (None, 'U9', 'C1'):
+        base = {'name': 'b', 'x': 1.5, 'y': 2.5, 'z': 0.0, 'label': label}
+        assert app_module.base_xy(base) == (1.5, 2.5)
+        assert app_module.base_center_label(base) is None
+
+    # Başka kart tipi aktifken harita kullanılmaz
+    monkeypatch.setattr(cfg, 'BOARD_TYPE', 'KART-B')
+    assert app_module.base_xy(bound) == (0.0, 0.0)
@@ -0,0 +1,68 @@
+"""Kamera arka uçları: simülasyon kareleri, yakalama modu geçişi ve Picamera2 başlatma hatası."""
+import sys
+import types
+
+import pytest
+
+MODES = {'full': (640, 480), 'preview': (320, 240)}
+
+
+def test_simulated_backend_switches_modes(app_module):
+    backend = app_module.SimulatedCameraBackend(frame_source=app_module.synthetic_frame)
+    backend.start(MODES, 320)
+
+    gray, lores = backend.capture()
+    assert gray.shape == (480, 640) and lores is None
+
+    backend.switch('preview')
+    gray, _ = backend.capture()
+    assert backend.mode == 'preview'
+    assert gray.shape == (240, 320)
+    assert backend.frame_time > 0
+
+
+def test_camera_manager_applies_capture_mode(app_module, monkeypatch):
+    monkeypatch.setattr(app_module.config, 'CAPTURE_MODE', 'preview')
+    cam = app_module.CameraManager(backend=app_module.SimulatedCameraBackend(app_module.synthetic_frame))
+    cam.start()
+    try:
+        assert cam.simulation and cam.capture_mode == 'full'
+        cam._apply_capture_mode()
+        assert cam.capture_mode == 'preview' and cam.backend.mode == 'preview'
+
+        pw, ph = cam.capture_modes['preview']
+        gray, _ = cam.capture_frame()
+        assert gray.shape == (ph, pw)
+
+        monkeypatch.setattr(app_module.config, 'CAPTURE_MODE', 'full')
+        cam._apply_capture_mode()
+        assert cam.backend.mode == 'full'
+    finally:
+        cam.stop()
+
+
+def test_picamera2_start_failure_closes_camera(app_module, monkeypatch):
+    class FakePicamera2:
+        instances = []
+
+        def __init__(self):
+            self.closed = False
+            FakePicamera2.instances.append(self)
+
+        def create_preview_configuration(self, **kwargs):
+            return kwargs
+
+        def configure(self, cam_config):
+            raise RuntimeError("sensör yok")
+
+        def close(self):
+            self.closed = True
+
+    monkeypatch.setitem(sys.modules, 'picamera2', types.SimpleNamespace(Picamera2=FakePicamera2))
+    monkeypatch.setitem(sys.modules, 'libcamera', types.SimpleNamespace(Transform=lambda **kw: kw))
+
+    backend = app_module.Picamera2Backend()
+    with pytest.raises(RuntimeError):
+        backend.start(MODES, 320)
+    assert FakePicamera2.instances[0].closed
+    assert backend.picam2 is None
@@ -0,0 +1,52 @@
+"""Lens modeli: önceden hesaplanmış tablo + çift doğrusal enterpolasyon ve doğrulama ROI'leri."""
+import cv2
+import numpy as np
+
+SIZE = (1280, 960)
+K = np.array([[1000.0, 0.0, 652.0], [0.0, 1010.0, 471.0], [0.0, 0.0, 1.0]])
+DIST = np.array([-0.12, 0.05, 0.001, -0.0008, 0.0])
+
+
+def fitted_lens(app, tmp_path):
+    lens = app.LensModel(str(tmp_path / 'lens_model.json'))
+    lens._set(K, DIST, SIZE, 0.1)
+    return lens
+
+
+def test_lut_matches_undistort_points(app_module, tmp_path):
+    lens = fitted_lens(app_module, tmp_path)
+    pts = np.random.default_rng(4).uniform((0, 0), SIZE, (2000, 2))
+    expected = cv2.undistortPoints(pts.reshape(-1, 1, 2), K, DIST, P=K).reshape(-1, 2)
+    got = np.array([lens.undistort_point(x, y, frame_w=SIZE[0]) for x, y in pts])
+    assert np.hypot(*(got - expected).T).max() < 0.05
+
+
+def test_lut_scales_to_frame_resolution(app_module, tmp_path):
+    lens = fitted_lens(app_module, tmp_path)
+    # Yarım çözünürlükteki kare: aynı nokta, koordinatlar yarıya ölçeklenir
+    full = np.array(lens.undistort_point(300.0, 200.0, frame_w=SIZE[0]))
+    half = np.array(lens.undistort_point(150.0, 100.0, frame_w=SIZE[0] // 2))
+    assert np.allclose(full / 2, half, atol=1e-6)
+
+
+def test_distort_points_inverts_lut(app_module, tmp_path):
+    lens = fitted_lens(app_module, tmp_path)
+    ideal = np.array([[100.0, 80.0], [640.0, 480.0], [1200.0, 900.0]])
+    raw = lens.distort_points(ideal, frame_w=SIZE[0])
+    back = np.array([lens.undistort_point(x, y, frame_w=SIZE[0]) for x, y in raw])
+    assert np.hypot(*(back - ideal).T).max() < 0.05
+
+
+def test_verification_rois_stay_raw_by_default(app_module, tmp_path, monkeypatch):
+    lens = fitted_lens(app_module, tmp_path)
+    box = {'x': 0.05, 'y': 0.05, 'w': 0.1, 'h': 0.1}
+    raw = (64, 48, 128, 96)
+
+    monkeypatch.setattr(app_module.config, 'LENS_UNDISTORT_ROIS', False)
+    assert app_module.verification_roi_rect(box, *SIZE, lens) == raw
+
+    # Açıkken ideal koordinatlar ham kareye taşınır (köşede belirgin distorsiyon)
+    monkeypatch.setattr(app_module.config, 'LENS_UNDISTORT_ROIS', True)
+    assert app_module.verification_roi_rect(box, *SIZE, lens) != raw
+    lens.lut = None
+    assert app_module.verification_roi_rect(box, *SIZE, lens) == raw
@@ -0,0 +1,79 @@
+"""Hareket route'ları: kalibrasyon / kart taraması / auto-center sürerken reddedilir; işler bayrağı route'ta atar."""
+import threading
+
+import pytest
+
+MOTION_ROUTES = [
+    ('/api/move', {'x': 1.0}),
+    ('/api/move_to_pixel', {'x': 10, 'y': 10}),
+    ('/api/move_z_absolute', {'z': -100}),
+    ('/api/home', {}),
+    ('/api/goto_base', {'name': 'yok'}),
+    ('/api/calibration/test', {'axis': 'x'}),
+    ('/api/send_gcode', {'command': 'G0 X10'}),
+    ('/api/scenario/run', {'name': 'yok'}),
+    ('/api/master_scenario/run', {'name': 'yok'}),
+    ('/api/verification/run', {}),
+    ('/api/auto_center', {}),
+    ('/api/calibration/affine', {}),
+    ('/api/board_map/scan', {'board_type': 'T', 'x0': 0, 'y0': 0, 'x1': 1, 'y1': 1}),
+]
+
+JOBS = ['calibration_running', 'board_map_running', 'auto_centering']
+
+
+@pytest.fixture
+def client(app_module, monkeypatch):
+    for name in ('calibration_running', 'board_map_running', 'scenario_running', 'verification_running'):
+        monkeypatch.setattr(app_module, name, False)
+    monkeypatch.setattr(app_module.camera, 'auto_centering', False)
+    # Hiçbir istek gantry'yi gerçekten hareket ettirmemeli
+    moves = []
+    for name in ('move_relative', 'move_absolute', 'move_absolute_z', 'home', 'send'):
+        monkeypatch.setattr(app_module.pnp, name, lambda *a, _n=name, **k: moves.append(_n) or True)
+    app_module.app.config['TESTING'] = True
+    client = app_module.app.test_client()
+    client.moves = moves
+    return client
+
+
+def start_job(app_module, monkeypatch, job):
+    if job == 'auto_centering':
+        monkeypatch.setattr(app_module.camera, 'auto_centering', True)
+    else:
+        monkeypatch.setattr(app_module, job, True)
+
+
+@pytest.mark.parametrize('job', JOBS)
+@pytest.mark.parametrize('route,body', MOTION_ROUTES)
+def test_motion_rejected_while_job_runs(app_module, client, monkeypatch, job, route, body):
+    start_job(app_module, monkeypatch, job)
+    reply = client.post(route, json=body).get_json()
+    assert reply['success'] is False
+    assert client.moves == []
+
+
+@pytest.mark.parametrize('route,worker,flag', [
+    ('/api/calibration/affine', 'run_affine_calibration', 'calibration_running'),
+    ('/api/board_map/scan', 'run_board_map', 'board_map_running'),
+])
+def test_job_flag_set_before_worker_starts(app_module, client, monkeypatch, route, worker, flag):
+    release = threading.Event()
+    monkeypatch.setattr(app_module, worker, lambda *a: release.wait(2))
+    monkeypatch.setattr(app_module.config, 'save_config', lambda: None)
+    monkeypatch.setattr(app_module.config, 'BOARD_TYPE', app_module.config.BOARD_TYPE)
+    body = {'board_type': 'T', 'x0': 0, 'y0': 0, 'x1': 1, 'y1': 1}
+    try:
+        assert client.post(route, json=body).get_json()['success'] is True
+        # Worker henüz bayrağa dokunmadı; ikinci istek yine de reddedilir
+        assert getattr(app_module, flag) is True
+        assert client.post(route, json=body).get_json()['success'] is False
+        assert client.post('/api/move', json={'x': 1.0}).get_json()['success'] is False
+    finally:
+        release.set()
+
+
+def test_motion_allowed_when_idle(app_module, client):
+    reply = client.post('/api/move', json={'x': 1.0}).get_json()
+    assert reply['success'] is True
+    assert client.moves == ['move_relative']
@@ -0,0 +1,71 @@
+"""dHash ve OCR sonuç önbelleği: TTL, LRU tahliyesi ve isabet sayaçları (sahte saat ile)."""
+import numpy as np
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def crop(seed, w=120, h=30):
+    return np.random.default_rng(seed).integers(0, 256, (h, w), dtype=np.uint8)
+
+
+def test_dhash_stable_under_small_changes(app_module):
+    dhash = app_module.dhash
+    image = crop(1)
+    assert len(dhash(image)) == 32 * 8 // 8
+    assert dhash(image) == dhash(image.copy())
+    # Tek piksel oynaması küçültülmüş görüntüde fark yaratmaz; farklı içerik farklı hash verir
+    nudged = image.copy()
+    nudged[5, 5] ^= 1
+    assert dhash(nudged) == dhash(image)
+    assert dhash(crop(2)) != dhash(image)
+
+
+def test_key_separates_size_and_tag(app_module):
+    cache = app_module.OCRResultCache
+    image = crop(3)
+    assert cache.key(image, 'a') != cache.key(image, 'b')
+    assert cache.key(image)[1:3] == (120, 30)
+
+
+def test_ttl_expiry(app_module, monkeypatch):
+    monkeypatch.setattr(app_module.config, 'OCR_CACHE_TTL', 2.0)
+    clock = FakeClock()
+    cache = app_module.OCRResultCache(clock=clock)
+    cache.put('k', 'R1')
+    clock.now += 2.0
+    assert cache.get('k') == 'R1'
+    clock.now += 0.5
+    assert cache.get('k') is None
+    assert cache.stats()['size'] == 0
+
+
+def test_lru_eviction(app_module, monkeypatch):
+    monkeypatch.setattr(app_module.config, 'OCR_CACHE_TTL', 60.0)
+    monkeypatch.setattr(app_module.config, 'OCR_CACHE_SIZE', 2)
+    cache = app_module.OCRResultCache(clock=FakeClock())
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1      # 'a' en son kullanılan olur
+    cache.put('c', 3)               # en eski 'b' düşer
+    assert cache.get('b') is None
+    assert cache.get('a') == 1 and cache.get('c') == 3
+
+
+def test_hit_miss_counters(app_module, monkeypatch):
+    monkeypatch.setattr(app_module.config, 'OCR_CACHE_TTL', 60.0)
+    cache = app_module.OCRResultCache(clock=FakeClock())
+    assert cache.stats() == {'hits': 0, 'misses': 0, 'hit_rate': 0.0, 'size': 0}
+    cache.get('x')
+    cache.put('x', 'C2')
+    cache.get('x')
+    cache.get('x')
+    cache.get('y')
+    assert cache.stats() == {'hits': 2, 'misses': 2, 'hit_rate': 0.5, 'size': 1}
+    cache.clear()
+    assert cache.stats()['size'] == 0
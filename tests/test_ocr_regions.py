@@ -0,0 +1,38 @@
+"""OCR takip pencereleri: çakışan pencerelerin tek geçişte birleştirilmesi."""
+import random
+
+
+def merge_reference(windows):
+    """Eski (her birleşmede baştan başlayan) döngü — karşılaştırma için."""
+    windows = [list(w) for w in windows]
+    merged = True
+    while merged:
+        merged = False
+        for i in range(len(windows)):
+            for j in range(i + 1, len(windows)):
+                a, b = windows[i], windows[j]
+                if a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]:
+                    windows[i] = [min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3])]
+                    del windows[j]
+                    merged = True
+                    break
+            if merged:
+                break
+    return windows
+
+
+def test_merge_windows_matches_reference(app_module):
+    rng = random.Random(7)
+    for _ in range(500):
+        windows = []
+        for _ in range(rng.randint(0, 25)):
+            x, y = rng.randint(0, 500), rng.randint(0, 400)
+            windows.append([x, y, x + rng.randint(1, 80), y + rng.randint(1, 60)])
+        got = app_module.CameraManager.merge_windows(windows)
+        assert sorted(map(tuple, got)) == sorted(map(tuple, merge_reference(windows)))
+
+
+def test_merge_windows_chains_through_growth(app_module):
+    # B-C çakışır; birleşimleri büyüyerek A ile çakışır (A, B ve C ile tek tek çakışmaz)
+    windows = [[0, 0, 10, 10], [5, 20, 15, 30], [12, 5, 20, 25]]
+    assert app_module.CameraManager.merge_windows(windows) == [[0, 0, 20, 30]]
@@ -0,0 +1,49 @@
+"""OCR düzeltme indeksi: difflib.get_close_matches ile aynı sonuç ve VOCAB_VERSION ile yeniden oluşturma."""
+import difflib
+import random
+
+import pytest
+
+WORDS = ['R1', 'R10', 'R11', 'R12', 'C10', 'C12', 'U1', 'U10', 'GND', 'VCC', 'LED1', 'LED2', 'J1', 'SW1']
+
+RNG = random.Random(13)
+FUZZ = [''.join(RNG.choice('RCUJLED0123SWGNV') for _ in range(RNG.randint(1, 5))) for _ in range(150)]
+
+
+@pytest.mark.parametrize('text', [
+    'R1', 'R13', 'R1O', 'C1', 'C11', 'U11', 'GN0', 'VC', 'LED', 'LE01', 'J', 'SWI', 'XYZ', '',
+] + FUZZ)
+def test_correct_matches_difflib(app_module, text):
+    vocab = app_module.OCRVocabulary(WORDS, cutoff=0.7)
+    expected = difflib.get_close_matches(text, WORDS, n=1, cutoff=0.7)
+    assert vocab.correct(text) == (expected[0] if expected else None)
+
+
+def test_tie_prefers_largest_word(app_module):
+    # 'R1' → R10 / R11 / R12 aynı oranda; difflib eşitlikte büyük kelimeyi seçer
+    vocab = app_module.OCRVocabulary(['R10', 'R12', 'R11'], cutoff=0.7)
+    assert difflib.get_close_matches('R1', ['R10', 'R12', 'R11'], n=1, cutoff=0.7) == ['R12']
+    assert vocab.correct('R1') == 'R12'
+
+
+def test_vocab_version_rebuilds_index(app_module, monkeypatch):
+    config = app_module.config
+    monkeypatch.setattr(config, 'OCR_VOCAB_ACTIVE_GROUP_ONLY', False)
+    monkeypatch.setattr(config, 'OCR_GROUPS', {'g': ['R1', 'C2']})
+    monkeypatch.setattr(config, 'VOCAB_VERSION', config.VOCAB_VERSION)
+    cam = app_module.CameraManager(backend=app_module.SimulatedCameraBackend())
+
+    first = cam.vocabulary()
+    assert cam.vocabulary() is first
+    assert first.words == ['C2', 'R1']
+
+    # Sürüm artmadan kaynak değişikliği önbelleği bozmaz; artınca yeni indeks kurulur
+    config.OCR_GROUPS['g'].append('U3')
+    assert cam.vocabulary() is first
+    config.VOCAB_VERSION += 1
+    rebuilt = cam.vocabulary()
+    assert rebuilt is not first and rebuilt.words == ['C2', 'R1', 'U3']
+
+    # Odak kelimesi ayrı anahtar kullanır, sözlük moduna dönüş yeniden kurar
+    assert cam.vocabulary('R1').words == ['R1']
+    assert cam.vocabulary().words == ['C2', 'R1', 'U3']
@@ -0,0 +1,61 @@
+"""Hedef arama spirali: halka sırası, görüş alanından türetilen adım ve arama yarıçapı sınırı."""
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def fov_8x6(app_module, monkeypatch):
+    """800×600 px kare, 0.01 mm/px → 8×6 mm görüş alanı (afin matris yok)."""
+    config = app_module.config
+    monkeypatch.setattr(config, 'CAMERA_TO_MOTOR_AFFINE', None)
+    monkeypatch.setattr(config, 'CAMERA_WIDTH', 800)
+    monkeypatch.setattr(config, 'CAMERA_HEIGHT', 600)
+    monkeypatch.setattr(config, 'PIXEL_TO_MM_X', 0.01)
+    monkeypatch.setattr(config, 'PIXEL_TO_MM_Y', 0.01)
+    assert app_module.field_of_view_mm() == pytest.approx((8.0, 6.0))
+    return app_module
+
+
+def rings_of(views, step):
+    return [int(round(max(abs(x) / step[0], abs(y) / step[1]))) for x, y in views]
+
+
+def test_rings_in_order_and_contiguous(fov_8x6):
+    step = (800 * 0.75, 600 * 0.75)
+    views = fov_8x6.plan_search_spiral(radius_mm=50, overlap=0.25, max_rings=3)
+    rings = rings_of(views, step)
+    assert rings == sorted(rings) and set(rings) == {1, 2, 3}
+    assert [rings.count(r) for r in (1, 2, 3)] == [8, 16, 24]
+    assert len(set(views)) == len(views)
+    # Halka içinde ardışık görüntüler komşu (köşelerde bile tek adım)
+    for (x0, y0), (x1, y1), r0, r1 in zip(views, views[1:], rings, rings[1:]):
+        if r0 == r1:
+            assert max(abs(x1 - x0) / step[0], abs(y1 - y0) / step[1]) == pytest.approx(1.0)
+
+
+def test_step_follows_field_of_view_and_overlap(fov_8x6):
+    for overlap in (0.0, 0.25, 0.5):
+        views = fov_8x6.plan_search_spiral(radius_mm=50, overlap=overlap, max_rings=1)
+        keep = 1.0 - overlap
+        xs = sorted({round(x, 6) for x, _ in views})
+        ys = sorted({round(y, 6) for _, y in views})
+        assert xs == pytest.approx([-800 * keep, 0.0, 800 * keep])
+        assert ys == pytest.approx([-600 * keep, 0.0, 600 * keep])
+        # Piksel adımı mm'de görüş alanının (1 - overlap) katı
+        mm = [fov_8x6.pixel_to_motor(x, 0)[0] for x in xs]
+        assert abs(mm[-1] - mm[1]) == pytest.approx(8.0 * keep)
+
+
+def test_views_clipped_to_search_radius(fov_8x6):
+    # Adım 6×4.5 mm: birinci halkanın en uzak noktası 2.5 mm, ikinci halka ≥ 6 mm uzakta
+    assert len(fov_8x6.plan_search_spiral(radius_mm=3.0, overlap=0.25)) == 8
+    # 1.6 mm: sadece üst/alt komşular değer (1.5 mm), sağ/sol 2 mm uzakta
+    assert fov_8x6.plan_search_spiral(radius_mm=1.6, overlap=0.25) == [(0.0, 450.0), (0.0, -450.0)]
+    views = fov_8x6.plan_search_spiral(radius_mm=12.0, overlap=0.25)
+    for x, y in views:
+        ex = max(0.0, abs(x) * 0.01 - 4.0)
+        ey = max(0.0, abs(y) * 0.01 - 3.0)
+        assert np.hypot(ex, ey) <= 12.0
+    # Yarıçapa değen bütün hücreler planda (dış halka kesilmez, sadece değmeyenler atlanır)
+    assert (2 * 600, 0.0) in views and (0.0, 3 * 450) in views
+    assert fov_8x6.plan_search_spiral(radius_mm=0.5, overlap=0.25) == []
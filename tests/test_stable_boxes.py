@@ -0,0 +1,88 @@
+"""Kararlı kutu eşleştirme: vektörize IoU, benzersiz en-iyi-önce atama ve eski döngüyle eşdeğerlik."""
+import random
+
+import numpy as np
+
+
+def reference_update(app, stable_boxes, counter, detections):
+    """Vektörleştirme öncesi açgözlü döngü (her algılama için en iyi IoU, yoksa aynı metin < 50px)."""
+    cam = app.CameraManager
+    for det in detections:
+        best_id, best_score = None, app.config.IOU_MATCH_THRESHOLD
+        for bid, sbox in stable_boxes.items():
+            score = cam.iou(None, det['rect'], sbox['rect'])
+            if score > best_score:
+                best_score, best_id = score, bid
+        if best_id is None:
+            for bid, sbox in stable_boxes.items():
+                if sbox['text'] == det['text']:
+                    ox, oy = sbox['rect'][0] + sbox['rect'][2] / 2, sbox['rect'][1] + sbox['rect'][3] / 2
+                    nx, ny = det['rect'][0] + det['rect'][2] / 2, det['rect'][1] + det['rect'][3] / 2
+                    if ((ox - nx) ** 2 + (oy - ny) ** 2) ** 0.5 < 50:
+                        best_id = bid
+                        break
+        if best_id is not None:
+            old = stable_boxes[best_id]['rect']
+            if not (old[2] * old[3] > 0 and det['rect'][2] * det['rect'][3] > old[2] * old[3] * app.config.BOX_GROWTH_LIMIT):
+                stable_boxes[best_id].update(rect=det['rect'], text=det['text'])
+        else:
+            counter += 1
+            stable_boxes[counter] = {'rect': det['rect'], 'text': det['text']}
+    return counter
+
+
+def random_frame(rng, tracks):
+    """Birbirinden uzak ızgara hücrelerinde titreşen / yeni / kaybolan etiketler (çakışmasız sahne)."""
+    detections = []
+    for cell in rng.sample(range(24), rng.randint(0, 12)):
+        cx, cy = (cell % 6) * 200 + 100, (cell // 6) * 200 + 100
+        text = tracks.setdefault(cell, f"R{cell}")
+        w, h = rng.randint(40, 80), rng.randint(15, 30)
+        jx, jy = rng.randint(-8, 8), rng.randint(-8, 8)
+        detections.append({'rect': (cx - w // 2 + jx, cy - h // 2 + jy, w, h), 'text': text})
+    rng.shuffle(detections)
+    return detections
+
+
+def test_pairwise_iou_matches_scalar_iou(app_module):
+    rng = np.random.default_rng(3)
+    a = np.column_stack([rng.integers(0, 300, (30, 2)), rng.integers(0, 60, (30, 2))])
+    b = np.column_stack([rng.integers(0, 300, (20, 2)), rng.integers(0, 60, (20, 2))])
+    m = app_module.CameraManager.pairwise_iou(a, b)
+    iou = app_module.CameraManager.iou
+    expected = [[iou(None, tuple(ra), tuple(rb)) for rb in b] for ra in a]
+    assert np.allclose(m, expected)
+
+
+def test_update_matches_reference_loop(app_module):
+    cam = app_module.CameraManager(backend=app_module.SimulatedCameraBackend())
+    rng = random.Random(11)
+    reference, counter, tracks = {}, 0, {}
+    for _ in range(200):
+        detections = random_frame(rng, tracks)
+        cam.update_stable_boxes([dict(d) for d in detections])
+        counter = reference_update(app_module, reference, counter, detections)
+        got = {bid: (tuple(sb['rect']), sb['text']) for bid, sb in cam.stable_boxes.items()}
+        assert got == {bid: (tuple(sb['rect']), sb['text']) for bid, sb in reference.items()}
+
+
+def test_assignment_is_unique(app_module):
+    assign = app_module.CameraManager._assign_best_first
+    rng = np.random.default_rng(5)
+    for _ in range(200):
+        scores = rng.random((rng.integers(1, 8), rng.integers(1, 8)))
+        pairs = assign(scores, scores > 0.3)
+        rows = [r for r, _ in pairs]
+        cols = [c for _, c in pairs]
+        assert len(rows) == len(set(rows)) and len(cols) == len(set(cols))
+        assert all(scores[r, c] > 0.3 for r, c in pairs)
+
+
+def test_two_detections_do_not_share_a_track(app_module):
+    cam = app_module.CameraManager(backend=app_module.SimulatedCameraBackend())
+    cam.update_stable_boxes([{'rect': (100, 100, 60, 20), 'text': 'R1'}])
+    # İki algılama da aynı kutuyla çakışıyor — en yüksek IoU'lu olan eşleşir, diğeri yeni kutu olur
+    cam.update_stable_boxes([{'rect': (104, 100, 60, 20), 'text': 'R1'},
+                             {'rect': (101, 101, 60, 20), 'text': 'R2'}])
+    boxes = sorted((tuple(sb['rect']), sb['text']) for sb in cam.stable_boxes.values())
+    assert boxes == [((101, 101, 60, 20), 'R2'), ((104, 100, 60, 20), 'R1')]
@@ -0,0 +1,62 @@
+"""Alt-piksel hedef merkezi: moment ağırlık merkezi ve ayrı OCR çalışmalarının ortalaması."""
+import threading
+import time
+
+import numpy as np
+
+
+def ink_image(points, shape=(60, 80)):
+    """Beyaz zemin üzerine siyah mürekkep pikselleri (threshold görüntüsü gibi)."""
+    img = np.full(shape, 255, dtype=np.uint8)
+    for x, y in points:
+        img[y, x] = 0
+    return img
+
+
+def test_subpixel_center_fractional_blob(app_module):
+    center = app_module.CameraManager.subpixel_center
+    # 4×3 blok + sağ alt köşede tek piksel: merkez (11.5 + 2.5/13, 21 + 1/13)
+    points = [(x, y) for x in range(10, 14) for y in range(20, 23)] + [(14, 22)]
+    img = ink_image(points)
+    ex, ey = np.mean(points, axis=0)
+    # Kutu blob'a göre asimetrik — sonuç kutu merkezine değil mürekkebe bağlı
+    cx, cy = center(img, (5, 15, 20, 12))
+    assert abs(cx - ex) < 0.01 and abs(cy - ey) < 0.01
+    assert abs(cx - (5 + 10)) > 1.0
+
+
+def test_subpixel_center_scaling_and_empty_crop(app_module):
+    center = app_module.CameraManager.subpixel_center
+    img = ink_image([(20, 30), (21, 30)])
+    cx, cy = center(img, (15, 25, 10, 10), factor=2.0)
+    assert (cx, cy) == ((20.5 + 0.5) * 2 - 0.5, (30 + 0.5) * 2 - 0.5)
+    # Mürekkep yoksa kutu merkezi
+    assert center(ink_image([]), (10, 10, 8, 4)) == (14.0, 12.0)
+
+
+def test_refine_target_averages_only_separate_runs(app_module, monkeypatch):
+    monkeypatch.setattr(app_module.config, 'AUTO_CENTER_RESULT_TIMEOUT', 0.5)
+    cam = app_module.CameraManager(backend=app_module.SimulatedCameraBackend())
+    cam.active = True
+    since = cam.ocr_source['time']
+
+    def det(cx):
+        return [{'rect': (10, 10, 40, 20), 'text': 'R1', 'center_subpx': (cx, 20.0), 'conf': 90.0}]
+
+    def feeder():
+        for i, cx in enumerate([30.0, 30.6, 29.7]):
+            time.sleep(0.05)
+            stamped = cam._publish_detections(det(cx), source={'seq': 10 + i, 'time': since + 1 + i},
+                                              ocr_run=True)
+            # Aynı sonucun yeniden yayınlanması (OCR kapısı 'reuse') ayrı örnek değildir
+            time.sleep(0.01)
+            cam._publish_detections(stamped)
+
+    thread = threading.Thread(target=feeder)
+    thread.start()
+    result = cam.refine_target('R1', since, samples=5)
+    thread.join()
+
+    assert result['subpx_samples'] == 3
+    assert result['center_subpx'] == (30.1, 20.0)
+    assert result['subpx_spread'] == 0.5